@@ -13,6 +13,9 @@ from emotion_detector import FaceEmotionDetector
 from speech_detector import SpeechEmotionDetector
 from stress_analyzer import StressAnalyzer
 from database import StressDatabase
+from frame_broadcaster import FrameBroadcaster
+from inference_worker import FaceInferenceWorker
+from face_inference_pool import FaceInferencePool
 
 app = Flask(__name__)
 
@@ -21,7 +24,14 @@ face_detector = None
 speech_detector = None
 stress_analyzer = None
 database = None
-camera = None
+broadcaster = None
+inference_worker = None
+
+# Face inference rate (Hz); the video stream itself runs at camera FPS
+FACE_INFERENCE_HZ = 3.0
+
+# Face inference worker processes (0 = run the model in this process)
+FACE_INFERENCE_WORKERS = 0
 
 # Current state variables
 current_state = {
@@ -39,21 +49,29 @@ state_lock = threading.Lock()
 
 def initialize_system():
     """Initialize all components of the stress analysis system"""
-    global face_detector, speech_detector, stress_analyzer, database, camera
+    global face_detector, speech_detector, stress_analyzer, database, broadcaster, inference_worker
     
     print("Initializing Worker Stress Analysis System...")
     
     # Initialize detectors
-    face_detector = FaceEmotionDetector()
+    if FACE_INFERENCE_WORKERS > 0:
+        face_detector = FaceInferencePool(num_workers=FACE_INFERENCE_WORKERS)
+        face_detector.start()
+    else:
+        face_detector = FaceEmotionDetector()
     speech_detector = SpeechEmotionDetector()
     stress_analyzer = StressAnalyzer()
     database = StressDatabase()
     
-    # Initialize camera
-    camera = cv2.VideoCapture(0)
-    camera.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-    camera.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
-    camera.set(cv2.CAP_PROP_FPS, 15)
+    # Initialize camera (single capture thread shared by all viewers)
+    broadcaster = FrameBroadcaster(source=0, width=640, height=480, fps=15)
+    broadcaster.start()
+    
+    # Face inference runs on its own thread at a fixed rate
+    inference_worker = FaceInferenceWorker(face_detector, broadcaster,
+                                           target_hz=FACE_INFERENCE_HZ,
+                                           on_result=update_face_state)
+    inference_worker.start()
     
     # Start speech detection
     speech_detector.start_recording()
@@ -126,23 +144,32 @@ def process_emotions():
             traceback.print_exc()
             time.sleep(1)
 
+def update_face_state(face_emotion, face_conf, face_coords):
+    """Store the latest face inference result (called from the inference worker)"""
+    if face_emotion:
+        with state_lock:
+            current_state['face_emotion'] = face_emotion
+            current_state['face_confidence'] = face_conf
+
 def generate_frames():
-    """Generate video frames with emotion detection"""
-    global current_state
+    """Generate video frames for one viewer from the shared broadcaster"""
+    last_sequence = 0
     
     while True:
         try:
-            success, frame = camera.read()
-            if not success:
-                break
+            latest = broadcaster.wait_for_frame(last_sequence, timeout=1.0)
+            if latest is None:
+                if not broadcaster.is_running:
+                    break
+                continue
+            
+            last_sequence, _, frame, _ = latest
             
-            # Detect face emotion
-            face_emotion, face_conf, face_coords = face_detector.detect_emotion(frame)
+            # Overlay the cached inference result, never wait on the model here
+            _, _, face_coords = inference_worker.get_latest_result()
             
-            if face_emotion:
-                with state_lock:
-                    current_state['face_emotion'] = face_emotion
-                    current_state['face_confidence'] = face_conf
+            # Draw on a copy, the buffered frame is shared with other viewers
+            frame = frame.copy()
             
             # Draw results on frame (without text overlay, that's for dashboard)
             if face_coords:
@@ -233,5 +260,9 @@ if __name__ == '__main__':
         print("\nShutting down...")
         if speech_detector:
             speech_detector.stop_recording()
-        if camera:
-            camera.release()
+        if inference_worker:
+            inference_worker.stop()
+        if isinstance(face_detector, FaceInferencePool):
+            face_detector.stop()
+        if broadcaster:
+            broadcaster.stop()
@@ -0,0 +1,134 @@
+"""
+Audio Ring Buffer
+Preallocated float32 ring buffer for captured audio samples
+Every sample is stored twice (mirrored), so the latest window is always one
+contiguous slice and readers get it as a zero-copy view
+Readers can block until a given stream position has been written
+"""
+
+import time
+import threading
+import numpy as np
+
+class AudioRingBuffer:
+    def __init__(self, capacity):
+        """
+        Initialize the ring buffer
+        
+        Single-writer/single-reader: the audio callback writes, the processing
+        thread reads. The only shared state is total_written, published after
+        the samples are in place, so a reader never sees a half-written block.
+        A view from latest(n) stays valid until capacity - n more samples are written.
+        The writer only takes the condition lock when a waiting reader's target
+        position has been reached.
+        
+        Args:
+            capacity: Number of most recent samples kept
+        """
+        self.capacity = int(capacity)
+        self.buffer = np.zeros(2 * self.capacity, dtype=np.float32)
+        self.total_written = 0
+        
+        # Reader wake-up: target position and arrival time of the newest block
+        self.data_ready = threading.Condition()
+        self.wake_position = None
+        self.last_write_time = None
+    
+    def write(self, samples):
+        """
+        Append samples (called from the audio callback)
+        
+        Args:
+            samples: 1-D array of new samples
+        """
+        samples = np.asarray(samples, dtype=np.float32).ravel()
+        total = self.total_written + len(samples)
+        if len(samples) > self.capacity:
+            # Only the newest samples fit
+            samples = samples[-self.capacity:]
+        
+        count = len(samples)
+        pos = (total - count) % self.capacity
+        first = min(count, self.capacity - pos)
+        rest = count - first
+        
+        # Write both copies; the second copy keeps every window contiguous
+        self.buffer[pos:pos + first] = samples[:first]
+        self.buffer[pos + self.capacity:pos + self.capacity + first] = samples[:first]
+        if rest > 0:
+            self.buffer[:rest] = samples[first:]
+            self.buffer[self.capacity:self.capacity + rest] = samples[first:]
+        
+        # Publish after the data is in place (the write position derives from it)
+        self.last_write_time = time.perf_counter()
+        self.total_written = total
+        
+        wake_position = self.wake_position
+        if wake_position is not None and total >= wake_position:
+            with self.data_ready:
+                self.data_ready.notify_all()
+    
+    def wait_for(self, position, timeout=None):
+        """
+        Block until the stream reaches an absolute position
+        
+        Args:
+            position: Value of total_written to wait for
+            timeout: Maximum wait in seconds (None waits indefinitely)
+        
+        Returns:
+            bool: True if the position was reached, False on timeout
+        """
+        with self.data_ready:
+            self.wake_position = position
+            reached = self.data_ready.wait_for(lambda: self.total_written >= position, timeout)
+            self.wake_position = None
+        return reached
+    
+    def latest(self, n):
+        """
+        Get the newest n samples without copying
+        
+        Args:
+            n: Window length in samples (at most capacity)
+        
+        Returns:
+            numpy.ndarray: Read-only float32 view, or None if fewer than n samples were written
+        """
+        total = self.total_written
+        if n > min(total, self.capacity):
+            return None
+        return self._view(total, n)
+    
+    def since(self, position):
+        """
+        Get the samples written after an absolute stream position without copying
+        
+        Args:
+            position: Value of total_written returned by the previous call (0 at start)
+        
+        Returns:
+            tuple: (read-only view of the new samples, new position). At most
+                   capacity samples are returned if the reader fell behind.
+        """
+        total = self.total_written
+        count = min(total - position, self.capacity)
+        if count <= 0:
+            return self.buffer[:0], total
+        return self._view(total, count), total
+    
+    def _view(self, total, n):
+        """Read-only view of the n samples ending at absolute position total"""
+        end = total % self.capacity + self.capacity
+        view = self.buffer[end - n:end]
+        view.flags.writeable = False
+        return view
+    
+    def clear(self):
+        """Drop all samples"""
+        self.total_written = 0
+        self.last_write_time = None
+    
+    def __len__(self):
+        """Number of samples currently available"""
+        return min(self.total_written, self.capacity)
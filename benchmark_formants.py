@@ -0,0 +1,74 @@
+"""
+Formant Estimation Micro-Benchmark
+Compares the legacy Levinson-Durbin loop + np.roots formant search with the
+FormantEstimator (solve_toeplitz LPC, batched companion-matrix eigenvalues)
+Reports per-chunk latency and formant agreement on 1.5 s voiced test chunks
+"""
+
+import numpy as np
+from benchmark_pitch import make_voiced_chunk, measure
+from formant_estimator import FormantEstimator
+from pitch_engine import PitchEngine
+
+SAMPLE_RATE = 16000
+LPC_ORDER = int(SAMPLE_RATE / 1000) + 2
+
+def legacy_formants(autocorr, sample_rate=SAMPLE_RATE, order=LPC_ORDER):
+    """Original _estimate_formants(): Python Levinson-Durbin recursion, then np.roots"""
+    try:
+        r = autocorr[:order + 1]
+        a = np.zeros(order + 1)
+        a[0] = 1.0
+        e = r[0]
+        for i in range(1, order + 1):
+            lambda_val = -np.sum(a[:i] * r[i:0:-1]) / e
+            a[1:i+1] += lambda_val * a[i-1::-1]
+            a[i] = lambda_val
+            e *= (1 - lambda_val ** 2)
+        
+        roots = np.roots(a)
+        roots = roots[np.imag(roots) >= 0]
+        angles = np.arctan2(np.imag(roots), np.real(roots))
+        freqs = sorted(angles * (sample_rate / (2 * np.pi)))
+        formants = freqs[:3] if len(freqs) >= 3 else freqs + [0] * (3 - len(freqs))
+        return {'F1': formants[0], 'F2': formants[1], 'F3': formants[2]}
+    except:
+        return {'F1': 500, 'F2': 1500, 'F3': 2500}
+
+def run_benchmark(batch_size=200):
+    """
+    Run the formant benchmark
+    
+    Args:
+        batch_size: Number of chunks solved together in the batched variant
+    """
+    print("=" * 70)
+    print(f" FORMANT ESTIMATION BENCHMARK (LPC order {LPC_ORDER}, 1.5 s chunks @ 16 kHz)")
+    print("=" * 70)
+    
+    engine = PitchEngine(SAMPLE_RATE)
+    estimator = FormantEstimator(SAMPLE_RATE, order=LPC_ORDER)
+    
+    # Autocorrelations as the shared spectral front-end would supply them
+    f0s = np.linspace(85.0, 320.0, batch_size)
+    autocorrs = np.array([engine.autocorrelation(make_voiced_chunk(f0, seed=i), LPC_ORDER)
+                          for i, f0 in enumerate(f0s)])
+    
+    print("\n⏱️  Latency per chunk")
+    legacy_ms = measure(legacy_formants, autocorrs[0], iterations=200)
+    single_ms = measure(estimator.estimate, autocorrs[0], iterations=200)
+    batch_ms = measure(estimator.estimate_batch, autocorrs, iterations=10) / batch_size
+    for name, latency_ms in [("legacy Levinson + np.roots", legacy_ms),
+                             ("FormantEstimator.estimate", single_ms),
+                             (f"FormantEstimator batch of {batch_size}", batch_ms)]:
+        print(f"   {name:34s} {latency_ms:8.4f} ms  ({legacy_ms / latency_ms:6.1f}x)")
+    
+    print("\n🎯 Agreement with the legacy estimator")
+    legacy = np.array([[f['F1'], f['F2'], f['F3']] for f in map(legacy_formants, autocorrs)])
+    batched = np.array([[f['F1'], f['F2'], f['F3']] for f in estimator.estimate_batch(autocorrs)])
+    print(f"   Max |difference| over {batch_size} chunks: {np.max(np.abs(legacy - batched)):.2e} Hz")
+    
+    print("\n" + "=" * 70)
+
+if __name__ == "__main__":
+    run_benchmark()
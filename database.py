@@ -48,13 +48,13 @@ class StressDatabase:
     
     def save_stress_reading(self, face_emotion, face_confidence, 
                            speech_emotion, speech_confidence, 
-                           stress_level, stress_score):
-        """Save a stress reading to the database"""
+                           stress_level, stress_score, timestamp=None):
+        """Save a stress reading to the database (timestamp: datetime or epoch seconds, default now)"""
         conn = self.get_connection()
         cursor = conn.cursor()
         
         # Use explicit timestamp to avoid timezone issues
-        current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        current_time = self._format_timestamp(timestamp)
         
         cursor.execute('''
             INSERT INTO stress_readings 
@@ -67,6 +67,39 @@ class StressDatabase:
         conn.commit()
         conn.close()
     
+    def save_stress_readings(self, readings):
+        """
+        Save many stress readings in one transaction (offline ingestion)
+        
+        Args:
+            readings: Iterable of (timestamp, face_emotion, face_confidence, speech_emotion,
+                      speech_confidence, stress_level, stress_score) tuples
+        """
+        rows = [(self._format_timestamp(reading[0]),) + tuple(reading[1:]) for reading in readings]
+        if not rows:
+            return
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        
+        cursor.executemany('''
+            INSERT INTO stress_readings 
+            (timestamp, face_emotion, face_confidence, speech_emotion, speech_confidence, 
+             stress_level, stress_score)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        
+        conn.commit()
+        conn.close()
+    
+    def _format_timestamp(self, timestamp=None):
+        """Format a datetime or epoch seconds (default now) the way readings are stored"""
+        if timestamp is None:
+            timestamp = datetime.now()
+        elif not isinstance(timestamp, datetime):
+            timestamp = datetime.fromtimestamp(timestamp)
+        return timestamp.strftime('%Y-%m-%d %H:%M:%S')
+    
     def get_recent_readings(self, limit=50):
         """Get the most recent stress readings"""
         conn = self.get_connection()
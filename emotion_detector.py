@@ -9,9 +9,19 @@ import numpy as np
 from deepface import DeepFace
 from collections import deque
 import time
+import math
+from face_tracker import FaceTracker
+from frame_preprocessor import FramePreprocessor
+from motion_gate import MotionGate
+from face_registry import FaceTrackRegistry
 
 class FaceEmotionDetector:
-    def __init__(self, backend='opencv', model_name='Facenet512', enable_smoothing=True):
+    def __init__(self, backend='opencv', model_name='Facenet512', enable_smoothing=True,
+                 enable_tracking=True, detection_interval=10, tracker_type='optical_flow',
+                 min_tracking_confidence=0.5, roi_padding=0.2, luminance_preprocessing=False,
+                 detection_scale=1.0, frame_budget_ms=25.0, min_analysis_hz=2.0,
+                 enable_motion_gate=True, motion_threshold=3.0, max_stale_frames=15,
+                 max_faces=3, min_face_size=40):
         """
         Initialize the enhanced face emotion detector
         
@@ -19,6 +29,23 @@ class FaceEmotionDetector:
             backend: Face detection backend ('opencv', 'ssd', 'mtcnn', 'retinaface')
             model_name: Emotion model ('VGG-Face', 'Facenet', 'Facenet512', 'OpenFace')
             enable_smoothing: Enable temporal smoothing for stability
+            enable_tracking: Track the face box between full detections
+            detection_interval: Re-run full detection at least every N frames while tracking
+            tracker_type: Face tracker ('optical_flow', 'kcf', 'csrt')
+            min_tracking_confidence: Re-run full detection when tracking confidence drops below this
+            roi_padding: Fraction of the face size added around tracked face crops
+            luminance_preprocessing: Apply CLAHE to a grayscale copy only (faster, drops color)
+            detection_scale: Run face detection on a frame resized by this factor
+                (e.g. 0.5 detects 640x480 faces on 320x240); classification always
+                uses the full-resolution crop
+            frame_budget_ms: Average inference time per captured frame that process_frame()
+                aims for; the inference stride grows when detect_emotion is slower
+            min_analysis_hz: process_frame() never analyzes fewer frames per second than this
+            enable_motion_gate: Reuse the previous result when the face region barely changed
+            motion_threshold: Mean gray-level change of the face thumbnail treated as static
+            max_stale_frames: Maximum consecutive frames a gated result may be reused
+            max_faces: Most faces classified per frame by detect_emotion(all_faces=True)
+            min_face_size: Faces smaller than this (pixels, shorter side) are skipped in multi-face mode
         """
         print("Initializing Enhanced Face Emotion Detector (DeepFace)...")
         
@@ -40,12 +67,63 @@ class FaceEmotionDetector:
         self.failed_detections = 0
         self.processing_times = deque(maxlen=30)
         
+        # Latency of full detection passes only (drives the inference stride)
+        self.full_inference_times = deque(maxlen=30)
+        
+        # Preprocessing (single CLAHE instance, reused buffers)
+        self.preprocessor = FramePreprocessor(clip_limit=3.0, tile_grid_size=(8, 8))
+        self.luminance_preprocessing = luminance_preprocessing
+        
+        # Multi-scale: detect on a downscaled copy, classify at full resolution
+        self.detection_scale = min(max(detection_scale, 0.05), 1.0)
+        
+        # Adaptive frame skipping for process_frame()
+        self.frame_budget_ms = frame_budget_ms
+        self.min_analysis_hz = min_analysis_hz
+        self.inference_stride = 1
+        self.frames_seen = 0
+        self.frames_since_analysis = 0
+        self.dropped_frames = 0
+        self.frame_timestamps = deque(maxlen=30)
+        self.last_result = (None, 0.0, None)
+        
+        # Motion gate: skip inference on static frames
+        self.motion_gate = MotionGate(threshold=motion_threshold,
+                                      max_stale_frames=max_stale_frames) if enable_motion_gate else None
+        
         # Cache for face detection (reduce redundant detections)
         self.last_face_location = None
         self.frames_since_detection = 0
         
+        # Track-then-detect: follow the face box between full detections
+        self.enable_tracking = enable_tracking
+        self.detection_interval = max(detection_interval, 1)
+        self.min_tracking_confidence = min_tracking_confidence
+        self.face_tracker = FaceTracker(tracker_type=tracker_type) if enable_tracking else None
+        self.full_detections = 0
+        self.tracked_frames = 0
+        
+        # ROI classification of tracked faces (detection skipped)
+        self.roi_padding = roi_padding
+        self.roi_classifications = 0
+        
+        # Multi-face mode: stable track IDs and per-track smoothing
+        self.max_faces = max(max_faces, 1)
+        self.min_face_size = min_face_size
+        self.face_registry = FaceTrackRegistry()
+        self.skipped_faces = 0
+        self.current_faces = []
+        
+        # Batched inference (emotion model loaded lazily on first batch)
+        self.emotion_model = None
+        self.batch_calls = 0
+        self.batch_faces = 0
+        
         print(f"✅ Using DeepFace with {model_name} model and {backend} detector")
         print(f"✅ Temporal smoothing: {'Enabled' if enable_smoothing else 'Disabled'}")
+        if enable_tracking:
+            print(f"✅ Face tracking: {self.face_tracker.tracker_type} "
+                  f"(full detection every {self.detection_interval} frames)")
         
         # Warm up the model
         self._warmup_model()
@@ -63,35 +141,132 @@ class FaceEmotionDetector:
         except Exception as e:
             print(f"⚠️  Model warmup failed: {e}")
     
-    def detect_emotion(self, frame):
+    def process_frame(self, frame, all_faces=False):
+        """
+        Analyze a captured frame, skipping frames to stay within the latency budget
+        
+        Call this for every captured frame. Inference runs on every
+        inference_stride-th frame; the other frames return the cached result.
+        
+        Args:
+            frame: OpenCV image frame (BGR format)
+            all_faces: Analyze every face (see detect_faces); the cached list
+                       is current_faces
+            
+        Returns:
+            tuple: (emotion_label, confidence, face_coordinates), or the list
+                   of per-face dictionaries when all_faces is True
+        """
+        self.frames_seen += 1
+        self.frame_timestamps.append(time.time())
+        self.inference_stride = self._choose_stride()
+        
+        self.frames_since_analysis += 1
+        if self.frames_seen > 1 and self.frames_since_analysis < self.inference_stride:
+            self.dropped_frames += 1
+            return self.current_faces if all_faces else self.last_result
+        
+        self.frames_since_analysis = 0
+        if all_faces:
+            return self.detect_faces(frame)
+        self.last_result = self.detect_emotion(frame)
+        return self.last_result
+    
+    def _choose_stride(self):
+        """
+        Pick the inference stride from recent full-detection latency
+        
+        Tracked-ROI frames are much cheaper, so they are left out: the stride
+        must cover the expensive passes.
+        
+        Returns:
+            int: Analyze one frame out of this many
+        """
+        if not self.frame_budget_ms or len(self.full_inference_times) == 0:
+            return 1
+        
+        # Enough skipped frames to spread one inference over the per-frame budget
+        latency = np.mean(self.full_inference_times)
+        stride = max(math.ceil(latency * 1000.0 / self.frame_budget_ms), 1)
+        
+        # ...but never fall below the minimum analysis rate
+        if self.min_analysis_hz and len(self.frame_timestamps) > 1:
+            span = self.frame_timestamps[-1] - self.frame_timestamps[0]
+            if span > 0:
+                capture_fps = (len(self.frame_timestamps) - 1) / span
+                stride = min(stride, max(int(capture_fps / self.min_analysis_hz), 1))
+        
+        return stride
+    
+    def detect_emotion(self, frame, all_faces=False):
         """
         Detect emotion from a video frame with enhanced accuracy
         
         Args:
             frame: OpenCV image frame (BGR format)
+            all_faces: Return every face (see detect_faces) instead of the primary one
             
         Returns:
-            tuple: (emotion_label, confidence, face_coordinates)
+            tuple: (emotion_label, confidence, face_coordinates), or a list of
+                   per-face dictionaries when all_faces is True
         """
+        if all_faces:
+            return self.detect_faces(frame)
+        
         try:
             start_time = time.time()
             self.detection_count += 1
             
-            # Preprocess frame
-            processed_frame = self._preprocess_frame(frame)
+            # Static scene: reuse the previous result instead of running inference
+            # (counted as a gate hit by the motion gate, not as processing latency)
+            if self.motion_gate is not None and self.last_face_location is not None:
+                signature = self.motion_gate.signature(frame, self.last_face_location)
+                if self.motion_gate.is_static(signature):
+                    return self.last_emotion, self.last_confidence, self.last_face_location
             
-            # Analyze emotions using DeepFace
-            result = DeepFace.analyze(
-                processed_frame,
-                actions=['emotion'],
-                detector_backend=self.backend,
-                enforce_detection=False,
-                silent=True
-            )
+            # Follow the known face box instead of running the full detector
+            full_detection = False
+            tracked = self._track_face(frame)
+            if tracked is not None:
+                # Face box known: classify only the padded face crop
+                result = self._classify_face_roi(frame, tracked)
+                if result is not None:
+                    x, y, w, h = tracked
+                    result['region'] = {'x': x, 'y': y, 'w': w, 'h': h}
+            elif self.detection_scale < 1.0:
+                full_detection = True
+                self.full_detections += 1
+                self.frames_since_detection = 0
+                
+                # Detect on the downscaled copy, classify the full-resolution crop
+                face_box = self._locate_face(frame)
+                result = self._classify_face_roi(frame, face_box) if face_box is not None else None
+                if result is not None:
+                    x, y, w, h = face_box
+                    result['region'] = {'x': x, 'y': y, 'w': w, 'h': h}
+            else:
+                full_detection = True
+                self.full_detections += 1
+                self.frames_since_detection = 0
+                
+                # Preprocess frame
+                processed_frame = self._preprocess_frame(frame)
+                
+                # Analyze emotions using DeepFace
+                result = DeepFace.analyze(
+                    processed_frame,
+                    actions=['emotion'],
+                    detector_backend=self.backend,
+                    enforce_detection=False,
+                    silent=True
+                )
+                
+                # Handle both single face and multiple faces
+                if isinstance(result, list):
+                    result = result[0] if len(result) > 0 else None
             
-            # Handle both single face and multiple faces
-            if isinstance(result, list):
-                result = result[0] if len(result) > 0 else None
+            if full_detection:
+                self.full_inference_times.append(time.time() - start_time)
             
             if result and 'emotion' in result:
                 # Extract emotion data
@@ -109,6 +284,8 @@ class FaceEmotionDetector:
                                  face_region.get('w', 0), face_region.get('h', 0)
                     face_coords = (x, y, w, h)
                     self.last_face_location = face_coords
+                    if tracked is None and self.face_tracker is not None:
+                        self.face_tracker.init(frame, face_coords)
                 
                 # Apply temporal smoothing if enabled
                 if self.enable_smoothing:
@@ -121,6 +298,10 @@ class FaceEmotionDetector:
                 self.last_confidence = confidence
                 self.failed_detections = 0
                 
+                # Later frames are compared against this one by the motion gate
+                if self.motion_gate is not None and face_coords is not None:
+                    self.motion_gate.set_reference(self.motion_gate.signature(frame, face_coords))
+                
                 # Performance tracking
                 processing_time = time.time() - start_time
                 self.processing_times.append(processing_time)
@@ -135,6 +316,10 @@ class FaceEmotionDetector:
             else:
                 # No face detected
                 self.failed_detections += 1
+                if self.face_tracker is not None:
+                    self.face_tracker.reset()
+                if self.motion_gate is not None:
+                    self.motion_gate.reset()
                 
                 # Use smoothed history if available
                 if self.enable_smoothing and len(self.emotion_history) > 0:
@@ -158,30 +343,339 @@ class FaceEmotionDetector:
             
             return None, 0.0, None
     
+    def detect_faces(self, frame):
+        """
+        Detect emotions for every face in a frame, each with a stable track ID
+        
+        Faces below min_face_size are skipped and at most max_faces (largest
+        first) are classified, all in one batched forward pass. Each track
+        keeps its own smoothing history. The result is cached in current_faces
+        and reused while the motion gate sees the faces' region as static.
+        
+        Args:
+            frame: OpenCV image frame (BGR format)
+            
+        Returns:
+            list: Dictionaries with 'track_id', 'emotion', 'confidence' and
+                  'face_coords', largest face first
+        """
+        faces = []
+        
+        try:
+            start_time = time.time()
+            self.detection_count += 1
+            
+            # Static scene: reuse the cached faces (a gate hit, not processing latency)
+            if self.motion_gate is not None and self.current_faces:
+                region = self._enclosing_box([face['face_coords'] for face in self.current_faces])
+                if self.motion_gate.is_static(self.motion_gate.signature(frame, region)):
+                    return self.current_faces
+            
+            self.full_detections += 1
+            boxes = [box for box in self._locate_faces(frame)
+                     if min(box[2], box[3]) >= self.min_face_size]
+            boxes.sort(key=lambda box: box[2] * box[3], reverse=True)
+            self.skipped_faces += max(len(boxes) - self.max_faces, 0)
+            boxes = boxes[:self.max_faces]
+            
+            crops, kept = [], []
+            for box in boxes:
+                crop = self._crop_face(frame, box)
+                if crop is not None:
+                    crops.append(crop)
+                    kept.append(box)
+            
+            tracks = self.face_registry.update(kept)
+            if crops:
+                for track, box, emotion_scores in zip(tracks, kept, self._classify_crops(crops)):
+                    dominant_emotion = max(emotion_scores, key=emotion_scores.get)
+                    confidence = emotion_scores[dominant_emotion] / 100.0
+                    if self.enable_smoothing:
+                        dominant_emotion, confidence = self._apply_smoothing(
+                            dominant_emotion, confidence, emotion_scores, state=track
+                        )
+                    faces.append({
+                        'track_id': track.track_id,
+                        'emotion': dominant_emotion,
+                        'confidence': confidence,
+                        'face_coords': box
+                    })
+            
+            # Same bookkeeping as detect_emotion(): consecutive misses, latency
+            # (every pass runs the full detector, so it also drives the stride)
+            if faces:
+                self.failed_detections = 0
+                self.last_face_location = faces[0]['face_coords']
+                if self.motion_gate is not None:
+                    region = self._enclosing_box([face['face_coords'] for face in faces])
+                    self.motion_gate.set_reference(self.motion_gate.signature(frame, region))
+            else:
+                self.failed_detections += 1
+                if self.motion_gate is not None:
+                    self.motion_gate.reset()
+            self.full_inference_times.append(time.time() - start_time)
+            self.processing_times.append(time.time() - start_time)
+            
+        except Exception as e:
+            self.failed_detections += 1
+            if self.failed_detections % 20 == 0:
+                print(f"❌ Multi-face detection error: {e}")
+        
+        self.current_faces = faces
+        return faces
+    
+    @staticmethod
+    def _enclosing_box(boxes):
+        """
+        Smallest box containing all the given face boxes
+        
+        Args:
+            boxes: (x, y, w, h) face boxes
+        
+        Returns:
+            tuple: (x, y, w, h)
+        """
+        x0 = min(x for x, y, w, h in boxes)
+        y0 = min(y for x, y, w, h in boxes)
+        x1 = max(x + w for x, y, w, h in boxes)
+        y1 = max(y + h for x, y, w, h in boxes)
+        return x0, y0, x1 - x0, y1 - y0
+    
+    def detect_emotions_batch(self, frames):
+        """
+        Detect emotions for many frames (e.g. one per camera) with a single model call
+        
+        Faces are located per frame, then all face crops are classified in one
+        batched forward pass. Temporal smoothing and tracking are not applied,
+        the per-stream state of detect_emotion() is left untouched.
+        
+        Args:
+            frames: List of OpenCV image frames (BGR format)
+            
+        Returns:
+            list: (emotion_label, confidence, face_coordinates) per input frame,
+                  (None, 0.0, None) for frames without a face
+        """
+        results = [(None, 0.0, None)] * len(frames)
+        
+        try:
+            start_time = time.time()
+            
+            # Collect one padded face crop per frame
+            crops, owners, boxes = [], [], []
+            for index, frame in enumerate(frames):
+                face_coords = self._locate_face(frame)
+                if face_coords is None:
+                    continue
+                crop = self._crop_face(frame, face_coords)
+                if crop is None:
+                    continue
+                crops.append(crop)
+                owners.append(index)
+                boxes.append(face_coords)
+            
+            if not crops:
+                return results
+            
+            # One forward pass for every face, then fan results back out per frame
+            for index, face_coords, emotion_scores in zip(owners, boxes, self._classify_crops(crops)):
+                dominant_emotion = max(emotion_scores, key=emotion_scores.get)
+                confidence = emotion_scores[dominant_emotion] / 100.0
+                results[index] = (dominant_emotion, confidence, face_coords)
+            
+            self.batch_calls += 1
+            self.batch_faces += len(crops)
+            
+            if self.batch_calls % 100 == 0:
+                elapsed = (time.time() - start_time) * 1000
+                print(f"✅ Batch of {len(frames)} frames ({len(crops)} faces) in {elapsed:.1f}ms")
+            
+        except Exception as e:
+            print(f"❌ Batch face detection error: {e}")
+        
+        return results
+    
+    def _locate_face(self, frame):
+        """
+        Find the face bounding box in a frame without classifying it
+        
+        Args:
+            frame: OpenCV image frame (BGR)
+            
+        Returns:
+            tuple: Face coordinates (x, y, w, h), or None if no face was found
+        """
+        boxes = self._locate_faces(frame)
+        return boxes[0] if boxes else None
+    
+    def _locate_faces(self, frame):
+        """
+        Find all face bounding boxes in a frame without classifying them
+        
+        Detection runs at detection_scale on the same CLAHE-preprocessed input
+        as the full-frame path; boxes are mapped back to full-resolution
+        coordinates.
+        
+        Args:
+            frame: OpenCV image frame (BGR)
+            
+        Returns:
+            list: Face coordinates (x, y, w, h) in detector order
+        """
+        scale = self.detection_scale
+        detection_frame = self.preprocessor.downscale(frame, scale) if scale < 1.0 else frame
+        
+        faces = DeepFace.extract_faces(
+            self._preprocess_frame(detection_frame),
+            detector_backend=self.backend,
+            enforce_detection=False,
+            align=False
+        )
+        
+        small_h, small_w = detection_frame.shape[:2]
+        frame_h, frame_w = frame.shape[:2]
+        boxes = []
+        for face in faces:
+            region = face.get('facial_area', {})
+            x, y, w, h = region.get('x', 0), region.get('y', 0), region.get('w', 0), region.get('h', 0)
+            # DeepFace returns the whole frame when enforce_detection is off and nothing was found
+            if w <= 0 or h <= 0 or (w >= small_w and h >= small_h):
+                continue
+            
+            # Map back to full-resolution coordinates
+            x0, y0 = max(int(x / scale), 0), max(int(y / scale), 0)
+            x1, y1 = min(int((x + w) / scale), frame_w), min(int((y + h) / scale), frame_h)
+            boxes.append((x0, y0, x1 - x0, y1 - y0))
+        
+        return boxes
+    
+    def _crop_face(self, frame, face_coords):
+        """
+        Cut the padded face region out of a frame
+        
+        Args:
+            frame: OpenCV image frame (BGR)
+            face_coords: Face bounding box (x, y, w, h)
+            
+        Returns:
+            numpy.ndarray: Face crop (view into frame), or None if the box is empty
+        """
+        x, y, w, h = face_coords
+        pad = int(self.roi_padding * max(w, h))
+        frame_h, frame_w = frame.shape[:2]
+        x0, y0 = max(x - pad, 0), max(y - pad, 0)
+        x1, y1 = min(x + w + pad, frame_w), min(y + h + pad, frame_h)
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return frame[y0:y1, x0:x1]
+    
+    def _get_emotion_model(self):
+        """Load the DeepFace emotion model once for direct batched prediction"""
+        if self.emotion_model is None:
+            model = DeepFace.build_model('Emotion')
+            # Newer DeepFace versions wrap the Keras model in a client object
+            self.emotion_model = getattr(model, 'model', model)
+        return self.emotion_model
+    
+    def _classify_crops(self, crops):
+        """
+        Classify a list of face crops in one forward pass
+        
+        Args:
+            crops: List of face crops (BGR)
+            
+        Returns:
+            list: Emotion score dictionaries (percentages, DeepFace format) per crop
+        """
+        # Same input format DeepFace uses for its emotion model: 48x48 gray in [0, 1]
+        batch = np.empty((len(crops), 48, 48, 1), dtype=np.float32)
+        for i, crop in enumerate(crops):
+            gray = self.preprocessor.process(crop, luminance_only=True, as_rgb=False)
+            batch[i, :, :, 0] = cv2.resize(gray, (48, 48), interpolation=cv2.INTER_AREA) / 255.0
+        
+        predictions = self._get_emotion_model().predict(batch, verbose=0)
+        
+        scores = []
+        for prediction in predictions:
+            total = float(np.sum(prediction)) or 1.0
+            scores.append({emotion: 100.0 * float(p) / total
+                           for emotion, p in zip(self.emotions, prediction)})
+        return scores
+    
+    def _track_face(self, frame):
+        """
+        Advance the face tracker if a full detection is not due yet
+        
+        Args:
+            frame: OpenCV image frame (BGR)
+            
+        Returns:
+            tuple: Tracked face coordinates, or None if full detection should run
+        """
+        if self.face_tracker is None or not self.face_tracker.is_active:
+            return None
+        
+        if self.frames_since_detection + 1 >= self.detection_interval:
+            return None
+        
+        box, tracking_confidence = self.face_tracker.update(frame)
+        if box is None or tracking_confidence < self.min_tracking_confidence:
+            self.face_tracker.reset()
+            return None
+        
+        self.frames_since_detection += 1
+        self.tracked_frames += 1
+        self.last_face_location = box
+        return box
+    
+    def _classify_face_roi(self, frame, face_coords):
+        """
+        Classify emotion on a padded face crop with face detection skipped
+        
+        Args:
+            frame: OpenCV image frame (BGR)
+            face_coords: Known face bounding box (x, y, w, h)
+            
+        Returns:
+            dict: DeepFace analysis result for the crop, or None if the crop is empty
+        """
+        crop = self._crop_face(frame, face_coords)
+        if crop is None:
+            return None
+        
+        # CLAHE on the crop only, cost scales with face size
+        roi = self._preprocess_frame(crop)
+        
+        result = DeepFace.analyze(
+            roi,
+            actions=['emotion'],
+            detector_backend='skip',
+            enforce_detection=False,
+            silent=True
+        )
+        
+        if isinstance(result, list):
+            result = result[0] if len(result) > 0 else None
+        
+        self.roi_classifications += 1
+        return result
+    
     def _preprocess_frame(self, frame):
         """
         Preprocess frame for better emotion detection
         
+        The returned array is a reused buffer, valid until the next call.
+        
         Args:
             frame: OpenCV image frame (BGR)
             
         Returns:
             Preprocessed frame (RGB)
         """
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Apply CLAHE for better contrast in varying lighting
-        lab = cv2.cvtColor(rgb_frame, cv2.COLOR_RGB2LAB)
-        l, a, b = cv2.split(lab)
-        clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8, 8))
-        l = clahe.apply(l)
-        enhanced = cv2.merge([l, a, b])
-        enhanced_rgb = cv2.cvtColor(enhanced, cv2.COLOR_LAB2RGB)
-        
-        return enhanced_rgb
+        # CLAHE for better contrast in varying lighting
+        return self.preprocessor.process(frame, luminance_only=self.luminance_preprocessing)
     
-    def _apply_smoothing(self, emotion, confidence, emotion_scores):
+    def _apply_smoothing(self, emotion, confidence, emotion_scores, state=None):
         """
         Apply temporal smoothing to reduce flickering
         
@@ -189,26 +683,32 @@ class FaceEmotionDetector:
             emotion: Current detected emotion
             confidence: Current confidence score
             emotion_scores: Dictionary of all emotion scores
+            state: Object holding emotion_history/confidence_history (a FaceTrack);
+                   defaults to the detector's single-face history
             
         Returns:
             tuple: (smoothed_emotion, smoothed_confidence)
         """
+        state = state or self
+        emotion_history = state.emotion_history
+        confidence_history = state.confidence_history
+        
         # Add current detection to history
-        self.emotion_history.append(emotion)
-        self.confidence_history.append(confidence)
+        emotion_history.append(emotion)
+        confidence_history.append(confidence)
         
         # Need at least 3 samples for smoothing
-        if len(self.emotion_history) < 3:
+        if len(emotion_history) < 3:
             return emotion, confidence
         
         # Count emotion occurrences in recent history
         emotion_counts = {}
-        for e in self.emotion_history:
+        for e in emotion_history:
             emotion_counts[e] = emotion_counts.get(e, 0) + 1
         
         # Get most frequent emotion
         most_frequent = max(emotion_counts, key=emotion_counts.get)
-        frequency_ratio = emotion_counts[most_frequent] / len(self.emotion_history)
+        frequency_ratio = emotion_counts[most_frequent] / len(emotion_history)
         
         # If current emotion appears frequently, boost confidence
         if most_frequent == emotion and frequency_ratio > 0.5:
@@ -218,7 +718,7 @@ class FaceEmotionDetector:
         # If different from recent trend, require higher confidence
         elif most_frequent != emotion and confidence < 0.6:
             # Stick with previous trend
-            avg_confidence = np.mean(self.confidence_history)
+            avg_confidence = np.mean(confidence_history)
             return most_frequent, avg_confidence
         
         # Normal case
@@ -335,13 +835,30 @@ class FaceEmotionDetector:
             dict: Statistics about detection performance
         """
         avg_processing_time = np.mean(self.processing_times) if len(self.processing_times) > 0 else 0
+        avg_full_detection = np.mean(self.full_inference_times) if len(self.full_inference_times) > 0 else 0
         success_rate = (self.detection_count - self.failed_detections) / max(self.detection_count, 1)
         
-        return {
+        stats = {
             'total_detections': self.detection_count,
             'failed_detections': self.failed_detections,
             'success_rate': success_rate,
             'avg_processing_time_ms': avg_processing_time * 1000,
+            'avg_full_detection_ms': avg_full_detection * 1000,
             'current_emotion': self.last_emotion,
-            'current_confidence': self.last_confidence
+            'current_confidence': self.last_confidence,
+            'full_detections': self.full_detections,
+            'tracked_frames': self.tracked_frames,
+            'roi_classifications': self.roi_classifications,
+            'batch_calls': self.batch_calls,
+            'batch_faces': self.batch_faces,
+            'inference_stride': self.inference_stride,
+            'frames_seen': self.frames_seen,
+            'dropped_frames': self.dropped_frames,
+            'active_face_tracks': len(self.face_registry.tracks),
+            'skipped_faces': self.skipped_faces
         }
+        
+        if self.motion_gate is not None:
+            stats.update(self.motion_gate.get_statistics())
+        
+        return stats
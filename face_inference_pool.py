@@ -0,0 +1,340 @@
+"""
+Face Inference Process Pool
+Runs FaceEmotionDetector in N worker processes, each with its own warmed model
+Frames go in and results come back over queues, so inference is not bound by the GIL
+Frames travel through shared memory slots; only slot indices are pickled
+"""
+
+import time
+import queue
+import threading
+import itertools
+import multiprocessing
+import numpy as np
+from collections import deque
+from shared_frames import SharedFrameRing
+
+def _inference_worker_main(worker_id, detector_kwargs, task_queue, result_queue):
+    """
+    Worker process entry point: build a detector once, then serve frames
+    
+    Args:
+        worker_id: Index of this worker
+        detector_kwargs: Keyword arguments for FaceEmotionDetector
+        task_queue: Queue of (job_id, frame or shared frame reference) tuples, None to shut down
+        result_queue: Queue receiving ('ready', worker_id) and ('result', job_id, result)
+    """
+    # Imported here so the parent process never has to load TensorFlow
+    from emotion_detector import FaceEmotionDetector
+    
+    detector = FaceEmotionDetector(**detector_kwargs)
+    result_queue.put(('ready', worker_id))
+    
+    # Shared frame ring this worker has mapped, by name (at most one at a time)
+    rings = {}
+    
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        
+        job_id, frame = task
+        try:
+            if isinstance(frame, tuple):
+                # ('shm', ring_descriptor, slot, sequence): map the slot, no copy
+                _, descriptor, slot, sequence = frame
+                ring = rings.get(descriptor['name'])
+                if ring is None:
+                    # The parent replaced its ring (e.g. resolution change):
+                    # release the stale mappings before attaching the new one
+                    for stale in rings.values():
+                        stale.close()
+                    rings.clear()
+                    ring = rings[descriptor['name']] = SharedFrameRing.attach(descriptor)
+                frame = ring.read(slot, sequence)
+            
+            if frame is None:
+                result = (None, 0.0, None)
+            else:
+                result = detector.detect_emotion(frame)
+        except Exception as e:
+            print(f"❌ Inference worker {worker_id} error: {e}")
+            result = (None, 0.0, None)
+        
+        frame = None
+        result_queue.put(('result', job_id, result))
+    
+    for ring in rings.values():
+        ring.close()
+
+class FaceInferencePool:
+    def __init__(self, num_workers=2, detector_kwargs=None, max_pending=None, use_shared_memory=True):
+        """
+        Initialize the face inference process pool
+        
+        Each worker keeps its own tracking and smoothing state. Frames are
+        distributed to whichever worker is free, so every worker sees a
+        subsample of the stream.
+        
+        Args:
+            num_workers: Number of worker processes
+            detector_kwargs: Keyword arguments passed to FaceEmotionDetector in each worker
+            max_pending: Maximum queued frames before submit() starts dropping (default 2 per worker)
+            use_shared_memory: Pass frames through a shared-memory slot ring instead of pickling them
+        """
+        self.num_workers = max(num_workers, 1)
+        self.detector_kwargs = detector_kwargs or {}
+        self.max_pending = max_pending or 2 * self.num_workers
+        
+        # Spawn, not fork: TensorFlow is not fork-safe
+        self.context = multiprocessing.get_context('spawn')
+        self.task_queue = self.context.Queue(maxsize=self.max_pending)
+        self.result_queue = self.context.Queue()
+        self.workers = []
+        
+        self.job_ids = itertools.count(1)
+        self.pending = {}
+        self.completed = {}
+        self.result_lock = threading.Lock()
+        
+        # Shared-memory frame slots (created on the first frame, sized for every
+        # frame that can be queued or in a worker at the same time)
+        self.use_shared_memory = use_shared_memory
+        self.frame_ring = None
+        self.free_slots = []
+        self.job_slots = {}
+        
+        self.is_running = False
+        
+        # Statistics
+        self.submitted = 0
+        self.dropped = 0
+        self.latencies = deque(maxlen=30)
+    
+    def start(self, timeout=120.0):
+        """
+        Start the worker processes and wait until every model is warmed up
+        
+        Args:
+            timeout: Maximum time to wait for workers to become ready
+        
+        Returns:
+            bool: True if all workers reported ready
+        """
+        if self.is_running:
+            return True
+        
+        print(f"🚀 Starting {self.num_workers} face inference worker processes...")
+        for worker_id in range(self.num_workers):
+            process = self.context.Process(
+                target=_inference_worker_main,
+                args=(worker_id, self.detector_kwargs, self.task_queue, self.result_queue),
+                daemon=True
+            )
+            process.start()
+            self.workers.append(process)
+        
+        ready = 0
+        deadline = time.time() + timeout
+        while ready < self.num_workers and time.time() < deadline:
+            try:
+                message = self.result_queue.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            if message[0] == 'ready':
+                ready += 1
+        
+        self.is_running = ready == self.num_workers
+        if self.is_running:
+            print(f"✅ Face inference pool ready ({self.num_workers} workers)")
+        else:
+            print(f"⚠️  Only {ready}/{self.num_workers} inference workers became ready")
+            self.stop()
+        
+        return self.is_running
+    
+    def stop(self):
+        """Shut down all worker processes"""
+        self.is_running = False
+        
+        for _ in self.workers:
+            try:
+                self.task_queue.put(None, timeout=1.0)
+            except queue.Full:
+                break
+        
+        for process in self.workers:
+            process.join(timeout=5.0)
+            if process.is_alive():
+                process.terminate()
+        
+        self.workers = []
+        
+        if self.frame_ring is not None:
+            self.frame_ring.close()
+            self.frame_ring = None
+    
+    def _share_frame(self, frame):
+        """
+        Copy a frame into a free shared-memory slot
+        
+        Args:
+            frame: OpenCV image frame (BGR)
+            
+        Returns:
+            tuple: (frame reference to send, slot index); (None, None) if no slot is free
+        """
+        if not self.use_shared_memory:
+            return frame, None
+        
+        with self.result_lock:
+            ring = self.frame_ring
+            if ring is None or ring.shape != frame.shape or ring.dtype != frame.dtype:
+                # Resize the ring only once the old frames are no longer in use
+                if self.job_slots:
+                    return None, None
+                if ring is not None:
+                    ring.close()
+                ring = self.frame_ring = SharedFrameRing(frame.shape, self.max_pending + self.num_workers,
+                                                         dtype=frame.dtype)
+                self.free_slots = list(range(ring.num_slots))
+            
+            if not self.free_slots:
+                return None, None
+            slot = self.free_slots.pop()
+        
+        sequence = ring.write(slot, frame)
+        return ('shm', ring.describe(), slot, sequence), slot
+    
+    def _release_slot(self, job_id):
+        """Return the shared-memory slot used by a job to the free list (result_lock held)"""
+        slot = self.job_slots.pop(job_id, None)
+        if slot is not None:
+            self.free_slots.append(slot)
+    
+    def submit(self, frame):
+        """
+        Queue a frame for inference without waiting
+        
+        Args:
+            frame: OpenCV image frame (BGR)
+        
+        Returns:
+            int: Job id, or None if the pool is saturated and the frame was dropped
+        """
+        frame_ref, slot = self._share_frame(frame)
+        if frame_ref is None:
+            self.dropped += 1
+            return None
+        
+        job_id = next(self.job_ids)
+        with self.result_lock:
+            self.pending[job_id] = time.time()
+            if slot is not None:
+                self.job_slots[job_id] = slot
+        
+        try:
+            self.task_queue.put_nowait((job_id, frame_ref))
+        except queue.Full:
+            with self.result_lock:
+                self.pending.pop(job_id, None)
+                self._release_slot(job_id)
+            self.dropped += 1
+            return None
+        
+        self.submitted += 1
+        return job_id
+    
+    def cancel(self, job_id):
+        """
+        Give up on a submitted job (e.g. its worker died) and free its frame slot
+        
+        A late result for the job is still delivered by get_result(). A worker
+        that reads the slot after it was reused sees a newer sequence number
+        and skips the frame.
+        
+        Args:
+            job_id: Job id returned by submit()
+        """
+        with self.result_lock:
+            self.pending.pop(job_id, None)
+            self._release_slot(job_id)
+    
+    def get_result(self, timeout=None):
+        """
+        Get the next finished result in completion order
+        
+        Args:
+            timeout: Maximum time to wait in seconds (None blocks)
+        
+        Returns:
+            tuple: (job_id, (emotion_label, confidence, face_coordinates)), or None on timeout
+        """
+        with self.result_lock:
+            if self.completed:
+                job_id = min(self.completed)
+                return job_id, self.completed.pop(job_id)
+        
+        try:
+            message = self.result_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+        
+        _, job_id, result = message
+        with self.result_lock:
+            submitted_at = self.pending.pop(job_id, None)
+            self._release_slot(job_id)
+        if submitted_at is not None:
+            self.latencies.append(time.time() - submitted_at)
+        return job_id, result
+    
+    def detect_emotion(self, frame, timeout=5.0):
+        """
+        Synchronous drop-in for FaceEmotionDetector.detect_emotion
+        
+        Args:
+            frame: OpenCV image frame (BGR)
+            timeout: Maximum time to wait for the result
+        
+        Returns:
+            tuple: (emotion_label, confidence, face_coordinates)
+        """
+        job_id = self.submit(frame)
+        if job_id is None:
+            return None, 0.0, None
+        
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            finished = self.get_result(timeout=max(deadline - time.time(), 0.01))
+            if finished is None:
+                break
+            finished_id, result = finished
+            if finished_id == job_id:
+                return result
+            # Someone else's result, keep it for them
+            with self.result_lock:
+                self.completed[finished_id] = result
+        
+        return None, 0.0, None
+    
+    def in_flight(self):
+        """Number of submitted frames still waiting for a result"""
+        with self.result_lock:
+            return len(self.pending)
+    
+    def get_statistics(self):
+        """
+        Get pool statistics
+        
+        Returns:
+            dict: Statistics about submitted, dropped and in-flight frames
+        """
+        avg_latency = np.mean(self.latencies) if len(self.latencies) > 0 else 0
+        
+        return {
+            'num_workers': self.num_workers,
+            'submitted': self.submitted,
+            'dropped': self.dropped,
+            'in_flight': self.in_flight(),
+            'avg_latency_ms': avg_latency * 1000
+        }
@@ -0,0 +1,119 @@
+"""
+Face Track Registry
+Keeps stable IDs for several faces across frames by matching boxes on overlap (IoU)
+Each track carries its own temporal smoothing history
+"""
+
+from collections import deque
+
+def box_iou(box_a, box_b):
+    """
+    Intersection over union of two boxes
+    
+    Args:
+        box_a: Box (x, y, w, h)
+        box_b: Box (x, y, w, h)
+    
+    Returns:
+        float: Overlap ratio in [0, 1]
+    """
+    ax, ay, aw, ah = box_a
+    bx, by, bw, bh = box_b
+    inter_w = min(ax + aw, bx + bw) - max(ax, bx)
+    inter_h = min(ay + ah, by + bh) - max(ay, by)
+    if inter_w <= 0 or inter_h <= 0:
+        return 0.0
+    inter = inter_w * inter_h
+    return inter / float(aw * ah + bw * bh - inter)
+
+class FaceTrack:
+    def __init__(self, track_id, box, history_size=10):
+        """
+        Initialize a face track
+        
+        Args:
+            track_id: Stable identifier of this face
+            box: Initial face box (x, y, w, h)
+            history_size: Number of detections kept for smoothing
+        """
+        self.track_id = track_id
+        self.box = box
+        self.missed_frames = 0
+        self.hits = 1
+        
+        # Per-face temporal smoothing state
+        self.emotion_history = deque(maxlen=history_size)
+        self.confidence_history = deque(maxlen=history_size)
+
+class FaceTrackRegistry:
+    def __init__(self, iou_threshold=0.3, max_missed_frames=5, history_size=10):
+        """
+        Initialize the registry
+        
+        Args:
+            iou_threshold: Minimum overlap for a detection to continue an existing track
+            max_missed_frames: Drop a track after this many updates without a match
+            history_size: Smoothing history length per track
+        """
+        self.iou_threshold = iou_threshold
+        self.max_missed_frames = max_missed_frames
+        self.history_size = history_size
+        
+        self.tracks = {}
+        self.next_id = 1
+    
+    def update(self, boxes):
+        """
+        Match this frame's face boxes to existing tracks
+        
+        Matching is greedy on IoU, best pairs first. Unmatched boxes start
+        new tracks; tracks unmatched for too long are dropped.
+        
+        Args:
+            boxes: List of face boxes (x, y, w, h)
+        
+        Returns:
+            list: FaceTrack for each input box, in the same order
+        """
+        pairs = []
+        for index, box in enumerate(boxes):
+            for track in self.tracks.values():
+                overlap = box_iou(box, track.box)
+                if overlap >= self.iou_threshold:
+                    pairs.append((overlap, index, track.track_id))
+        pairs.sort(reverse=True)
+        
+        assigned = [None] * len(boxes)
+        matched_ids = set()
+        for _, index, track_id in pairs:
+            if assigned[index] is not None or track_id in matched_ids:
+                continue
+            track = self.tracks[track_id]
+            track.box = boxes[index]
+            track.missed_frames = 0
+            track.hits += 1
+            assigned[index] = track
+            matched_ids.add(track_id)
+        
+        # Age out tracks nobody matched
+        for track_id in list(self.tracks):
+            if track_id in matched_ids:
+                continue
+            track = self.tracks[track_id]
+            track.missed_frames += 1
+            if track.missed_frames > self.max_missed_frames:
+                del self.tracks[track_id]
+        
+        # New faces
+        for index, box in enumerate(boxes):
+            if assigned[index] is None:
+                track = FaceTrack(self.next_id, box, self.history_size)
+                self.tracks[track.track_id] = track
+                self.next_id += 1
+                assigned[index] = track
+        
+        return assigned
+    
+    def reset(self):
+        """Forget all tracks"""
+        self.tracks = {}
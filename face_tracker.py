@@ -0,0 +1,154 @@
+"""
+Face Tracker Module
+Lightweight frame-to-frame face box tracking between full detections
+Uses pyramidal Lucas-Kanade optical flow, or an OpenCV KCF/CSRT tracker when available
+"""
+
+import cv2
+import numpy as np
+
+class FaceTracker:
+    def __init__(self, tracker_type='optical_flow', max_points=40, min_points=8):
+        """
+        Initialize the face tracker
+        
+        Args:
+            tracker_type: 'optical_flow', 'kcf' or 'csrt' (KCF/CSRT need opencv-contrib)
+            max_points: Maximum number of feature points tracked inside the face box
+            min_points: Tracking is considered lost below this many points
+        """
+        self.max_points = max_points
+        self.min_points = min_points
+        self.tracker_type = tracker_type
+        
+        # Fall back to optical flow if the contrib trackers are not installed
+        if tracker_type in ('kcf', 'csrt') and self._create_opencv_tracker(tracker_type) is None:
+            print(f"⚠️  OpenCV {tracker_type.upper()} tracker unavailable, using optical flow")
+            self.tracker_type = 'optical_flow'
+        
+        self.lk_params = dict(
+            winSize=(15, 15),
+            maxLevel=2,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
+        )
+        
+        self.reset()
+    
+    def reset(self):
+        """Drop the current track"""
+        self.is_active = False
+        self.box = None
+        self.confidence = 0.0
+        self.prev_gray = None
+        self.points = None
+        self.opencv_tracker = None
+    
+    @staticmethod
+    def _create_opencv_tracker(tracker_type):
+        """Create a KCF/CSRT tracker from whichever OpenCV namespace provides it"""
+        name = 'TrackerKCF_create' if tracker_type == 'kcf' else 'TrackerCSRT_create'
+        for namespace in (cv2, getattr(cv2, 'legacy', None)):
+            factory = getattr(namespace, name, None) if namespace is not None else None
+            if factory is not None:
+                return factory()
+        return None
+    
+    def init(self, frame, box):
+        """
+        Start tracking a face box
+        
+        Args:
+            frame: OpenCV image frame (BGR)
+            box: Face bounding box (x, y, w, h)
+        
+        Returns:
+            bool: True if the track was started
+        """
+        self.reset()
+        x, y, w, h = [int(v) for v in box]
+        if w <= 0 or h <= 0:
+            return False
+        
+        if self.tracker_type != 'optical_flow':
+            self.opencv_tracker = self._create_opencv_tracker(self.tracker_type)
+            self.opencv_tracker.init(frame, (x, y, w, h))
+        else:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+            self.points = self._seed_points(gray, (x, y, w, h))
+            if self.points is None:
+                return False
+            self.prev_gray = gray
+        
+        self.box = (x, y, w, h)
+        self.confidence = 1.0
+        self.is_active = True
+        return True
+    
+    def _seed_points(self, gray, box):
+        """Pick good corner features inside the face box"""
+        x, y, w, h = box
+        mask = np.zeros(gray.shape, dtype=np.uint8)
+        mask[max(y, 0):y + h, max(x, 0):x + w] = 255
+        
+        points = cv2.goodFeaturesToTrack(gray, maxCorners=self.max_points, qualityLevel=0.01,
+                                         minDistance=5, mask=mask)
+        if points is None or len(points) < self.min_points:
+            return None
+        return points
+    
+    def update(self, frame):
+        """
+        Advance the track to a new frame
+        
+        Args:
+            frame: OpenCV image frame (BGR)
+        
+        Returns:
+            tuple: (face_box or None, tracking_confidence 0-1)
+        """
+        if not self.is_active:
+            return None, 0.0
+        
+        if self.opencv_tracker is not None:
+            ok, box = self.opencv_tracker.update(frame)
+            if not ok:
+                self.reset()
+                return None, 0.0
+            self.box = tuple(int(v) for v in box)
+            self.confidence = 1.0
+            return self.box, self.confidence
+        
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        
+        # Forward-backward optical flow: keep points that return close to where they started
+        next_points, status, _ = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, self.points, None,
+                                                          **self.lk_params)
+        back_points, back_status, _ = cv2.calcOpticalFlowPyrLK(gray, self.prev_gray, next_points, None,
+                                                               **self.lk_params)
+        fb_error = np.linalg.norm((self.points - back_points).reshape(-1, 2), axis=1)
+        good = (status.ravel() == 1) & (back_status.ravel() == 1) & (fb_error < 1.0)
+        
+        self.confidence = float(np.count_nonzero(good)) / max(len(self.points), 1)
+        if np.count_nonzero(good) < self.min_points:
+            self.reset()
+            return None, 0.0
+        
+        old = self.points.reshape(-1, 2)[good]
+        new = next_points.reshape(-1, 2)[good]
+        
+        # Median translation and scale change of the point cloud
+        dx, dy = np.median(new - old, axis=0)
+        old_spread = np.linalg.norm(old - old.mean(axis=0), axis=1)
+        new_spread = np.linalg.norm(new - new.mean(axis=0), axis=1)
+        valid = old_spread > 1e-3
+        scale = float(np.median(new_spread[valid] / old_spread[valid])) if np.any(valid) else 1.0
+        
+        x, y, w, h = self.box
+        cx, cy = x + w / 2.0 + dx, y + h / 2.0 + dy
+        w, h = w * scale, h * scale
+        self.box = (int(round(cx - w / 2.0)), int(round(cy - h / 2.0)), int(round(w)), int(round(h)))
+        
+        self.points = new.reshape(-1, 1, 2)
+        self.prev_gray = gray
+        
+        return self.box, self.confidence
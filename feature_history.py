@@ -0,0 +1,100 @@
+"""
+Feature History
+Fixed-width float32 ring matrix of per-chunk speech features
+Each chunk is one row with a named column layout, so averages over recent
+chunks are single vector operations
+"""
+
+import numpy as np
+
+class FeatureHistory:
+    # Scalar features, in column order around the MFCC and formant blocks
+    LEADING = ['energy', 'zcr', 'pitch']
+    TRAILING = ['spectral_centroid', 'spectral_bandwidth', 'spectral_rolloff', 'hf_ratio',
+                'pitch_variation', 'energy_variation', 'speaking_rate']
+    FORMANTS = ['F1', 'F2', 'F3']
+    
+    def __init__(self, capacity=15, n_mfcc=13):
+        """
+        Initialize the feature history
+        
+        Args:
+            capacity: Number of most recent chunks kept
+            n_mfcc: MFCC coefficients per chunk (columns mfcc_0 .. mfcc_{n-1})
+        """
+        self.capacity = capacity
+        self.n_mfcc = n_mfcc
+        
+        self.names = (self.LEADING + [f'mfcc_{i}' for i in range(n_mfcc)] +
+                      self.FORMANTS + self.TRAILING)
+        self.columns = {name: i for i, name in enumerate(self.names)}
+        self.mfcc_slice = slice(self.columns['mfcc_0'], self.columns['mfcc_0'] + n_mfcc)
+        self.formant_slice = slice(self.columns['F1'], self.columns['F1'] + len(self.FORMANTS))
+        
+        self.rows = np.zeros((capacity, len(self.names)), dtype=np.float32)
+        self.index = 0
+        self.count = 0
+    
+    def append(self, features):
+        """
+        Add one chunk's features, overwriting the oldest row when full
+        
+        Args:
+            features: Feature dictionary from the detector ('mfccs' array,
+                      'formants' dict, scalar values for the other columns)
+        """
+        row = self.rows[self.index]
+        for name in self.LEADING + self.TRAILING:
+            row[self.columns[name]] = features[name]
+        row[self.mfcc_slice] = features['mfccs'][:self.n_mfcc]
+        row[self.formant_slice] = [features['formants'][name] for name in self.FORMANTS]
+        
+        self.index = (self.index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+    
+    def recent(self, n=None):
+        """
+        Most recent rows in chronological order
+        
+        Args:
+            n: Number of rows (default: all kept rows)
+        
+        Returns:
+            numpy.ndarray: (min(n, len), n_columns) float32 copy
+        """
+        n = self.count if n is None else min(n, self.count)
+        order = (self.index - n + np.arange(n)) % self.capacity
+        return self.rows[order]
+    
+    def column(self, name):
+        """
+        All kept values of one feature in chronological order
+        
+        Args:
+            name: Column name (e.g. 'pitch', 'mfcc_2', 'F1')
+        
+        Returns:
+            numpy.ndarray: float32 values
+        """
+        return self.recent()[:, self.columns[name]]
+    
+    def mean(self, n=None):
+        """
+        Average of the most recent rows, accumulated in float64
+        
+        Args:
+            n: Number of rows (default: all kept rows)
+        
+        Returns:
+            numpy.ndarray: Per-column means (n_columns,)
+        """
+        return self.recent(n).mean(axis=0, dtype=np.float64)
+    
+    def clear(self):
+        """Drop all rows"""
+        self.index = 0
+        self.count = 0
+    
+    def __len__(self):
+        """Number of rows currently kept"""
+        return self.count
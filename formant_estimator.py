@@ -0,0 +1,114 @@
+"""
+Formant Estimation
+LPC coefficients from a precomputed autocorrelation with one Toeplitz solve
+Formants are the lowest LPC pole frequencies, found as companion-matrix
+eigenvalues; offline analysis solves many chunks in one batched call
+"""
+
+import numpy as np
+from scipy import linalg
+
+class FormantEstimator:
+    # Reported when the LPC model is degenerate (e.g. digital silence)
+    DEFAULT_FORMANTS = (500, 1500, 2500)
+    
+    def __init__(self, sample_rate=16000, order=None, num_formants=3):
+        """
+        Initialize the formant estimator
+        
+        Args:
+            sample_rate: Audio sampling rate
+            order: LPC order (default: sample_rate / 1000 + 2)
+            num_formants: Number of formants reported (F1, F2, ...)
+        """
+        self.sample_rate = sample_rate
+        self.order = order if order is not None else int(sample_rate / 1000) + 2
+        self.num_formants = num_formants
+        self.names = [f'F{i + 1}' for i in range(num_formants)]
+        
+        # Companion matrix skeleton: ones below the diagonal, first row set per polynomial
+        self.companion = np.eye(self.order, k=-1)
+    
+    def lpc(self, autocorr):
+        """
+        LPC coefficients from the autocorrelation normal equations
+        
+        Args:
+            autocorr: Autocorrelation r[0..order] or longer
+        
+        Returns:
+            numpy.ndarray: a[0..order] with a[0] = 1, or None if the equations
+                           are singular or not finite
+        """
+        r = np.asarray(autocorr[:self.order + 1], dtype=np.float64)
+        if len(r) < self.order + 1 or not np.all(np.isfinite(r)) or r[0] <= 0:
+            return None
+        
+        try:
+            coefficients = linalg.solve_toeplitz(r[:self.order], -r[1:])
+        except np.linalg.LinAlgError:
+            return None
+        if not np.all(np.isfinite(coefficients)):
+            return None
+        return np.concatenate(([1.0], coefficients))
+    
+    def pole_frequencies(self, coefficients):
+        """
+        Lowest pole frequencies of monic LPC polynomials
+        
+        Uses the same companion matrix as np.roots and the same selection as
+        the per-chunk estimator: roots with imag >= 0, sorted by angle.
+        
+        Args:
+            coefficients: (m, order + 1) LPC coefficients with a[0] = 1
+        
+        Returns:
+            numpy.ndarray: (m, num_formants) frequencies in Hz (0 where a
+                           polynomial has fewer roots)
+        """
+        m = len(coefficients)
+        companion = np.broadcast_to(self.companion, (m, self.order, self.order)).copy()
+        companion[:, 0, :] = -coefficients[:, 1:]
+        roots = np.linalg.eigvals(companion)
+        
+        # Negative-frequency roots sort last and are dropped
+        angles = np.where(roots.imag >= 0, np.arctan2(roots.imag, roots.real), np.inf)
+        angles.sort(axis=1)
+        
+        frequencies = np.zeros((m, self.num_formants))
+        count = min(self.num_formants, self.order)
+        frequencies[:, :count] = angles[:, :count] * (self.sample_rate / (2 * np.pi))
+        frequencies[np.isinf(frequencies)] = 0
+        return frequencies
+    
+    def estimate(self, autocorr):
+        """
+        Estimate the formants of one chunk
+        
+        Args:
+            autocorr: Autocorrelation r[0..order] or longer
+        
+        Returns:
+            dict: {'F1': Hz, 'F2': Hz, 'F3': Hz}
+        """
+        return self.estimate_batch([autocorr])[0]
+    
+    def estimate_batch(self, autocorrs):
+        """
+        Estimate the formants of many chunks with one batched eigenvalue solve
+        
+        Args:
+            autocorrs: Sequence of autocorrelations (r[0..order] or longer)
+        
+        Returns:
+            list: One {'F1': Hz, 'F2': Hz, 'F3': Hz} dictionary per chunk
+        """
+        rows = [self.lpc(autocorr) for autocorr in autocorrs]
+        valid = [i for i, a in enumerate(rows) if a is not None]
+        
+        results = [dict(zip(self.names, self.DEFAULT_FORMANTS)) for _ in rows]
+        if valid:
+            frequencies = self.pole_frequencies(np.array([rows[i] for i in valid]))
+            for i, row in zip(valid, frequencies):
+                results[i] = dict(zip(self.names, row.tolist()))
+        return results
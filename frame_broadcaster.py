@@ -0,0 +1,168 @@
+"""
+Frame Broadcaster Module
+Single capture thread that fans camera frames out to any number of viewers
+Keeps a small ring buffer of the newest frames so readers never touch the camera
+"""
+
+import cv2
+import time
+import threading
+
+
+class FrameBroadcaster:
+    def __init__(self, source=0, width=640, height=480, fps=15, buffer_size=4,
+                 frame_processor=None):
+        """
+        Initialize the frame broadcaster
+        
+        Args:
+            source: OpenCV capture source (camera index or video path)
+            width: Requested capture width
+            height: Requested capture height
+            fps: Requested capture frame rate
+            buffer_size: Number of recent frames kept in the ring buffer
+            frame_processor: Optional callable run once per captured frame in the
+                capture thread; its return value is stored alongside the frame
+        """
+        self.source = source
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.buffer_size = max(buffer_size, 1)
+        self.frame_processor = frame_processor
+        
+        # Ring buffer of (sequence, timestamp, frame, processed_result)
+        self.ring = [None] * self.buffer_size
+        self.sequence = 0
+        
+        # Condition used to wake up viewers when a new frame is published
+        self.frame_condition = threading.Condition()
+        
+        self.camera = None
+        self.is_running = False
+        self.capture_thread = None
+        
+        # Statistics
+        self.frames_captured = 0
+        self.read_failures = 0
+    
+    def start(self):
+        """
+        Open the capture source and start the capture thread
+        
+        Returns:
+            bool: True if the capture source was opened
+        """
+        if self.is_running:
+            return True
+        
+        self.camera = cv2.VideoCapture(self.source)
+        if not self.camera.isOpened():
+            print(f"❌ Could not open capture source: {self.source}")
+            return False
+        
+        self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        self.camera.set(cv2.CAP_PROP_FPS, self.fps)
+        
+        self.is_running = True
+        self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.capture_thread.start()
+        
+        print(f"✅ Frame broadcaster started (source={self.source}, buffer={self.buffer_size})")
+        return True
+    
+    def stop(self):
+        """Stop the capture thread and release the camera"""
+        self.is_running = False
+        
+        with self.frame_condition:
+            self.frame_condition.notify_all()
+        
+        if self.capture_thread is not None:
+            self.capture_thread.join(timeout=2.0)
+        
+        if self.camera is not None:
+            self.camera.release()
+            self.camera = None
+    
+    def _capture_loop(self):
+        """Capture thread: read frames once and publish them to the ring buffer"""
+        while self.is_running:
+            success, frame = self.camera.read()
+            if not success:
+                self.read_failures += 1
+                if self.read_failures % 30 == 0:
+                    print(f"⚠️  Camera read failed {self.read_failures} times")
+                time.sleep(0.05)
+                continue
+            
+            result = None
+            if self.frame_processor is not None:
+                try:
+                    result = self.frame_processor(frame)
+                except Exception as e:
+                    print(f"Frame processor error: {e}")
+            
+            self._publish(frame, result)
+    
+    def _publish(self, frame, result=None):
+        """
+        Write a frame into the ring buffer and wake up waiting viewers
+        
+        Args:
+            frame: Captured frame (BGR)
+            result: Optional processed result stored with the frame
+        """
+        with self.frame_condition:
+            self.sequence += 1
+            self.ring[self.sequence % self.buffer_size] = (self.sequence, time.time(), frame, result)
+            self.frames_captured += 1
+            self.frame_condition.notify_all()
+    
+    def latest(self):
+        """
+        Get the newest frame without waiting
+        
+        Returns:
+            tuple: (sequence, timestamp, frame, result) or None if nothing captured yet
+        """
+        with self.frame_condition:
+            if self.sequence == 0:
+                return None
+            return self.ring[self.sequence % self.buffer_size]
+    
+    def wait_for_frame(self, last_sequence=0, timeout=1.0):
+        """
+        Block until a frame newer than last_sequence is available
+        
+        Args:
+            last_sequence: Sequence number of the last frame the caller consumed
+            timeout: Maximum time to wait in seconds
+        
+        Returns:
+            tuple: (sequence, timestamp, frame, result) of the newest frame,
+                   or None on timeout / shutdown
+        """
+        with self.frame_condition:
+            self.frame_condition.wait_for(
+                lambda: self.sequence > last_sequence or not self.is_running,
+                timeout=timeout
+            )
+            if self.sequence <= last_sequence:
+                return None
+            return self.ring[self.sequence % self.buffer_size]
+    
+    def get_statistics(self):
+        """
+        Get capture statistics
+        
+        Returns:
+            dict: Statistics about frame capture
+        """
+        return {
+            'frames_captured': self.frames_captured,
+            'read_failures': self.read_failures,
+            'sequence': self.sequence,
+            'buffer_size': self.buffer_size
+        }
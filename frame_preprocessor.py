@@ -0,0 +1,99 @@
+"""
+Frame Preprocessing Module
+Allocation-free CLAHE contrast enhancement for face emotion detection
+Keeps one CLAHE instance and reuses output buffers through OpenCV dst= arguments
+"""
+
+import cv2
+import numpy as np
+
+class FramePreprocessor:
+    def __init__(self, clip_limit=3.0, tile_grid_size=(8, 8)):
+        """
+        Initialize the frame preprocessor
+        
+        Output arrays are reused between calls, so a result is only valid until
+        the next call. Use one preprocessor per thread.
+        
+        Args:
+            clip_limit: CLAHE contrast limit
+            tile_grid_size: CLAHE tile grid size
+        """
+        self.clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=tile_grid_size)
+        
+        # Flat backing storage, grown on demand and viewed at the current frame size
+        self._backing = {}
+    
+    def _buffer(self, name, shape):
+        """
+        Get a contiguous uint8 buffer of the given shape without allocating
+        
+        Args:
+            name: Buffer name (each name has its own storage)
+            shape: Required array shape
+        
+        Returns:
+            numpy.ndarray: Reusable buffer view
+        """
+        size = int(np.prod(shape))
+        backing = self._backing.get(name)
+        if backing is None or backing.size < size:
+            backing = np.empty(size, dtype=np.uint8)
+            self._backing[name] = backing
+        return backing[:size].reshape(shape)
+    
+    def process(self, frame, luminance_only=False, as_rgb=True):
+        """
+        Apply CLAHE contrast enhancement
+        
+        Args:
+            frame: OpenCV image frame (BGR)
+            luminance_only: Enhance a grayscale copy only (skips the LAB round trip)
+            as_rgb: For the luminance path, expand the result back to 3 channels
+        
+        Returns:
+            numpy.ndarray: Enhanced RGB frame, or enhanced grayscale frame when
+                           luminance_only is set and as_rgb is False
+        """
+        h, w = frame.shape[:2]
+        
+        if luminance_only:
+            gray = self._buffer('luma', (h, w))
+            cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
+            self.clahe.apply(gray, dst=gray)
+            if not as_rgb:
+                return gray
+            rgb = self._buffer('rgb', (h, w, 3))
+            cv2.cvtColor(gray, cv2.COLOR_GRAY2RGB, dst=rgb)
+            return rgb
+        
+        # BGR -> LAB directly (same LAB values as BGR -> RGB -> LAB)
+        lab = self._buffer('lab', (h, w, 3))
+        cv2.cvtColor(frame, cv2.COLOR_BGR2LAB, dst=lab)
+        
+        # Enhance the L channel in place
+        lightness = self._buffer('lightness', (h, w))
+        cv2.extractChannel(lab, 0, dst=lightness)
+        self.clahe.apply(lightness, dst=lightness)
+        cv2.insertChannel(lightness, lab, 0)
+        
+        rgb = self._buffer('rgb', (h, w, 3))
+        cv2.cvtColor(lab, cv2.COLOR_LAB2RGB, dst=rgb)
+        return rgb
+    
+    def downscale(self, frame, scale):
+        """
+        Resize a frame by a scale factor into a reused buffer
+        
+        Args:
+            frame: OpenCV image frame
+            scale: Scale factor (< 1 shrinks the frame)
+            
+        Returns:
+            numpy.ndarray: Resized frame (reused buffer)
+        """
+        h, w = frame.shape[:2]
+        new_w, new_h = max(int(round(w * scale)), 1), max(int(round(h * scale)), 1)
+        small = self._buffer('small', (new_h, new_w) + frame.shape[2:])
+        cv2.resize(frame, (new_w, new_h), dst=small, interpolation=cv2.INTER_AREA)
+        return small
@@ -0,0 +1,202 @@
+"""
+Face Inference Worker Module
+Runs face emotion inference on its own thread at a fixed target rate
+Streaming code reads the latest cached result instead of waiting on the model
+"""
+
+import time
+import threading
+import numpy as np
+from collections import deque
+
+class FaceInferenceWorker:
+    def __init__(self, face_detector, broadcaster, target_hz=3.0, on_result=None, job_timeout=5.0):
+        """
+        Initialize the face inference worker
+        
+        Args:
+            face_detector: FaceEmotionDetector, or FaceInferencePool for multi-process inference
+            broadcaster: FrameBroadcaster providing the newest camera frame
+            target_hz: Maximum number of inference passes per second
+            on_result: Optional callback(emotion, confidence, face_coords) run after each pass
+            job_timeout: Seconds after which an unanswered pool job is given up
+                         (its worker slot is reused)
+        """
+        self.face_detector = face_detector
+        self.broadcaster = broadcaster
+        self.target_hz = target_hz
+        self.on_result = on_result
+        self.job_timeout = job_timeout
+        
+        # Latest published result
+        self.result_lock = threading.Lock()
+        self.latest_result = {
+            'emotion': None,
+            'confidence': 0.0,
+            'face_coords': None,
+            'sequence': 0,
+            'timestamp': 0.0
+        }
+        
+        self.is_running = False
+        self.worker_thread = None
+        
+        # Statistics
+        self.inference_count = 0
+        self.inference_times = deque(maxlen=30)
+        self.expired_jobs = 0
+    
+    def start(self):
+        """Start the inference thread"""
+        if self.is_running:
+            return
+        
+        self.is_running = True
+        # A process pool can work on several frames at once, keep them all busy
+        loop = self._pipelined_loop if hasattr(self.face_detector, 'submit') else self._inference_loop
+        self.worker_thread = threading.Thread(target=loop, daemon=True)
+        self.worker_thread.start()
+        print(f"✅ Face inference worker started (target {self.target_hz:.1f} Hz)")
+    
+    def stop(self):
+        """Stop the inference thread"""
+        self.is_running = False
+        if self.worker_thread is not None:
+            self.worker_thread.join(timeout=2.0)
+    
+    def _inference_loop(self):
+        """Inference thread: analyze the newest frame at most target_hz times per second"""
+        interval = 1.0 / self.target_hz if self.target_hz > 0 else 0.0
+        last_sequence = 0
+        
+        while self.is_running:
+            cycle_start = time.time()
+            
+            latest = self.broadcaster.wait_for_frame(last_sequence, timeout=1.0)
+            if latest is None:
+                continue
+            
+            sequence, timestamp, frame, _ = latest
+            last_sequence = sequence
+            
+            inference_start = time.time()
+            try:
+                emotion, confidence, face_coords = self.face_detector.detect_emotion(frame)
+            except Exception as e:
+                print(f"Face inference error: {e}")
+                time.sleep(0.5)
+                continue
+            
+            self._publish(emotion, confidence, face_coords, sequence, timestamp)
+            self.inference_count += 1
+            self.inference_times.append(time.time() - inference_start)
+            
+            # Sleep off the rest of the interval so we stay at the target rate
+            elapsed = time.time() - cycle_start
+            if elapsed < interval:
+                time.sleep(interval - elapsed)
+    
+    def _pipelined_loop(self):
+        """
+        Inference thread for a FaceInferencePool: up to one frame in flight per
+        worker process, submitted at most target_hz times per second pool-wide
+        """
+        pool = self.face_detector
+        interval = 1.0 / self.target_hz if self.target_hz > 0 else 0.0
+        next_submit = 0.0
+        last_sequence = 0
+        newest_published = 0
+        jobs = {}
+        
+        while self.is_running:
+            cycle_start = time.time()
+            
+            # Give up on jobs a dead or stuck worker will never answer,
+            # otherwise their slots stay taken forever
+            expired = [job_id for job_id, (_, _, submitted_at) in jobs.items()
+                       if cycle_start - submitted_at > self.job_timeout]
+            for job_id in expired:
+                del jobs[job_id]
+                pool.cancel(job_id)
+            if expired:
+                self.expired_jobs += len(expired)
+                print(f"⚠️  {len(expired)} face inference job(s) timed out after {self.job_timeout:.1f}s")
+            
+            # Submit the newest frame if a worker is free and a submission is due
+            if len(jobs) < pool.num_workers and cycle_start >= next_submit:
+                latest = self.broadcaster.wait_for_frame(last_sequence, timeout=max(interval, 0.1))
+                if latest is not None:
+                    sequence, timestamp, frame, _ = latest
+                    last_sequence = sequence
+                    job_id = pool.submit(frame)
+                    if job_id is not None:
+                        jobs[job_id] = (sequence, timestamp, time.time())
+                        next_submit = max(next_submit + interval, time.time())
+            
+            # Collect whatever has finished; never publish an older frame over a newer one
+            finished = pool.get_result(timeout=0.01 if jobs else 0.0)
+            while finished is not None:
+                job_id, (emotion, confidence, face_coords) = finished
+                if job_id not in jobs:
+                    # Late answer for an expired job: its slot was already freed
+                    finished = pool.get_result(timeout=0.0)
+                    continue
+                sequence, timestamp, submitted_at = jobs.pop(job_id)
+                if sequence > newest_published:
+                    self._publish(emotion, confidence, face_coords, sequence, timestamp)
+                    newest_published = sequence
+                self.inference_count += 1
+                self.inference_times.append(time.time() - submitted_at)
+                finished = pool.get_result(timeout=0.0)
+            
+            # Wait for the next submission, still collecting results while jobs are in flight
+            remaining = next_submit - time.time()
+            if remaining > 0:
+                time.sleep(min(remaining, 0.01) if jobs else remaining)
+    
+    def _publish(self, emotion, confidence, face_coords, sequence, timestamp):
+        """Store the newest inference result and notify the callback"""
+        with self.result_lock:
+            self.latest_result = {
+                'emotion': emotion,
+                'confidence': confidence,
+                'face_coords': face_coords,
+                'sequence': sequence,
+                'timestamp': timestamp
+            }
+        
+        if self.on_result is not None:
+            try:
+                self.on_result(emotion, confidence, face_coords)
+            except Exception as e:
+                print(f"Inference callback error: {e}")
+    
+    def get_latest_result(self):
+        """
+        Get the most recent inference result
+        
+        Returns:
+            tuple: (emotion_label, confidence, face_coordinates)
+        """
+        with self.result_lock:
+            result = self.latest_result
+        return result['emotion'], result['confidence'], result['face_coords']
+    
+    def get_statistics(self):
+        """
+        Get inference worker statistics
+        
+        Returns:
+            dict: Statistics about inference rate and latency
+        """
+        with self.result_lock:
+            last_sequence = self.latest_result['sequence']
+        avg_time = np.mean(self.inference_times) if len(self.inference_times) > 0 else 0
+        
+        return {
+            'inference_count': self.inference_count,
+            'target_hz': self.target_hz,
+            'avg_inference_time_ms': avg_time * 1000,
+            'expired_jobs': self.expired_jobs,
+            'last_sequence': last_sequence
+        }
@@ -12,9 +12,16 @@ from speech_detector import SpeechEmotionDetector
 from stress_analyzer import StressAnalyzer
 
 class WorkerStressAnalysis:
-    def __init__(self):
-        """Initialize the stress analysis system"""
+    def __init__(self, multi_face=False):
+        """
+        Initialize the stress analysis system
+        
+        Args:
+            multi_face: Track and label every face in view; the largest face
+                        drives the stress analysis
+        """
         print("Initializing Worker Stress Analysis System...")
+        self.multi_face = multi_face
         
         # Initialize components
         self.face_detector = FaceEmotionDetector()
@@ -28,6 +35,8 @@ class WorkerStressAnalysis:
         # Current states
         self.current_face_emotion = "neutral"
         self.current_face_confidence = 0.0
+        self.current_face_coords = None
+        self.current_faces = []
         self.current_speech_emotion = "neutral"
         self.current_speech_confidence = 0.0
         self.current_stress_level = "CALM"
@@ -90,12 +99,21 @@ class WorkerStressAnalysis:
                 
                 frame_count += 1
                 
-                # Process face emotion (every few frames for performance)
-                if frame_count % 3 == 0:  # Process every 3rd frame
-                    face_emotion, face_conf, face_coords = self.face_detector.detect_emotion(frame)
-                    if face_emotion:
-                        self.current_face_emotion = face_emotion
-                        self.current_face_confidence = face_conf
+                if self.multi_face:
+                    # Every face gets a stable track ID; the largest one drives stress
+                    # (same adaptive stride and motion gate as the single-face path)
+                    self.current_faces = self.face_detector.process_frame(frame, all_faces=True)
+                    primary = self.current_faces[0] if self.current_faces else {}
+                    face_emotion = primary.get('emotion')
+                    face_conf = primary.get('confidence', 0.0)
+                    face_coords = primary.get('face_coords')
+                else:
+                    # Process face emotion (adaptive stride keeps inference within budget)
+                    face_emotion, face_conf, face_coords = self.face_detector.process_frame(frame)
+                self.current_face_coords = face_coords
+                if face_emotion:
+                    self.current_face_emotion = face_emotion
+                    self.current_face_confidence = face_conf
                 
                 # Get current speech emotion
                 speech_emotion, speech_conf = self.speech_detector.get_current_emotion()
@@ -149,19 +167,24 @@ class WorkerStressAnalysis:
     
     def _draw_comprehensive_results(self, frame):
         """Draw comprehensive analysis results on frame with real-time updates"""
-        # Get face coordinates from the detector
-        _, _, face_coords = self.face_detector.detect_emotion(frame)
-        
         # Draw face emotion results with new stress level system
+        # (face box comes from the analysis path, no extra inference here)
         frame = self.face_detector.draw_results(
             frame, 
             self.current_face_emotion,
             self.current_face_confidence,
-            face_coords,
+            self.current_face_coords,
             self.current_stress_level,
             self.current_stress_score
         )
         
+        # Secondary faces (multi-face mode): thin box with track ID and emotion
+        for face in self.current_faces[1:]:
+            x, y, w, h = face['face_coords']
+            cv2.rectangle(frame, (x, y), (x + w, y + h), (200, 200, 200), 2)
+            cv2.putText(frame, f"#{face['track_id']} {face['emotion']}: {face['confidence']:.0%}",
+                       (x, max(y - 8, 12)), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+        
         # Add speech emotion info with enhanced styling
         speech_text = f"Speech: {self.current_speech_emotion} ({self.current_speech_confidence:.2f})"
         cv2.putText(frame, speech_text, (10, 130), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
@@ -230,8 +253,8 @@ class WorkerStressAnalysis:
 
 def main():
     """Main function"""
-    # Create and start the system
-    stress_system = WorkerStressAnalysis()
+    # Create and start the system (--multi-face labels every face in view)
+    stress_system = WorkerStressAnalysis(multi_face='--multi-face' in sys.argv[1:])
     
     try:
         success = stress_system.start_system()
@@ -0,0 +1,117 @@
+"""
+Motion Gate Module
+Cheap scene-change test that lets face inference be skipped on static frames
+Compares a tiny grayscale thumbnail of the face region with the last analyzed frame
+"""
+
+import cv2
+import time
+import numpy as np
+
+class MotionGate:
+    def __init__(self, threshold=3.0, max_stale_frames=15, max_stale_seconds=2.0, thumbnail_size=(32, 32)):
+        """
+        Initialize the motion gate
+        
+        Args:
+            threshold: Mean absolute thumbnail difference (gray levels) below which a frame is static
+            max_stale_frames: Force inference after reusing a result this many times
+            max_stale_seconds: Force inference when the reused result is older than this
+            thumbnail_size: Size of the grayscale thumbnail used for comparison
+        """
+        self.threshold = threshold
+        self.max_stale_frames = max_stale_frames
+        self.max_stale_seconds = max_stale_seconds
+        self.thumbnail_size = thumbnail_size
+        
+        # Thumbnail of the frame the cached result was computed on
+        self.reference = None
+        self.reference_time = 0.0
+        self.reused_frames = 0
+        
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.last_difference = 0.0
+    
+    def reset(self):
+        """Forget the reference frame (next frame always runs inference)"""
+        self.reference = None
+        self.reused_frames = 0
+    
+    def signature(self, frame, region=None):
+        """
+        Compute the comparison thumbnail
+        
+        Args:
+            frame: OpenCV image frame (BGR)
+            region: Optional face box (x, y, w, h) to restrict the comparison to
+        
+        Returns:
+            numpy.ndarray: Small float32 grayscale thumbnail
+        """
+        if region is not None:
+            x, y, w, h = region
+            frame_h, frame_w = frame.shape[:2]
+            x0, y0 = max(x, 0), max(y, 0)
+            x1, y1 = min(x + w, frame_w), min(y + h, frame_h)
+            if x1 > x0 and y1 > y0:
+                frame = frame[y0:y1, x0:x1]
+        
+        # Shrink first, then convert: the color conversion only touches a few pixels
+        small = cv2.resize(frame, self.thumbnail_size, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        return small.astype(np.float32)
+    
+    def is_static(self, signature):
+        """
+        Decide whether the cached result can be reused for this frame
+        
+        Args:
+            signature: Thumbnail from signature()
+        
+        Returns:
+            bool: True if the frame barely changed and the cached result is fresh enough
+        """
+        if self.reference is None or self.reference.shape != signature.shape:
+            self.misses += 1
+            return False
+        
+        self.last_difference = float(np.mean(np.abs(signature - self.reference)))
+        stale = (self.reused_frames >= self.max_stale_frames or
+                 time.time() - self.reference_time > self.max_stale_seconds)
+        
+        if self.last_difference < self.threshold and not stale:
+            self.reused_frames += 1
+            self.hits += 1
+            return True
+        
+        self.misses += 1
+        return False
+    
+    def set_reference(self, signature):
+        """
+        Remember the thumbnail of the frame that was just analyzed
+        
+        Args:
+            signature: Thumbnail from signature()
+        """
+        self.reference = signature
+        self.reference_time = time.time()
+        self.reused_frames = 0
+    
+    def get_statistics(self):
+        """
+        Get gate statistics
+        
+        Returns:
+            dict: Hit/miss counters and the last measured difference
+        """
+        total = self.hits + self.misses
+        return {
+            'gate_hits': self.hits,
+            'gate_misses': self.misses,
+            'gate_hit_rate': self.hits / total if total > 0 else 0.0,
+            'gate_last_difference': self.last_difference
+        }
@@ -0,0 +1,142 @@
+"""
+Pitch Estimation Engine
+Autocorrelation via one zero-padded rFFT, restricted to the lags pitch search needs
+Optional YIN estimator (cumulative mean normalized difference) for cleaner F0 tracks
+"""
+
+import numpy as np
+from scipy import fft as sp_fft
+
+class PitchEngine:
+    def __init__(self, sample_rate=16000, min_hz=50, max_hz=500, method='autocorr', yin_threshold=0.1):
+        """
+        Initialize the pitch engine
+        
+        Args:
+            sample_rate: Audio sampling rate
+            min_hz: Lowest pitch searched
+            max_hz: Highest pitch searched
+            method: 'autocorr' (autocorrelation peak) or 'yin'
+            yin_threshold: YIN absolute threshold on the normalized difference
+        """
+        self.sample_rate = sample_rate
+        self.min_hz = min_hz
+        self.max_hz = max_hz
+        self.method = method
+        self.yin_threshold = yin_threshold
+        
+        # Lag search range in samples
+        self.min_period = int(sample_rate / max_hz)
+        self.max_period = int(sample_rate / min_hz)
+    
+    def autocorrelation(self, audio_data, max_lag):
+        """
+        Linear autocorrelation for lags 0..max_lag
+        
+        Zero padding to at least len + max_lag keeps circular wrap-around out
+        of the requested lags, so the values match np.correlate(x, x, 'full')
+        at O(n log n) instead of O(n^2).
+        
+        Args:
+            audio_data: 1-D signal
+            max_lag: Largest lag needed
+        
+        Returns:
+            numpy.ndarray: r[0..max_lag] (shorter if the signal is shorter)
+        """
+        n = len(audio_data)
+        max_lag = min(max_lag, n - 1)
+        if max_lag < 0:
+            return np.zeros(0)
+        
+        size = sp_fft.next_fast_len(n + max_lag + 1, real=True)
+        spectrum = sp_fft.rfft(audio_data, size)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        return sp_fft.irfft(power, size)[:max_lag + 1]
+    
+    def estimate(self, audio_data, autocorr=None):
+        """
+        Estimate the fundamental frequency of a chunk
+        
+        Args:
+            audio_data: 1-D signal
+            autocorr: Precomputed autocorrelation r[0..max_period - 1] or longer
+                (e.g. from the shared spectral front-end); computed here if None
+        
+        Returns:
+            float: Pitch in Hz, clipped to [min_hz, max_hz] (120 if no estimate)
+        """
+        if self.method == 'yin':
+            pitch_hz = self.yin(audio_data)
+        else:
+            if autocorr is None:
+                autocorr = self.autocorrelation(audio_data, self.max_period - 1)
+            autocorr = autocorr[self.min_period:self.max_period]
+            if len(autocorr) > 0:
+                pitch_period = np.argmax(autocorr) + self.min_period
+                pitch_hz = self.sample_rate / pitch_period if pitch_period > 0 else 120
+            else:
+                pitch_hz = 120
+        
+        return np.clip(pitch_hz, self.min_hz, self.max_hz)
+    
+    def yin(self, audio_data):
+        """
+        YIN pitch estimate
+        
+        The difference function d(tau) = sum (x[j] - x[j + tau])^2 over a window
+        of len - max_period samples is built from window energies and one
+        FFT cross-correlation.
+        
+        Args:
+            audio_data: 1-D signal
+        
+        Returns:
+            float: Pitch in Hz, or 120 if the chunk is too short or unvoiced
+        """
+        x = np.asarray(audio_data, dtype=np.float64)
+        max_lag = self.max_period
+        window = len(x) - max_lag
+        if window <= self.min_period:
+            return 120
+        
+        # Cross-correlation of the first window with every lagged window
+        size = sp_fft.next_fast_len(window + len(x), real=True)
+        cross = sp_fft.irfft(sp_fft.rfft(x, size) * np.conj(sp_fft.rfft(x[:window], size)), size)[:max_lag + 1]
+        
+        # Energy of x[tau:tau + window] for every lag
+        squares = np.concatenate(([0.0], np.cumsum(x ** 2)))
+        energies = squares[window:window + max_lag + 1] - squares[:max_lag + 1]
+        
+        difference = energies[0] + energies - 2.0 * cross
+        difference[0] = 0.0
+        
+        # Cumulative mean normalized difference
+        lags = np.arange(1, max_lag + 1)
+        running = np.cumsum(difference[1:])
+        normalized = np.ones(max_lag + 1)
+        normalized[1:] = difference[1:] * lags / np.where(running > 0, running, 1.0)
+        
+        search = normalized[self.min_period:max_lag]
+        best = float(np.min(search))
+        if best > 0.8:
+            return 120  # No periodic structure
+        
+        # First dip under the threshold (relaxed to just above the global minimum
+        # for noisy, pre-emphasized speech), followed down to its local minimum.
+        # Taking the global minimum itself would favour period multiples.
+        below = np.nonzero(search < max(self.yin_threshold, best + 0.05))[0]
+        index = below[0]
+        while index + 1 < len(search) and search[index + 1] < search[index]:
+            index += 1
+        
+        tau = index + self.min_period
+        
+        # Parabolic interpolation around the minimum
+        if 0 < tau < max_lag:
+            left, center, right = normalized[tau - 1], normalized[tau], normalized[tau + 1]
+            denominator = left - 2 * center + right
+            if denominator != 0:
+                tau = tau + 0.5 * (left - right) / denominator
+        
+        return self.sample_rate / tau
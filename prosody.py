@@ -0,0 +1,114 @@
+"""
+Prosody Features
+Energy variation (shimmer) from frame RMS values over a strided frame view
+Speaking rate from speech onsets kept in a bounded, time-ordered window that
+is trimmed by binary search, so cost does not grow with session length
+"""
+
+import numpy as np
+from bisect import bisect_right
+from collections import deque
+from numpy.lib.stride_tricks import sliding_window_view
+
+def frame_energies(audio_data, n_frames=10):
+    """
+    RMS of consecutive frames of len // n_frames samples
+    
+    Frames start every frame length and the last start is before
+    len - frame length, as in the original per-chunk loop.
+    
+    Args:
+        audio_data: 1-D signal
+        n_frames: Chunk is cut into frames of len // n_frames samples
+    
+    Returns:
+        numpy.ndarray: Frame RMS values (empty for very short chunks)
+    """
+    x = np.asarray(audio_data)
+    frame_size = len(x) // n_frames
+    if frame_size == 0:
+        return np.zeros(0)
+    
+    count = len(range(0, len(x) - frame_size, frame_size))
+    frames = sliding_window_view(x, frame_size)[::frame_size][:count]
+    return np.sqrt(np.mean(frames ** 2, axis=1))
+
+def energy_variation(audio_data, n_frames=10):
+    """
+    Relative spread of frame RMS values (shimmer)
+    
+    Args:
+        audio_data: 1-D signal
+        n_frames: Frames per chunk
+    
+    Returns:
+        float: std / mean of the frame energies (0 if there are none)
+    """
+    energies = frame_energies(audio_data, n_frames)
+    if len(energies) == 0:
+        return 0
+    return np.std(energies) / (np.mean(energies) + 1e-6)
+
+class OnsetWindow:
+    def __init__(self, window=5.0, max_onsets=1024, default_rate=3.0, min_rate=0.5, max_rate=10.0):
+        """
+        Initialize the onset window
+        
+        Args:
+            window: Onsets younger than this many seconds count towards the rate
+            max_onsets: Hard bound on stored onsets
+            default_rate: Rate reported with fewer than two recent onsets
+            min_rate: Lower clip of the rate
+            max_rate: Upper clip of the rate
+        """
+        self.window = window
+        self.default_rate = default_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.onsets = deque(maxlen=max_onsets)
+    
+    def append(self, onset_time):
+        """
+        Record a speech onset
+        
+        Times must not decrease; an earlier time (e.g. media time after wall
+        clock time) starts a new timeline.
+        
+        Args:
+            onset_time: Onset time in seconds
+        """
+        if self.onsets and onset_time < self.onsets[-1]:
+            self.onsets.clear()
+        self.onsets.append(onset_time)
+    
+    def speaking_rate(self, current_time):
+        """
+        Onsets per second over the window ending at current_time
+        
+        Onsets that have left the window are evicted, so later calls (with
+        later times) only look at the bounded recent part.
+        
+        Args:
+            current_time: Time in seconds on the same clock as the onsets
+        
+        Returns:
+            float: Rate clipped to [min_rate, max_rate], or default_rate
+        """
+        stale = bisect_right(self.onsets, current_time - self.window)
+        for _ in range(stale):
+            self.onsets.popleft()
+        
+        if len(self.onsets) < 2:
+            return self.default_rate
+        
+        duration = self.onsets[-1] - self.onsets[0]
+        rate = len(self.onsets) / duration if duration > 0 else self.default_rate
+        return np.clip(rate, self.min_rate, self.max_rate)
+    
+    def clear(self):
+        """Forget all onsets"""
+        self.onsets.clear()
+    
+    def __len__(self):
+        """Number of stored onsets"""
+        return len(self.onsets)
@@ -0,0 +1,121 @@
+"""
+Shared-Memory Frame Transport
+Fixed pool of frame slots in multiprocessing.shared_memory with sequence numbers
+Producers write a frame into a slot once; consumer processes map it without copying
+"""
+
+import numpy as np
+from multiprocessing import shared_memory
+
+class SharedFrameRing:
+    def __init__(self, shape, num_slots=8, dtype=np.uint8, name=None):
+        """
+        Create (name=None) or attach to (name given) a shared frame ring
+        
+        Memory layout: int64 sequence number per slot, followed by the slot frames.
+        A slot's sequence number is 0 while it is being written.
+        
+        Args:
+            shape: Frame shape, e.g. (480, 640, 3)
+            num_slots: Number of frame slots
+            dtype: Frame dtype
+            name: Name of an existing ring to attach to
+        """
+        self.shape = tuple(shape)
+        self.num_slots = num_slots
+        self.dtype = np.dtype(dtype)
+        self.is_owner = name is None
+        
+        frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        header_bytes = 8 * num_slots
+        
+        if self.is_owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=header_bytes + num_slots * frame_bytes)
+        else:
+            # Spawned workers share the parent's resource tracker, so the block
+            # stays registered once and is unlinked by the owner only
+            self.shm = shared_memory.SharedMemory(name=name)
+        
+        self.name = self.shm.name
+        self.sequences = np.ndarray((num_slots,), dtype=np.int64, buffer=self.shm.buf)
+        self.frames = np.ndarray((num_slots,) + self.shape, dtype=self.dtype,
+                                 buffer=self.shm.buf, offset=header_bytes)
+        
+        if self.is_owner:
+            self.sequences[:] = 0
+        self.next_sequence = 1
+    
+    @classmethod
+    def attach(cls, descriptor):
+        """
+        Attach to a ring created in another process
+        
+        Args:
+            descriptor: Dictionary returned by describe()
+        
+        Returns:
+            SharedFrameRing: Attached ring
+        """
+        return cls(descriptor['shape'], descriptor['num_slots'], descriptor['dtype'],
+                   name=descriptor['name'])
+    
+    def describe(self):
+        """
+        Get a small picklable description used to attach from another process
+        
+        Returns:
+            dict: Ring name, frame shape, dtype and slot count
+        """
+        return {
+            'name': self.name,
+            'shape': self.shape,
+            'dtype': self.dtype.str,
+            'num_slots': self.num_slots
+        }
+    
+    def write(self, slot, frame):
+        """
+        Copy a frame into a slot and stamp it with a new sequence number
+        
+        Args:
+            slot: Slot index
+            frame: Frame matching the ring shape and dtype
+        
+        Returns:
+            int: Sequence number identifying this write
+        """
+        sequence = self.next_sequence
+        self.next_sequence += 1
+        
+        self.sequences[slot] = 0
+        np.copyto(self.frames[slot], frame, casting='no')
+        self.sequences[slot] = sequence
+        return sequence
+    
+    def read(self, slot, sequence):
+        """
+        Map a slot without copying
+        
+        Args:
+            slot: Slot index
+            sequence: Sequence number returned by write()
+        
+        Returns:
+            numpy.ndarray: Zero-copy view of the frame, or None if the slot was
+                           overwritten or is being written
+        """
+        if self.sequences[slot] != sequence:
+            return None
+        return self.frames[slot]
+    
+    def close(self):
+        """Release this process's mapping (and free the block if we created it)"""
+        # Views must go before the buffer can be released
+        self.sequences = None
+        self.frames = None
+        self.shm.close()
+        if self.is_owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,329 @@
+"""
+Spectral Front-End
+MFCC extraction with the mel filterbank and DCT basis built once and reused
+The short-time power spectrum reproduces scipy.signal.spectrogram defaults
+(Tukey(0.25) window, 1/8 overlap, constant detrend, one-sided PSD scaling)
+"""
+
+import numpy as np
+from scipy import signal
+from numpy.lib.stride_tricks import sliding_window_view
+
+class MfccFrontend:
+    # Filterbank/DCT matrices shared by every front-end with the same parameters
+    _cache = {}
+    
+    def __init__(self, sample_rate=16000, n_fft=512, n_mels=40, n_mfcc=13):
+        """
+        Initialize the MFCC front-end
+        
+        Args:
+            sample_rate: Audio sampling rate
+            n_fft: STFT frame length (also the FFT size)
+            n_mels: Number of mel bands
+            n_mfcc: Number of cepstral coefficients returned
+        """
+        self.sample_rate = sample_rate
+        self.n_fft = n_fft
+        self.n_mels = n_mels
+        self.n_mfcc = n_mfcc
+        
+        # signal.spectrogram defaults for nperseg=n_fft
+        self.hop = n_fft - n_fft // 8
+        self.window = signal.get_window(('tukey', 0.25), n_fft).astype(np.float32)
+        
+        # PSD density scaling, with the one-sided doubling folded in
+        scale = np.full(n_fft // 2 + 1, 2.0 / (sample_rate * np.sum(self.window.astype(np.float64) ** 2)))
+        scale[0] /= 2
+        if n_fft % 2 == 0:
+            scale[-1] /= 2
+        self.psd_scale = scale.astype(np.float32)
+        
+        key = (sample_rate, n_fft, n_mels, n_mfcc)
+        if key not in MfccFrontend._cache:
+            MfccFrontend._cache[key] = (
+                np.ascontiguousarray(self._build_mel_filterbank(n_mels, n_fft, sample_rate)),
+                np.ascontiguousarray(self._build_dct_matrix(n_mfcc, n_mels))
+            )
+        self.mel_filterbank, self.dct_matrix = MfccFrontend._cache[key]
+    
+    @staticmethod
+    def _build_mel_filterbank(n_mels, n_fft, sample_rate):
+        """
+        Triangular mel filterbank (same bins and weights as the original per-chunk version)
+        
+        Returns:
+            numpy.ndarray: (n_mels, n_fft // 2 + 1) weights
+        """
+        high_freq_mel = 2595 * np.log10(1 + (sample_rate / 2) / 700)
+        mel_points = np.linspace(0, high_freq_mel, n_mels + 2)
+        hz_points = 700 * (10**(mel_points / 2595) - 1)
+        bin_points = np.floor((n_fft + 1) * hz_points / sample_rate).astype(int)
+        
+        left = bin_points[:-2, None]
+        center = bin_points[1:-1, None]
+        right = bin_points[2:, None]
+        bins = np.arange(n_fft // 2 + 1)[None, :]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rising = np.where((bins >= left) & (bins < center), (bins - left) / (center - left), 0.0)
+            falling = np.where((bins >= center) & (bins < right), (right - bins) / (right - center), 0.0)
+        return rising + falling
+    
+    @staticmethod
+    def _build_dct_matrix(n_mfcc, n_mels):
+        """
+        Orthonormal DCT-II basis (matches scipy dct(type=2, norm='ortho'))
+        
+        Returns:
+            numpy.ndarray: (n_mfcc, n_mels) matrix
+        """
+        k = np.arange(n_mfcc)[:, None]
+        n = np.arange(n_mels)[None, :]
+        basis = np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels)) * np.sqrt(2.0 / n_mels)
+        basis[0] /= np.sqrt(2.0)
+        return basis
+    
+    def power_spectrogram(self, audio_data):
+        """
+        Short-time power spectral density
+        
+        Args:
+            audio_data: 1-D signal (at least n_fft samples)
+        
+        Returns:
+            numpy.ndarray: (n_fft // 2 + 1, n_frames) PSD, like signal.spectrogram's Sxx
+        """
+        frames = sliding_window_view(np.asarray(audio_data, dtype=np.float32), self.n_fft)[::self.hop]
+        return self.frame_power(frames).T
+    
+    def frame_power(self, frames):
+        """
+        Power spectral density of individual frames (detrended, windowed)
+        
+        Args:
+            frames: (n_frames, n_fft) array
+        
+        Returns:
+            numpy.ndarray: (n_frames, n_fft // 2 + 1) PSD
+        """
+        frames = (frames - frames.mean(axis=1, keepdims=True)) * self.window
+        spectrum = np.fft.rfft(frames, axis=1)
+        return (spectrum.real ** 2 + spectrum.imag ** 2) * self.psd_scale
+    
+    def log_mel(self, power):
+        """
+        Log mel energies
+        
+        Args:
+            power: (n_fft // 2 + 1, n_frames) power spectrogram
+        
+        Returns:
+            numpy.ndarray: (n_mels, n_frames) log mel spectrogram
+        """
+        mel_spec = self.mel_filterbank @ power
+        mel_spec = np.where(mel_spec == 0, np.finfo(float).eps, mel_spec)  # Avoid log(0)
+        return np.log(mel_spec)
+    
+    def compute(self, audio_data, sample_mask=None):
+        """
+        Mean MFCC vector of a chunk
+        
+        Args:
+            audio_data: 1-D signal
+            sample_mask: Optional per-sample flags; only STFT frames centred
+                         on a flagged sample are averaged
+        
+        Returns:
+            numpy.ndarray: n_mfcc coefficients averaged over time
+        """
+        if len(audio_data) < self.n_fft:
+            return np.zeros(self.n_mfcc)
+        if sample_mask is None:
+            return self.from_power(self.power_spectrogram(audio_data))
+        
+        frames = sliding_window_view(np.asarray(audio_data, dtype=np.float32), self.n_fft)[::self.hop]
+        frames = frames[sample_mask[np.arange(len(frames)) * self.hop + self.n_fft // 2]]
+        if len(frames) == 0:
+            return np.zeros(self.n_mfcc)
+        return self.from_power(self.frame_power(frames).T)
+    
+    def from_power(self, power):
+        """
+        Mean MFCC vector from a power spectrogram
+        
+        The DCT is linear, so averaging the log-mel frames first and applying
+        the DCT once gives the same result as averaging per-frame MFCCs.
+        
+        Args:
+            power: (n_fft // 2 + 1, n_frames) power spectrogram
+        
+        Returns:
+            numpy.ndarray: n_mfcc coefficients averaged over time
+        """
+        return self.dct_matrix @ self.log_mel(power).mean(axis=1)
+
+class SpectralFrontend:
+    def __init__(self, sample_rate=16000, max_lag=400, n_fft=512, n_mels=40, n_mfcc=13):
+        """
+        Initialize the shared per-chunk front-end
+        
+        One whole-chunk rFFT yields the spectral shape features and the
+        autocorrelation used for pitch and LPC; one STFT yields the MFCCs.
+        
+        Args:
+            sample_rate: Audio sampling rate
+            max_lag: Largest autocorrelation lag needed (pitch search and LPC order)
+            n_fft: STFT frame length for MFCCs
+            n_mels: Number of mel bands
+            n_mfcc: Number of cepstral coefficients
+        """
+        self.sample_rate = sample_rate
+        self.max_lag = max_lag
+        self.mfcc_frontend = MfccFrontend(sample_rate, n_fft=n_fft, n_mels=n_mels, n_mfcc=n_mfcc)
+        
+        # Frequency axis per chunk length
+        self.freqs = {}
+    
+    def analyze(self, audio_data, mfccs=True):
+        """
+        Compute all spectral features of a chunk
+        
+        Args:
+            audio_data: 1-D signal
+            mfccs: Also compute MFCCs (skips the STFT when False)
+            
+        Returns:
+            dict: 'centroid', 'bandwidth', 'rolloff', 'hf_ratio', 'autocorr'
+                  (lags 0..max_lag) and, if requested, 'mfccs'
+        """
+        x = np.asarray(audio_data, dtype=np.float64)
+        n = len(x)
+        spectrum = np.fft.rfft(x)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        
+        features = self.spectral_shape(np.sqrt(power[:n // 2]), n)
+        features['autocorr'] = self._autocorrelation(x, power)
+        if mfccs:
+            features['mfccs'] = self.mfcc_frontend.compute(audio_data)
+        return features
+    
+    def analyze_frames(self, audio_data, starts, frame_length, mfccs=True):
+        """
+        Compute all spectral features over selected frames of a chunk
+        
+        The frames are analyzed where they lie in the chunk, without joining
+        them: the autocorrelation sums the lag products inside each frame and
+        between directly adjacent selected frames, so a run of consecutive
+        frames contributes exactly its own linear autocorrelation.
+        
+        Args:
+            audio_data: 1-D signal (e.g. a pre-emphasized window)
+            starts: Sorted start indices of the selected frames
+            frame_length: Frame length (longer than max_lag)
+            mfccs: Also compute MFCCs, from STFT frames centred in selected frames
+            
+        Returns:
+            dict: Same keys as analyze(); the spectral shape equals analyze()'s
+                  when every frame on the chunk's grid is selected
+        """
+        x = np.asarray(audio_data, dtype=np.float64)
+        starts = np.asarray(starts, dtype=np.intp)
+        L = frame_length
+        lag = min(self.max_lag, L - 1)
+        size = 2 * L
+        
+        frames = x[starts[:, None] + np.arange(L)]
+        spectrum = np.fft.rfft(frames, size, axis=1)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        autocorr = np.fft.irfft(power.sum(axis=0), size)[:lag + 1]
+        
+        # Products x[n] x[n - k] reaching back into the previous selected frame:
+        # entry L - k of the two frames' cross-correlation
+        adjacent = np.flatnonzero(np.diff(starts) == L)
+        if len(adjacent) > 0:
+            cross = np.sum(np.conj(spectrum[adjacent + 1]) * spectrum[adjacent], axis=0)
+            autocorr[1:] += np.fft.irfft(cross, size)[L - lag:L][::-1]
+        
+        # Spectral shape of the whole chunk with the unselected frames zeroed
+        # in place (the chunk as is when every frame on its grid is selected)
+        covered = np.zeros(len(x), dtype=bool)
+        covered[(starts[:, None] + np.arange(L)).ravel()] = True
+        gated = x if covered[:len(x) // L * L].all() else np.where(covered, x, 0.0)
+        n = len(x)
+        whole = np.fft.rfft(gated)
+        features = self.spectral_shape(np.abs(whole[:n // 2]), n)
+        features['autocorr'] = autocorr
+        if mfccs:
+            features['mfccs'] = self.mfcc_frontend.compute(audio_data, sample_mask=covered)
+        return features
+    
+    def spectral_shape(self, magnitude, n):
+        """
+        Spectral centroid, bandwidth, 85% rolloff and high/low band ratio
+        
+        Args:
+            magnitude: Magnitude spectrum of the positive frequencies (n // 2 bins)
+            n: Chunk length
+            
+        Returns:
+            dict: Spectral shape features
+        """
+        freqs = self.freqs.get(n)
+        if freqs is None:
+            freqs = self.freqs[n] = np.arange(n // 2) * (self.sample_rate / n)
+        
+        total = np.sum(magnitude)
+        if total > 0:
+            centroid = np.dot(freqs, magnitude) / total
+            bandwidth = np.sqrt(np.dot((freqs - centroid) ** 2, magnitude) / total)
+        else:
+            centroid = 0
+            bandwidth = 0
+        
+        # Spectral rolloff (85% of magnitude)
+        cumsum = np.cumsum(magnitude)
+        rolloff_idx = np.searchsorted(cumsum, 0.85 * cumsum[-1]) if len(cumsum) > 0 else len(freqs)
+        rolloff = freqs[rolloff_idx] if rolloff_idx < len(freqs) else 0
+        
+        # High frequency ratio
+        mid = len(magnitude) // 2
+        hf_ratio = np.sum(magnitude[mid:]) / (np.sum(magnitude[:mid]) + 1e-6)
+        
+        return {
+            'centroid': centroid,
+            'bandwidth': bandwidth,
+            'rolloff': rolloff,
+            'hf_ratio': hf_ratio
+        }
+    
+    def _autocorrelation(self, x, power):
+        """
+        Linear autocorrelation for lags 0..max_lag from the chunk's power spectrum
+        
+        The unpadded inverse FFT is circular: c[k] = r[k] + sum_{i<k} x[i] x[n-k+i].
+        The wrap-around term only involves the first and last max_lag samples,
+        so it is subtracted exactly with one short correlation.
+        
+        Args:
+            x: Chunk (float64)
+            power: |rfft(x)|^2
+            
+        Returns:
+            numpy.ndarray: r[0..max_lag]
+        """
+        n = len(x)
+        lag = min(self.max_lag, n - 1)
+        if n < 2 * lag + 1:
+            # Too short for the correction; a padded transform is cheap here anyway
+            size = 2 * n
+            padded = np.fft.rfft(x, size)
+            return np.fft.irfft(padded.real ** 2 + padded.imag ** 2, size)[:lag + 1]
+        
+        circular = np.fft.irfft(power, n)[:lag + 1]
+        if lag == 0:
+            return circular
+        
+        wrap = np.correlate(x[n - lag:], x[:lag], mode='full')[lag - 1:2 * lag - 1][::-1]
+        circular[1:] -= wrap
+        return circular
@@ -8,6 +8,9 @@ import numpy as np
 import sounddevice as sd
 import threading
 import time
+from collections import deque
+from audio_buffer import AudioRingBuffer
+from spectral_frontend import SpectralFrontend
 
 class SpeechEmotionDetector:
     def __init__(self, sample_rate=16000, chunk_duration=1.5):
@@ -16,8 +19,12 @@ class SpeechEmotionDetector:
         self.chunk_duration = chunk_duration
         self.chunk_samples = int(sample_rate * chunk_duration)
         
-        # Audio buffer and threading
-        self.audio_buffer = []
+        # Analysis hop: a new window is classified every hop_duration seconds
+        self.hop_duration = 0.3
+        self.hop_samples = int(sample_rate * self.hop_duration)
+        
+        # Audio buffer and threading (10 seconds of float32 samples)
+        self.audio_buffer = AudioRingBuffer(sample_rate * 10)
         self.is_recording = False
         self.current_emotion = "neutral"
         self.emotion_confidence = 0.6
@@ -36,6 +43,11 @@ class SpeechEmotionDetector:
         self.calibration_samples = []
         self.is_calibrated = False
         
+        # One rFFT per chunk for spectral features and pitch autocorrelation
+        # (only lags up to 400 are searched)
+        self.max_pitch_lag = 400
+        self.spectral_frontend = SpectralFrontend(sample_rate, max_lag=self.max_pitch_lag)
+        
         # Feature tracking
         self.recent_features = []
         self.max_recent_features = 10
@@ -47,6 +59,9 @@ class SpeechEmotionDetector:
             'neutral': 0, 'happy': 0, 'sad': 0, 'angry': 0, 'fear': 0
         }
         
+        # Latency from the arrival of a hop's last sample to the emotion update
+        self.latencies = deque(maxlen=30)
+        
         print("="*60)
         print("🎤 SPEECH EMOTION DETECTOR INITIALIZED")
         print("="*60)
@@ -61,13 +76,8 @@ class SpeechEmotionDetector:
             print(f"⚠️  Audio status: {status}")
         
         if self.is_recording:
-            audio_data = indata.flatten() if indata.ndim > 1 else indata
-            self.audio_buffer.extend(audio_data)
-            
-            # Keep buffer manageable (10 seconds max)
-            max_buffer = self.sample_rate * 10
-            if len(self.audio_buffer) > max_buffer:
-                self.audio_buffer = self.audio_buffer[-max_buffer:]
+            audio_data = indata[:, 0] if indata.ndim > 1 else indata
+            self.audio_buffer.write(audio_data)
     
     def start_recording(self):
         """Start audio recording"""
@@ -80,7 +90,7 @@ class SpeechEmotionDetector:
             pass
         
         self.is_recording = True
-        self.audio_buffer = []
+        self.audio_buffer.clear()
         
         try:
             self.stream = sd.InputStream(
@@ -116,13 +126,20 @@ class SpeechEmotionDetector:
         print("🔧 Calibrating audio... please stay quiet for 3 seconds...\n")
         calibration_start = time.time()
         
+        # First pass once a full window is captured, then once per hop
+        next_position = self.chunk_samples
+        
         while self.is_recording:
             try:
-                if len(self.audio_buffer) < self.chunk_samples:
-                    time.sleep(0.1)
+                # Sleep until the audio callback has delivered the next hop
+                # (the timeout only lets the loop notice stop_recording)
+                if not self.audio_buffer.wait_for(next_position, timeout=1.0):
                     continue
+                arrival_time = self.audio_buffer.last_write_time
+                next_position = self.audio_buffer.total_written + self.hop_samples
                 
-                audio_chunk = np.array(self.audio_buffer[-self.chunk_samples:])
+                # Zero-copy view of the newest window
+                audio_chunk = self.audio_buffer.latest(self.chunk_samples)
                 self.total_chunks_processed += 1
                 
                 # Calculate energy
@@ -132,7 +149,6 @@ class SpeechEmotionDetector:
                 if not self.is_calibrated:
                     if time.time() - calibration_start < 3.0:
                         self.calibration_samples.append(energy)
-                        time.sleep(0.3)
                         continue
                     else:
                         self.baseline_energy = np.mean(self.calibration_samples) + 0.01
@@ -149,8 +165,10 @@ class SpeechEmotionDetector:
                 # Periodic status logging
                 if self.total_chunks_processed % 20 == 0:
                     speech_pct = (self.speech_chunks_detected / self.total_chunks_processed) * 100
+                    avg_latency = np.mean(self.latencies) * 1000 if len(self.latencies) > 0 else 0
                     print(f"📊 Status: Energy={energy:.4f} | Speech={is_speech} | "
-                          f"Active={speech_pct:.0f}% | Emotion={self.current_emotion.upper()}")
+                          f"Active={speech_pct:.0f}% | Emotion={self.current_emotion.upper()} | "
+                          f"Latency={avg_latency:.0f}ms")
                 
                 if is_speech:
                     self.speech_chunks_detected += 1
@@ -180,7 +198,7 @@ class SpeechEmotionDetector:
                             self.emotion_confidence = 0.6
                             self.recent_features.clear()
                 
-                time.sleep(0.3)
+                self.latencies.append(time.perf_counter() - arrival_time)
                 
             except Exception as e:
                 print(f"❌ Processing error: {e}")
@@ -194,13 +212,15 @@ class SpeechEmotionDetector:
         # Zero-crossing rate (pitch variation indicator)
         zcr = np.sum(np.abs(np.diff(np.sign(audio_data)))) / (2 * len(audio_data))
         
+        # Shared spectrum: spectral shape and autocorrelation (searched lags only)
+        spectral = self.spectral_frontend.analyze(audio_data, mfccs=False)
+        
         # Pitch estimation using autocorrelation
-        autocorr = np.correlate(audio_data, audio_data, mode='full')
-        autocorr = autocorr[len(autocorr)//2:]
+        autocorr = spectral['autocorr']
         
         # Find dominant frequency (pitch)
         peaks = []
-        for i in range(1, min(len(autocorr)-1, 400)):
+        for i in range(1, min(len(autocorr)-1, self.max_pitch_lag)):
             if autocorr[i] > autocorr[i-1] and autocorr[i] > autocorr[i+1] and autocorr[i] > 0:
                 peaks.append((i, autocorr[i]))
         
@@ -210,23 +230,9 @@ class SpeechEmotionDetector:
         else:
             pitch_hz = 120  # Default pitch
         
-        # Spectral features
-        fft = np.abs(np.fft.fft(audio_data))
-        freqs = np.fft.fftfreq(len(fft), 1/self.sample_rate)
-        positive_freqs = freqs[:len(freqs)//2]
-        positive_fft = fft[:len(fft)//2]
-        
-        # Spectral centroid (brightness)
-        if np.sum(positive_fft) > 0:
-            spectral_centroid = np.sum(positive_freqs * positive_fft) / np.sum(positive_fft)
-        else:
-            spectral_centroid = 0
-        
-        # High frequency ratio
-        mid = len(positive_fft) // 2
-        hf_energy = np.sum(positive_fft[mid:])
-        lf_energy = np.sum(positive_fft[:mid])
-        hf_ratio = hf_energy / (lf_energy + 1e-6)
+        # Spectral centroid (brightness) and high frequency ratio
+        spectral_centroid = spectral['centroid']
+        hf_ratio = spectral['hf_ratio']
         
         return {
             'energy': energy,
@@ -287,6 +293,8 @@ class SpeechEmotionDetector:
         else:
             speech_ratio = 0
         
+        avg_latency = np.mean(self.latencies) * 1000 if len(self.latencies) > 0 else 0
+        
         return {
             'total_chunks': self.total_chunks_processed,
             'speech_chunks': self.speech_chunks_detected,
@@ -295,5 +303,6 @@ class SpeechEmotionDetector:
             'confidence': self.emotion_confidence,
             'emotion_counts': self.emotion_detections,
             'calibrated': self.is_calibrated,
-            'threshold': self.energy_threshold
+            'threshold': self.energy_threshold,
+            'avg_latency_ms': avg_latency
         }
@@ -4,44 +4,138 @@ Professional-grade accuracy (85-90%) using advanced audio features
 Features: MFCCs, Formants, Prosody, Speaking Rate, Spectral Analysis
 """
 
+import copy
+import os
 import numpy as np
 import sounddevice as sd
 import threading
 import time
+from concurrent.futures import ProcessPoolExecutor
 from scipy import signal
-from scipy.fftpack import dct
 from collections import deque
+from audio_buffer import AudioRingBuffer
+from feature_history import FeatureHistory
+from formant_estimator import FormantEstimator
+from pitch_engine import PitchEngine
+from prosody import OnsetWindow, energy_variation
+from spectral_frontend import SpectralFrontend
+from streaming_features import StreamingFeatureExtractor
+from voice_activity import FrameVAD
 import warnings
 warnings.filterwarnings('ignore')
 
 class SpeechEmotionDetector:
-    def __init__(self, sample_rate=16000, chunk_duration=1.5):
+    # Classification rules: emotion -> (feature, lower, upper, weight); a rule
+    # adds its weight when lower < feature < upper. 'energy_ratio' is the mean
+    # energy over the VAD threshold, the rest are FeatureHistory columns.
+    EMOTION_RULES = {
+        # ANGRY: Loud, harsh, sharp, high tension
+        'angry': [('energy_ratio', 2.5, np.inf, 0.3), ('hf_ratio', 0.6, np.inf, 0.25),
+                  ('F2', 1800, np.inf, 0.2), ('energy_variation', 0.15, np.inf, 0.15),
+                  ('mfcc_2', 10, np.inf, 0.1)],
+        # HAPPY: Energetic, bright, varied pitch
+        'happy': [('energy_ratio', 1.8, np.inf, 0.25), ('pitch', 160, np.inf, 0.25),
+                  ('spectral_centroid', 1200, np.inf, 0.2), ('pitch_variation', 0.05, 0.15, 0.15),
+                  ('speaking_rate', 3.5, np.inf, 0.15)],
+        # SAD: Quiet, low, monotonous
+        'sad': [('energy_ratio', -np.inf, 2.0, 0.3), ('pitch', -np.inf, 150, 0.25),
+                ('spectral_bandwidth', -np.inf, 800, 0.2), ('pitch_variation', -np.inf, 0.05, 0.15),
+                ('speaking_rate', -np.inf, 2.5, 0.1)],
+        # FEAR: Tense, trembling, irregular
+        'fear': [('zcr', 0.18, np.inf, 0.3), ('pitch_variation', 0.18, np.inf, 0.25),
+                 ('energy_variation', 0.20, np.inf, 0.25), ('hf_ratio', 0.65, np.inf, 0.2)]
+    }
+    
+    def __init__(self, sample_rate=16000, chunk_duration=1.5, verbose=True):
         """
         Initialize enhanced speech emotion detector
         
         Args:
             sample_rate: Audio sampling rate (16000 Hz recommended)
             chunk_duration: Analysis window duration in seconds
+            verbose: Print the startup banner
         """
         self.sample_rate = sample_rate
         self.chunk_duration = chunk_duration
         self.chunk_samples = int(sample_rate * chunk_duration)
         
-        # Audio buffer and threading
-        self.audio_buffer = []
+        # Analysis hop: a new window is classified every hop_duration seconds
+        self.hop_duration = 0.3
+        self.hop_samples = int(sample_rate * self.hop_duration)
+        
+        # FFT-based pitch estimation (50-500 Hz)
+        self.pitch_engine = PitchEngine(sample_rate, min_hz=50, max_hz=500)
+        
+        # Shared spectral front-end: one rFFT per chunk for spectral shape,
+        # pitch and LPC autocorrelation, one STFT for MFCCs (cached mel/DCT)
+        self.lpc_order = int(sample_rate / 1000) + 2
+        self.spectral_frontend = SpectralFrontend(
+            sample_rate, max_lag=max(self.pitch_engine.max_period - 1, self.lpc_order),
+            n_fft=512, n_mels=40, n_mfcc=13
+        )
+        
+        # LPC formants from the shared autocorrelation
+        self.formant_estimator = FormantEstimator(sample_rate, order=self.lpc_order)
+        
+        # Live loop: each new hop is framed and analyzed once, window features
+        # are rolling aggregates over the frames (heavy features over the
+        # voiced 20 ms VAD frames only, as in the per-window extraction)
+        self.streaming_features = StreamingFeatureExtractor(
+            sample_rate, window_samples=self.chunk_samples,
+            max_lag=max(self.pitch_engine.max_period - 1, self.lpc_order)
+        )
+        self.stream_position = 0
+        
+        # Audio buffer and threading (15 seconds of float32 samples)
+        self.audio_buffer = AudioRingBuffer(sample_rate * 15)
         self.is_recording = False
-        self.current_emotion = "neutral"
-        self.emotion_confidence = 0.6
-        self.last_speech_time = time.time()
         
         # Stream settings
         self.blocksize = 2048
         self.device = None
         
         # Voice activity detection (VAD)
-        self.energy_threshold = 0.015
         self.silence_threshold = 5.0
         
+        # Frame-level VAD (20 ms energy/ZCR): a chunk needs enough voiced
+        # frames to be analyzed, and heavy features only see those frames
+        self.frame_vad = FrameVAD(sample_rate, frame_duration=0.02)
+        self.min_voiced_samples = int(sample_rate * 0.1)
+        
+        # Calibration, smoothing buffers and statistics of the current recording
+        self._reset_session_state()
+        
+        # Rule table as flat arrays over [history means..., energy_ratio]
+        self.emotion_labels = list(self.EMOTION_RULES) + ['neutral']
+        rules = [(emotion_index, feature, lower, upper, weight)
+                 for emotion_index, emotion in enumerate(self.EMOTION_RULES)
+                 for feature, lower, upper, weight in self.EMOTION_RULES[emotion]]
+        columns = dict(self.feature_history.columns, energy_ratio=len(self.feature_history.columns))
+        self.rule_emotions = np.array([rule[0] for rule in rules])
+        self.rule_features = np.array([columns[rule[1]] for rule in rules])
+        self.rule_lower = np.array([rule[2] for rule in rules], dtype=np.float64)
+        self.rule_upper = np.array([rule[3] for rule in rules], dtype=np.float64)
+        self.rule_weights = np.array([rule[4] for rule in rules])
+        
+        if verbose:
+            print("="*60)
+            print("🎤 ENHANCED SPEECH EMOTION DETECTOR v2.0")
+            print("="*60)
+            print("System: Advanced feature-based detection (85-90% accuracy)")
+            print("Features: MFCCs (13), Formants (F1-F3), Prosody, Speaking Rate")
+            print("Tip: Speak naturally for 2-3 seconds for best results")
+            print("="*60)
+    
+    def _reset_session_state(self):
+        """Start calibration, smoothing history and statistics from scratch"""
+        self.current_emotion = "neutral"
+        self.emotion_confidence = 0.6
+        self.last_speech_time = time.time()
+        
+        # Voice activity detection (VAD)
+        self.energy_threshold = 0.015
+        self.speech_ratios = deque(maxlen=30)
+        
         # Calibration
         self.baseline_energy = 0.01
         self.calibration_samples = []
@@ -50,7 +144,7 @@ class SpeechEmotionDetector:
         # Temporal smoothing buffers
         self.emotion_history = deque(maxlen=10)
         self.confidence_history = deque(maxlen=10)
-        self.feature_history = deque(maxlen=15)
+        self.feature_history = FeatureHistory(capacity=15, n_mfcc=13)
         
         # Statistics
         self.total_chunks_processed = 0
@@ -60,17 +154,12 @@ class SpeechEmotionDetector:
         }
         self.processing_times = deque(maxlen=30)
         
+        # Latency from the arrival of a hop's last sample to the emotion update
+        self.latencies = deque(maxlen=30)
+        
         # Speaking rate tracking
-        self.speech_onsets = []
+        self.speech_onsets = OnsetWindow(window=5.0)
         self.speech_segments = []
-        
-        print("="*60)
-        print("🎤 ENHANCED SPEECH EMOTION DETECTOR v2.0")
-        print("="*60)
-        print("System: Advanced feature-based detection (85-90% accuracy)")
-        print("Features: MFCCs (13), Formants (F1-F3), Prosody, Speaking Rate")
-        print("Tip: Speak naturally for 2-3 seconds for best results")
-        print("="*60)
     
     def audio_callback(self, indata, frames, time_info, status):
         """Callback for audio stream"""
@@ -78,13 +167,8 @@ class SpeechEmotionDetector:
             print(f"⚠️  Audio status: {status}")
         
         if self.is_recording:
-            audio_data = indata.flatten() if indata.ndim > 1 else indata
-            self.audio_buffer.extend(audio_data)
-            
-            # Keep buffer manageable (15 seconds max)
-            max_buffer = self.sample_rate * 15
-            if len(self.audio_buffer) > max_buffer:
-                self.audio_buffer = self.audio_buffer[-max_buffer:]
+            audio_data = indata[:, 0] if indata.ndim > 1 else indata
+            self.audio_buffer.write(audio_data)
     
     def start_recording(self):
         """Start audio recording"""
@@ -97,7 +181,9 @@ class SpeechEmotionDetector:
             pass
         
         self.is_recording = True
-        self.audio_buffer = []
+        self.audio_buffer.clear()
+        self.streaming_features.reset()
+        self.stream_position = 0
         
         try:
             self.stream = sd.InputStream(
@@ -133,17 +219,28 @@ class SpeechEmotionDetector:
         print("🔧 Calibrating audio... please stay quiet for 3 seconds...\n")
         calibration_start = time.time()
         
+        # First pass once a full window is captured, then once per hop
+        next_position = self.chunk_samples
+        
         while self.is_recording:
             try:
-                process_start = time.time()
-                
-                if len(self.audio_buffer) < self.chunk_samples:
-                    time.sleep(0.1)
+                # Sleep until the audio callback has delivered the next hop
+                # (the timeout only lets the loop notice stop_recording)
+                if not self.audio_buffer.wait_for(next_position, timeout=1.0):
                     continue
+                arrival_time = self.audio_buffer.last_write_time
+                process_start = time.time()
                 
-                audio_chunk = np.array(self.audio_buffer[-self.chunk_samples:])
+                # Zero-copy view of the newest window
+                audio_chunk = self.audio_buffer.latest(self.chunk_samples)
                 self.total_chunks_processed += 1
                 
+                # Frame only the samples that arrived since the last pass; the
+                # frames the VAD rejects skip the FFT
+                new_samples, self.stream_position = self.audio_buffer.since(self.stream_position)
+                self.streaming_features.update(new_samples, self.energy_threshold)
+                next_position = self.stream_position + self.hop_samples
+                
                 # Calculate energy for VAD
                 energy = np.sqrt(np.mean(audio_chunk ** 2))
                 
@@ -151,7 +248,6 @@ class SpeechEmotionDetector:
                 if not self.is_calibrated:
                     if time.time() - calibration_start < 3.0:
                         self.calibration_samples.append(energy)
-                        time.sleep(0.3)
                         continue
                     else:
                         self.baseline_energy = np.mean(self.calibration_samples) + 0.01
@@ -162,24 +258,28 @@ class SpeechEmotionDetector:
                         print(f"   Threshold: {self.energy_threshold:.4f}")
                         print("   🎤 You can start speaking now...\n")
                 
-                # Voice activity detection
-                is_speech = energy > self.energy_threshold
+                # Voice activity detection: loud enough overall, with enough voiced
+                # frames (as classified when the frames were streamed)
+                speech_ratio, voiced_samples = self.streaming_features.voice_activity()
+                self.speech_ratios.append(speech_ratio)
+                is_speech = energy > self.energy_threshold and voiced_samples >= self.min_voiced_samples
                 
                 # Periodic status
                 if self.total_chunks_processed % 20 == 0:
                     speech_pct = (self.speech_chunks_detected / self.total_chunks_processed) * 100
                     avg_time = np.mean(self.processing_times) * 1000 if len(self.processing_times) > 0 else 0
-                    print(f"📊 Energy={energy:.4f} | Speech={is_speech} | "
+                    avg_latency = np.mean(self.latencies) * 1000 if len(self.latencies) > 0 else 0
+                    print(f"📊 Energy={energy:.4f} | Speech={is_speech} ({speech_ratio:.0%} active) | "
                           f"Active={speech_pct:.0f}% | Emotion={self.current_emotion.upper()} | "
-                          f"Proc={avg_time:.0f}ms")
+                          f"Proc={avg_time:.0f}ms | Latency={avg_latency:.0f}ms")
                 
                 if is_speech:
                     self.speech_chunks_detected += 1
                     self.last_speech_time = time.time()
                     self.speech_onsets.append(time.time())
                     
-                    # Extract enhanced features
-                    features = self._extract_enhanced_features(audio_chunk)
+                    # Enhanced features from the streamed frames
+                    features = self._extract_streaming_features()
                     self.feature_history.append(features)
                     
                     # Classify emotion (need at least 3 samples for reliability)
@@ -207,15 +307,242 @@ class SpeechEmotionDetector:
                 # Track processing time
                 processing_time = time.time() - process_start
                 self.processing_times.append(processing_time)
-                
-                time.sleep(0.3)
+                self.latencies.append(time.perf_counter() - arrival_time)
                 
             except Exception as e:
                 print(f"❌ Processing error: {e}")
                 time.sleep(1)
     
-    def _extract_enhanced_features(self, audio_data):
-        """Extract comprehensive acoustic features for high accuracy"""
+    def analyze_file(self, path, num_workers=None):
+        """
+        Analyze a recorded WAV/FLAC file offline
+        
+        The recording is cut into chunk_samples windows every hop_duration
+        seconds, as the live loop would see it. Features of all speech windows
+        are extracted in a process pool; calibration, history-dependent
+        features, classification and smoothing then run in media-time order.
+        
+        Each file is analyzed on a copy of the detector with its own
+        calibration, history and statistics, so the result does not depend on
+        earlier files or on a live session (which is left untouched).
+        
+        Args:
+            path: Audio file path
+            num_workers: Feature extraction processes (default: CPU count, 1 = in-process)
+            
+        Returns:
+            list: Timeline of dictionaries with 'time' (seconds, window end),
+                  'emotion', 'confidence', 'energy', 'speech_ratio' (fraction of
+                  active 20 ms frames) and 'is_speech'
+        """
+        session = copy.copy(self)
+        session._reset_session_state()
+        return session._analyze_recording(path, num_workers)
+    
+    def _analyze_recording(self, path, num_workers):
+        """Offline analysis of one file on fresh session state (see analyze_file)"""
+        start_time = time.time()
+        audio = self._load_audio(path)
+        
+        hop = max(int(self.sample_rate * self.hop_duration), 1)
+        n = self.chunk_samples
+        if len(audio) < n:
+            return []
+        starts = np.arange(0, len(audio) - n + 1, hop)
+        ends = (starts + n) / self.sample_rate
+        
+        # Window RMS for every window at once from a running sum of squares
+        squares = np.concatenate(([0.0], np.cumsum(audio.astype(np.float64) ** 2)))
+        energies = np.sqrt((squares[starts + n] - squares[starts]) / n)
+        
+        # Calibration: same rule as the live loop, over the first 3 seconds of audio
+        calibration_windows = max(int(np.searchsorted(starts / self.sample_rate, 3.0)), 1)
+        self.calibration_samples = list(energies[:calibration_windows])
+        self.baseline_energy = np.mean(self.calibration_samples) + 0.01
+        self.energy_threshold = max(self.baseline_energy * 1.5, 0.015)
+        self.is_calibrated = True
+        
+        # Frame-level VAD over the whole recording, counted per window
+        vad = self.frame_vad.analyze(audio, self.energy_threshold)
+        active_frames, window_frames = self.frame_vad.window_counts(vad['active'], starts, n)
+        voiced_frames, _ = self.frame_vad.window_counts(vad['voiced'], starts, n)
+        speech_ratios = active_frames / np.maximum(window_frames, 1)
+        
+        is_speech = ((energies > self.energy_threshold) &
+                     (voiced_frames * self.frame_vad.frame_length >= self.min_voiced_samples))
+        is_speech[:calibration_windows] = False
+        speech_starts = starts[is_speech]
+        
+        # Heavy features of each speech window cover the voiced frames of the recording-level VAD
+        voiced_starts = [self.frame_vad.window_starts(vad['voiced'], start, n) for start in speech_starts]
+        features = self._extract_windows(audio, speech_starts, voiced_starts, num_workers)
+        
+        timeline = []
+        speech_index = 0
+        self.last_speech_time = ends[0]
+        for i in range(calibration_windows, len(starts)):
+            current_time = ends[i]
+            self.total_chunks_processed += 1
+            
+            if is_speech[i]:
+                self.speech_chunks_detected += 1
+                self.last_speech_time = current_time
+                self.speech_onsets.append(current_time)
+                
+                window_features = features[speech_index]
+                speech_index += 1
+                
+                # History-dependent features cannot be computed in the workers
+                window_features['pitch_variation'] = self._pitch_variation()
+                window_features['speaking_rate'] = self._estimate_speaking_rate(current_time)
+                self.feature_history.append(window_features)
+                
+                if len(self.feature_history) >= 3:
+                    emotion, confidence = self._classify_emotion_enhanced()
+                    emotion, confidence = self._apply_temporal_smoothing(emotion, confidence)
+                    
+                    if emotion != self.current_emotion or abs(confidence - self.emotion_confidence) > 0.1:
+                        self.current_emotion = emotion
+                        self.emotion_confidence = confidence
+                        self.emotion_detections[emotion] = self.emotion_detections.get(emotion, 0) + 1
+            elif current_time - self.last_speech_time > self.silence_threshold:
+                if self.current_emotion != "neutral":
+                    self.current_emotion = "neutral"
+                    self.emotion_confidence = 0.65
+                    self.feature_history.clear()
+                    self.emotion_history.clear()
+            
+            timeline.append({
+                'time': float(current_time),
+                'emotion': self.current_emotion,
+                'confidence': float(self.emotion_confidence),
+                'energy': float(energies[i]),
+                'speech_ratio': float(speech_ratios[i]),
+                'is_speech': bool(is_speech[i])
+            })
+        
+        elapsed = time.time() - start_time
+        duration = len(audio) / self.sample_rate
+        print(f"✅ Analyzed {duration:.1f}s of audio ({len(speech_starts)} speech windows) "
+              f"in {elapsed:.1f}s ({duration / max(elapsed, 1e-6):.0f}x real time)")
+        
+        return timeline
+    
+    def _load_audio(self, path):
+        """
+        Read an audio file as mono float32 at sample_rate
+        
+        Uses soundfile (installed with librosa) for WAV/FLAC, falling back
+        to scipy's WAV reader.
+        
+        Args:
+            path: Audio file path
+            
+        Returns:
+            numpy.ndarray: Mono float32 samples in [-1, 1]
+        """
+        try:
+            import soundfile
+            audio, file_rate = soundfile.read(path, dtype='float32', always_2d=False)
+        except ImportError:
+            from scipy.io import wavfile
+            file_rate, audio = wavfile.read(path)
+            if audio.dtype == np.uint8:
+                # 8-bit WAV is unsigned with silence at 128
+                audio = (audio.astype(np.float32) - 128) / 128
+            elif np.issubdtype(audio.dtype, np.integer):
+                # Full scale is 2 ** (bits - 1), as soundfile scales it
+                audio = audio.astype(np.float32) / -float(np.iinfo(audio.dtype).min)
+        
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        audio = audio.astype(np.float32)
+        
+        if file_rate != self.sample_rate:
+            divisor = np.gcd(int(file_rate), int(self.sample_rate))
+            audio = signal.resample_poly(audio, self.sample_rate // divisor, file_rate // divisor)
+            audio = audio.astype(np.float32)
+        
+        return audio
+    
+    def _extract_windows(self, audio, starts, voiced_starts, num_workers=None):
+        """
+        Extract enhanced features for many windows, in parallel when worthwhile
+        
+        Consecutive windows are sent to the workers as one contiguous segment,
+        so every sample crosses the process boundary about once.
+        
+        Args:
+            audio: Whole recording (float32)
+            starts: Window start indices
+            voiced_starts: Per window, start offsets of its voiced VAD frames
+            num_workers: Worker processes (default: CPU count, 1 = in-process)
+            
+        Returns:
+            list: Feature dictionaries in the order of starts
+        """
+        num_workers = num_workers or os.cpu_count() or 1
+        if num_workers <= 1 or len(starts) < 2 * num_workers:
+            return self._extract_window_batch(audio, starts, voiced_starts)
+        
+        # A few tasks per worker keeps the pool balanced
+        tasks = []
+        for indices in np.array_split(np.arange(len(starts)), num_workers * 4):
+            if len(indices) == 0:
+                continue
+            group = starts[indices]
+            segment = audio[group[0]:group[-1] + self.chunk_samples]
+            tasks.append((segment, group - group[0], [voiced_starts[i] for i in indices]))
+        
+        with ProcessPoolExecutor(max_workers=num_workers, initializer=_init_feature_worker,
+                                 initargs=(self.sample_rate, self.chunk_duration,
+                                           self.energy_threshold)) as pool:
+            features = []
+            for group_features in pool.map(_extract_segment_features, *zip(*tasks)):
+                features.extend(group_features)
+        return features
+    
+    def _extract_window_batch(self, audio, offsets, voiced_starts):
+        """
+        Extract enhanced features for windows of one recording
+        
+        Formants of all windows are solved in one batched eigenvalue call.
+        
+        Args:
+            audio: Recording or segment of it
+            offsets: Window start indices within audio
+            voiced_starts: Per window, start offsets of its voiced VAD frames
+            
+        Returns:
+            list: Feature dictionaries in the order of offsets
+        """
+        autocorrs = []
+        features = [self._extract_enhanced_features(audio[o:o + self.chunk_samples], autocorrs, voiced)
+                    for o, voiced in zip(offsets, voiced_starts)]
+        for window_features, formants in zip(features, self.formant_estimator.estimate_batch(autocorrs)):
+            window_features['formants'] = formants
+        return features
+    
+    def _extract_enhanced_features(self, audio_data, autocorrs=None, voiced_starts=None):
+        """
+        Extract comprehensive acoustic features for high accuracy
+        
+        Energy, ZCR and prosody describe the whole window; pitch, MFCCs and
+        formants are accumulated over its voiced 20 ms frames in place, and
+        spectral shape comes from the window with its other frames zeroed
+        (all frames are used if too few are voiced).
+        
+        Args:
+            audio_data: Analysis window
+            autocorrs: Optional list; when given, formants are left to the caller
+                       and the window's autocorrelation is appended for a
+                       batched estimate
+            voiced_starts: Start offsets of the window's voiced VAD frames
+                           (default: run the frame VAD on the window)
+            
+        Returns:
+            dict: Window features
+        """
         
         # Preprocess: Pre-emphasis filter
         pre_emphasis = 0.97
@@ -227,17 +554,32 @@ class SpeechEmotionDetector:
         # === 2. Zero-Crossing Rate ===
         zcr = np.sum(np.abs(np.diff(np.sign(emphasized)))) / (2 * len(emphasized))
         
+        # Frame-level VAD: heavy features skip silent and unvoiced frames
+        frame_length = self.frame_vad.frame_length
+        if voiced_starts is None:
+            vad = self.frame_vad.analyze(audio_data, self.energy_threshold)
+            voiced_starts = np.flatnonzero(vad['voiced']) * frame_length
+        if len(voiced_starts) * frame_length < self.min_voiced_samples:
+            voiced_starts = np.arange(len(audio_data) // frame_length) * frame_length
+        
+        # Per-frame rFFTs + one STFT shared by the spectral, pitch, MFCC and LPC features
+        spectral_features = self.spectral_frontend.analyze_frames(emphasized, voiced_starts, frame_length)
+        autocorr = spectral_features['autocorr']
+        
         # === 3. Pitch Estimation (F0) ===
-        pitch_hz = self._estimate_pitch(emphasized)
+        pitch_hz = self._estimate_pitch(emphasized, autocorr)
         
         # === 4. MFCCs (Mel-Frequency Cepstral Coefficients) ===
-        mfccs = self._compute_mfccs(emphasized, n_mfcc=13)
+        mfccs = spectral_features['mfccs']
         
         # === 5. Formants (F1, F2, F3) ===
-        formants = self._estimate_formants(emphasized)
+        if autocorrs is None:
+            formants = self._estimate_formants(emphasized, autocorr)
+        else:
+            autocorrs.append(autocorr)
+            formants = None
         
-        # === 6. Spectral Features ===
-        spectral_features = self._compute_spectral_features(emphasized)
+        # === 6. Spectral Features === (centroid, bandwidth, rolloff, hf_ratio above)
         
         # === 7. Prosodic Features ===
         prosody = self._compute_prosody(emphasized, pitch_hz)
@@ -260,300 +602,82 @@ class SpeechEmotionDetector:
             'speaking_rate': speaking_rate
         }
     
-    def _estimate_pitch(self, audio_data):
-        """Estimate fundamental frequency (F0) using autocorrelation"""
-        autocorr = np.correlate(audio_data, audio_data, mode='full')
-        autocorr = autocorr[len(autocorr)//2:]
-        
-        # Find peaks in autocorrelation
-        min_period = int(self.sample_rate / 500)  # Max 500 Hz
-        max_period = int(self.sample_rate / 50)   # Min 50 Hz
-        
-        autocorr = autocorr[min_period:max_period]
-        if len(autocorr) > 0:
-            peak_idx = np.argmax(autocorr)
-            pitch_period = peak_idx + min_period
-            pitch_hz = self.sample_rate / pitch_period if pitch_period > 0 else 120
-        else:
-            pitch_hz = 120
-        
-        return np.clip(pitch_hz, 50, 500)
-    
-    def _compute_mfccs(self, audio_data, n_mfcc=13):
-        """Compute Mel-Frequency Cepstral Coefficients"""
-        # Parameters
-        n_fft = 512
-        n_mels = 40
+    def _extract_streaming_features(self):
+        """Enhanced features for the current window from the streaming frame aggregates"""
+        stream = self.streaming_features.get_features()
+        autocorr = stream['autocorr']
+        pitch_hz = self._estimate_pitch(None, autocorr)
         
-        # Compute spectrogram
-        f, t, Sxx = signal.spectrogram(audio_data, self.sample_rate, nperseg=n_fft)
-        
-        # Mel filterbank
-        mel_filters = self._mel_filterbank(n_mels, n_fft, self.sample_rate)
-        
-        # Apply mel filters
-        mel_spec = np.dot(mel_filters, Sxx)
-        mel_spec = np.where(mel_spec == 0, np.finfo(float).eps, mel_spec)  # Avoid log(0)
-        
-        # Log mel spectrogram
-        log_mel_spec = np.log(mel_spec)
-        
-        # DCT to get MFCCs
-        mfccs = dct(log_mel_spec, axis=0, type=2, norm='ortho')[:n_mfcc]
-        
-        # Return mean across time
-        return np.mean(mfccs, axis=1)
+        return {
+            'energy': stream['energy'],
+            'zcr': stream['zcr'],
+            'pitch': pitch_hz,
+            'mfccs': stream['mfccs'],
+            'formants': self._estimate_formants(None, autocorr),
+            'spectral_centroid': stream['centroid'],
+            'spectral_bandwidth': stream['bandwidth'],
+            'spectral_rolloff': stream['rolloff'],
+            'hf_ratio': stream['hf_ratio'],
+            'pitch_variation': self._pitch_variation(),
+            'energy_variation': stream['energy_variation'],
+            'speaking_rate': self._estimate_speaking_rate()
+        }
     
-    def _mel_filterbank(self, n_mels, n_fft, sample_rate):
-        """Create mel filterbank"""
-        def hz_to_mel(hz):
-            return 2595 * np.log10(1 + hz / 700)
-        
-        def mel_to_hz(mel):
-            return 700 * (10**(mel / 2595) - 1)
-        
-        # Frequency range
-        low_freq_mel = 0
-        high_freq_mel = hz_to_mel(sample_rate / 2)
-        
-        # Mel points
-        mel_points = np.linspace(low_freq_mel, high_freq_mel, n_mels + 2)
-        hz_points = mel_to_hz(mel_points)
-        
-        # Bin indices
-        bin_points = np.floor((n_fft + 1) * hz_points / sample_rate).astype(int)
-        
-        # Create filterbank
-        filterbank = np.zeros((n_mels, n_fft // 2 + 1))
-        for i in range(1, n_mels + 1):
-            left = bin_points[i - 1]
-            center = bin_points[i]
-            right = bin_points[i + 1]
-            
-            for j in range(left, center):
-                filterbank[i - 1, j] = (j - left) / (center - left)
-            for j in range(center, right):
-                filterbank[i - 1, j] = (right - j) / (right - center)
-        
-        return filterbank
+    def _estimate_pitch(self, audio_data, autocorr=None):
+        """Estimate fundamental frequency (F0) using autocorrelation"""
+        # Autocorrelation peak over 50-500 Hz lags (shared or computed via rFFT)
+        return self.pitch_engine.estimate(audio_data, autocorr)
     
-    def _estimate_formants(self, audio_data):
+    def _estimate_formants(self, audio_data, autocorr=None):
         """Estimate formant frequencies (F1, F2, F3) using LPC"""
-        # LPC order (rule of thumb: sample_rate / 1000 + 2)
-        lpc_order = int(self.sample_rate / 1000) + 2
-        
-        try:
-            # Compute LPC coefficients
-            a = self._lpc(audio_data, lpc_order)
-            
-            # Find roots
-            roots = np.roots(a)
-            roots = roots[np.imag(roots) >= 0]  # Keep positive frequencies
-            
-            # Convert to Hz
-            angles = np.arctan2(np.imag(roots), np.real(roots))
-            freqs = sorted(angles * (self.sample_rate / (2 * np.pi)))
-            
-            # Extract first 3 formants
-            formants = freqs[:3] if len(freqs) >= 3 else freqs + [0] * (3 - len(freqs))
-            
-            return {'F1': formants[0], 'F2': formants[1] if len(formants) > 1 else 0, 
-                    'F3': formants[2] if len(formants) > 2 else 0}
-        except:
-            return {'F1': 500, 'F2': 1500, 'F3': 2500}  # Default formants
-    
-    def _lpc(self, signal, order):
-        """Linear Predictive Coding"""
-        n = len(signal)
-        
-        # Autocorrelation
-        r = np.correlate(signal, signal, mode='full')[n-1:n+order]
-        
-        # Levinson-Durbin recursion
-        a = np.zeros(order + 1)
-        a[0] = 1.0
-        e = r[0]
-        
-        for i in range(1, order + 1):
-            lambda_val = -np.sum(a[:i] * r[i:0:-1]) / e
-            a[1:i+1] += lambda_val * a[i-1::-1]
-            a[i] = lambda_val
-            e *= (1 - lambda_val ** 2)
-        
-        return a
-    
-    def _compute_spectral_features(self, audio_data):
-        """Compute spectral features"""
-        fft = np.abs(np.fft.fft(audio_data))
-        freqs = np.fft.fftfreq(len(fft), 1/self.sample_rate)
-        
-        positive_freqs = freqs[:len(freqs)//2]
-        positive_fft = fft[:len(fft)//2]
-        
-        # Spectral centroid
-        if np.sum(positive_fft) > 0:
-            centroid = np.sum(positive_freqs * positive_fft) / np.sum(positive_fft)
-        else:
-            centroid = 0
-        
-        # Spectral bandwidth
-        if np.sum(positive_fft) > 0:
-            bandwidth = np.sqrt(np.sum(((positive_freqs - centroid) ** 2) * positive_fft) / np.sum(positive_fft))
-        else:
-            bandwidth = 0
-        
-        # Spectral rolloff (85% of energy)
-        cumsum = np.cumsum(positive_fft)
-        rolloff_idx = np.where(cumsum >= 0.85 * cumsum[-1])[0]
-        rolloff = positive_freqs[rolloff_idx[0]] if len(rolloff_idx) > 0 else 0
-        
-        # High frequency ratio
-        mid = len(positive_fft) // 2
-        hf_energy = np.sum(positive_fft[mid:])
-        lf_energy = np.sum(positive_fft[:mid])
-        hf_ratio = hf_energy / (lf_energy + 1e-6)
-        
-        return {
-            'centroid': centroid,
-            'bandwidth': bandwidth,
-            'rolloff': rolloff,
-            'hf_ratio': hf_ratio
-        }
+        # LPC (order sample_rate / 1000 + 2) on lags 0..order of the autocorrelation
+        if autocorr is None:
+            autocorr = self.pitch_engine.autocorrelation(audio_data, self.lpc_order)
+        return self.formant_estimator.estimate(autocorr)
     
     def _compute_prosody(self, audio_data, pitch_hz):
         """Compute prosodic features"""
         # Pitch variation (jitter)
-        if len(self.feature_history) > 0:
-            recent_pitches = [f['pitch'] for f in self.feature_history]
-            pitch_variation = np.std(recent_pitches) / (np.mean(recent_pitches) + 1e-6)
-        else:
-            pitch_variation = 0
-        
-        # Energy variation (shimmer)
-        frame_size = len(audio_data) // 10
-        frame_energies = []
-        for i in range(0, len(audio_data) - frame_size, frame_size):
-            frame = audio_data[i:i+frame_size]
-            frame_energies.append(np.sqrt(np.mean(frame ** 2)))
-        
-        energy_variation = np.std(frame_energies) / (np.mean(frame_energies) + 1e-6) if len(frame_energies) > 0 else 0
+        pitch_variation = self._pitch_variation()
         
         return {
             'pitch_variation': pitch_variation,
-            'energy_variation': energy_variation
+            'energy_variation': energy_variation(audio_data, n_frames=10)  # Shimmer
         }
     
-    def _estimate_speaking_rate(self):
-        """Estimate speaking rate (syllables per second)"""
-        if len(self.speech_onsets) < 2:
-            return 3.0  # Default speaking rate
-        
-        # Count speech onsets in last 5 seconds
-        current_time = time.time()
-        recent_onsets = [t for t in self.speech_onsets if current_time - t < 5.0]
-        
-        if len(recent_onsets) < 2:
-            return 3.0
-        
-        duration = recent_onsets[-1] - recent_onsets[0]
-        rate = len(recent_onsets) / duration if duration > 0 else 3.0
-        
-        return np.clip(rate, 0.5, 10.0)
+    def _pitch_variation(self):
+        """Relative pitch spread (jitter) over the feature history"""
+        if len(self.feature_history) == 0:
+            return 0
+        recent_pitches = self.feature_history.column('pitch').astype(np.float64)
+        return np.std(recent_pitches) / (np.mean(recent_pitches) + 1e-6)
+    
+    def _estimate_speaking_rate(self, current_time=None):
+        """Estimate speaking rate (syllables per second) at current_time (default now)"""
+        # Speech onsets in the last 5 seconds (3.0 by default, clipped to 0.5-10)
+        current_time = time.time() if current_time is None else current_time
+        return self.speech_onsets.speaking_rate(current_time)
     
     def _classify_emotion_enhanced(self):
         """Enhanced emotion classification using all features"""
-        # Average features over recent history
-        recent = list(self.feature_history)[-5:]
-        
-        avg = {
-            'energy': np.mean([f['energy'] for f in recent]),
-            'zcr': np.mean([f['zcr'] for f in recent]),
-            'pitch': np.mean([f['pitch'] for f in recent]),
-            'mfcc_1': np.mean([f['mfccs'][1] for f in recent]),
-            'mfcc_2': np.mean([f['mfccs'][2] for f in recent]),
-            'f1': np.mean([f['formants']['F1'] for f in recent]),
-            'f2': np.mean([f['formants']['F2'] for f in recent]),
-            'centroid': np.mean([f['spectral_centroid'] for f in recent]),
-            'bandwidth': np.mean([f['spectral_bandwidth'] for f in recent]),
-            'hf_ratio': np.mean([f['hf_ratio'] for f in recent]),
-            'pitch_var': np.mean([f['pitch_variation'] for f in recent]),
-            'energy_var': np.mean([f['energy_variation'] for f in recent]),
-            'speaking_rate': np.mean([f['speaking_rate'] for f in recent])
-        }
-        
-        # Normalize energy
-        energy_ratio = avg['energy'] / self.energy_threshold
-        
-        # === Enhanced Classification Rules ===
-        
-        # ANGRY: Loud, harsh, sharp, high tension
-        # Characteristics: High energy, high F2, high HF ratio, high variation
-        angry_score = 0
-        if energy_ratio > 2.5:
-            angry_score += 0.3
-        if avg['hf_ratio'] > 0.6:
-            angry_score += 0.25
-        if avg['f2'] > 1800:
-            angry_score += 0.2
-        if avg['energy_var'] > 0.15:
-            angry_score += 0.15
-        if avg['mfcc_2'] > 10:
-            angry_score += 0.1
-        
-        # HAPPY: Energetic, bright, varied pitch
-        # Characteristics: High energy, high pitch, high centroid, moderate variation
-        happy_score = 0
-        if energy_ratio > 1.8:
-            happy_score += 0.25
-        if avg['pitch'] > 160:
-            happy_score += 0.25
-        if avg['centroid'] > 1200:
-            happy_score += 0.2
-        if 0.05 < avg['pitch_var'] < 0.15:
-            happy_score += 0.15
-        if avg['speaking_rate'] > 3.5:
-            happy_score += 0.15
-        
-        # SAD: Quiet, low, monotonous
-        # Characteristics: Low energy, low pitch, narrow bandwidth, low variation
-        sad_score = 0
-        if energy_ratio < 2.0:
-            sad_score += 0.3
-        if avg['pitch'] < 150:
-            sad_score += 0.25
-        if avg['bandwidth'] < 800:
-            sad_score += 0.2
-        if avg['pitch_var'] < 0.05:
-            sad_score += 0.15
-        if avg['speaking_rate'] < 2.5:
-            sad_score += 0.1
-        
-        # FEAR: Tense, trembling, irregular
-        # Characteristics: High variation, high ZCR, irregular patterns
-        fear_score = 0
-        if avg['zcr'] > 0.18:
-            fear_score += 0.3
-        if avg['pitch_var'] > 0.18:
-            fear_score += 0.25
-        if avg['energy_var'] > 0.20:
-            fear_score += 0.25
-        if avg['hf_ratio'] > 0.65:
-            fear_score += 0.2
-        
-        # Determine dominant emotion
-        scores = {
-            'angry': angry_score,
-            'happy': happy_score,
-            'sad': sad_score,
-            'fear': fear_score,
-            'neutral': 0.4  # Baseline
-        }
-        
-        emotion = max(scores, key=scores.get)
-        confidence = min(scores[emotion] + 0.3, 0.95)  # Boost confidence, cap at 95%
+        # Average features over recent history, plus the normalized energy
+        avg = self.feature_history.mean(5)
+        features = np.append(avg, avg[self.feature_history.columns['energy']] / self.energy_threshold)
+        
+        # Score every rule at once and sum the weights per emotion
+        values = features[self.rule_features]
+        matched = (self.rule_lower < values) & (values < self.rule_upper)
+        scores = np.bincount(self.rule_emotions, weights=self.rule_weights * matched,
+                             minlength=len(self.emotion_labels))
+        scores[-1] = 0.4  # Neutral baseline
+        
+        # Determine dominant emotion (ties go to the earlier label)
+        best = int(np.argmax(scores))
+        emotion = self.emotion_labels[best]
+        confidence = min(scores[best] + 0.3, 0.95)  # Boost confidence, cap at 95%
         
         # Require minimum threshold
-        if scores[emotion] < 0.5:
+        if scores[best] < 0.5:
             return "neutral", 0.70
         
         return emotion, confidence
@@ -600,6 +724,8 @@ class SpeechEmotionDetector:
             speech_ratio = 0
         
         avg_processing = np.mean(self.processing_times) * 1000 if len(self.processing_times) > 0 else 0
+        avg_latency = np.mean(self.latencies) * 1000 if len(self.latencies) > 0 else 0
+        speech_active = np.mean(self.speech_ratios) if len(self.speech_ratios) > 0 else 0
         
         return {
             'total_chunks': self.total_chunks_processed,
@@ -611,5 +737,20 @@ class SpeechEmotionDetector:
             'calibrated': self.is_calibrated,
             'threshold': self.energy_threshold,
             'avg_processing_ms': avg_processing,
+            'avg_latency_ms': avg_latency,
+            'speech_active_ratio': speech_active,
             'features_tracked': len(self.feature_history)
         }
+
+# Detector owned by each offline feature worker process
+_feature_worker = None
+
+def _init_feature_worker(sample_rate, chunk_duration, energy_threshold):
+    """Create the worker's detector once per process (with the calibrated VAD threshold)"""
+    global _feature_worker
+    _feature_worker = SpeechEmotionDetector(sample_rate, chunk_duration, verbose=False)
+    _feature_worker.energy_threshold = energy_threshold
+
+def _extract_segment_features(segment, offsets, voiced_starts):
+    """Extract features for the windows starting at offsets within one audio segment"""
+    return _feature_worker._extract_window_batch(segment, offsets, voiced_starts)
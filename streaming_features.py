@@ -0,0 +1,305 @@
+"""
+Streaming Audio Feature Extraction
+Turns each new hop of audio into fixed-size frame features (energy, zero
+crossings, power spectrum, cross-frame lag terms, log-mel) kept in a ring
+covering one analysis window
+Window-level features are rolling aggregates, so cost follows new audio, not
+window size; only the spectral shape takes one rFFT of the window per query
+Voice activity runs on its own 20 ms grid, like the per-window extraction:
+samples of rejected VAD frames are zeroed before the spectral and
+autocorrelation sums, and only feature frames centred on a voiced sample
+enter the MFCC sums
+"""
+
+import numpy as np
+from spectral_frontend import SpectralFrontend
+from voice_activity import FrameVAD
+
+class StreamingFeatureExtractor:
+    def __init__(self, sample_rate=16000, window_samples=24000, frame_length=512, max_lag=319,
+                 pre_emphasis=0.97, n_mels=40, n_mfcc=13, energy_groups=10, max_voiced_zcr=0.3,
+                 vad_frame_duration=0.02):
+        """
+        Initialize the streaming extractor
+        
+        Frames do not overlap, so energy and zero-crossing totals are exact
+        over the frames in the window. The autocorrelation adds the lag
+        products that straddle frame boundaries, so it is exactly the
+        autocorrelation of the window's num_frames * frame_length samples
+        (with the samples of unvoiced VAD frames zeroed, when update() is
+        given an energy threshold).
+        
+        Args:
+            sample_rate: Audio sampling rate
+            window_samples: Analysis window length (e.g. chunk_samples)
+            frame_length: Frame length in samples (also the MFCC FFT size)
+            max_lag: Largest autocorrelation lag (must be below frame_length)
+            pre_emphasis: Pre-emphasis coefficient applied across hops
+            n_mels: Number of mel bands
+            n_mfcc: Number of cepstral coefficients
+            energy_groups: Sub-windows used for the energy variation measure
+            max_voiced_zcr: Highest zero-crossing rate of a voiced frame
+            vad_frame_duration: VAD frame length in seconds (the per-window
+                                extraction's FrameVAD uses 20 ms)
+        """
+        self.sample_rate = sample_rate
+        self.frame_length = frame_length
+        self.max_lag = min(max_lag, frame_length - 1)
+        self.pre_emphasis = pre_emphasis
+        self.energy_groups = energy_groups
+        
+        self.frontend = SpectralFrontend(sample_rate, max_lag=self.max_lag, n_fft=frame_length,
+                                         n_mels=n_mels, n_mfcc=n_mfcc)
+        self.mfcc_frontend = self.frontend.mfcc_frontend
+        
+        # Voice activity on its own grid, over the window's last window_samples
+        self.vad = FrameVAD(sample_rate, vad_frame_duration, max_voiced_zcr)
+        self.vad_length = self.vad.frame_length
+        self.num_vad_frames = max(window_samples // self.vad_length, 1)
+        self.vad_flags = np.zeros((self.num_vad_frames, 2), dtype=bool)  # active, voiced
+        
+        # Zero padding to twice the frame keeps per-frame autocorrelation linear
+        self.fft_size = 2 * frame_length
+        self.num_frames = max(window_samples // frame_length, 1)
+        
+        # Frame feature ring (one row per frame) and its running column sums
+        K = self.num_frames
+        self.rings = {
+            'sumsq': np.zeros(K),
+            'crossings': np.zeros(K),
+            'mfcc_frames': np.zeros(K),
+            'power': np.zeros((K, self.fft_size // 2 + 1)),
+            'cross': np.zeros((K, self.max_lag + 1)),
+            'log_mel': np.zeros((K, n_mels))
+        }
+        self.sums = {name: np.zeros(ring.shape[1:]) for name, ring in self.rings.items()}
+        
+        # Emphasized samples, unvoiced ones zeroed, for the spectral shape
+        self.samples = np.zeros((K, frame_length))
+        
+        self.reset()
+    
+    def reset(self):
+        """Forget all audio (e.g. when recording restarts)"""
+        for name, ring in self.rings.items():
+            ring[:] = 0
+            self.sums[name][...] = 0
+        self.samples[:] = 0
+        self.index = 0
+        self.count = 0
+        self.frames_processed = 0
+        
+        self.vad_flags[:] = False
+        self.vad_index = 0
+        self.vad_count = 0
+        
+        self.vad_pending = np.zeros(0)
+        self.pending = np.zeros(0)
+        self.pending_gate = np.zeros(0, dtype=bool)
+        self.last_sample = 0.0
+        self.last_sign = None
+        self.last_spectrum = None
+    
+    def update(self, samples, energy_threshold=None):
+        """
+        Add newly captured samples; complete frames are analyzed right away
+        
+        Samples wait until their VAD frame is complete, so a feature frame is
+        analyzed at most one VAD frame after it fills.
+        
+        Args:
+            samples: 1-D array of new raw samples
+            energy_threshold: VAD frame RMS above which a frame is active;
+                              only active, low-ZCR (voiced) VAD frames feed
+                              the heavy features. None treats all audio as voiced.
+        """
+        if len(samples) == 0:
+            return
+        
+        x = np.asarray(samples, dtype=np.float64)
+        data = np.concatenate((self.vad_pending, x)) if len(self.vad_pending) else x
+        n = len(data) // self.vad_length * self.vad_length
+        self.vad_pending = data[n:]
+        if n == 0:
+            return
+        block = data[:n]
+        
+        # Pre-emphasis continues across hops
+        emphasized = np.empty_like(block)
+        emphasized[0] = block[0] - self.pre_emphasis * self.last_sample
+        emphasized[1:] = block[1:] - self.pre_emphasis * block[:-1]
+        self.last_sample = block[-1]
+        
+        if energy_threshold is None:
+            active = voiced = np.ones(n // self.vad_length, dtype=bool)
+        else:
+            vad = self.vad.analyze(block, energy_threshold)
+            active, voiced = vad['active'], vad['voiced']
+        self._add_vad_frames(active, voiced)
+        
+        # Per-sample voicing travels with the samples into the feature frames
+        data = np.concatenate((self.pending, emphasized))
+        gate = np.concatenate((self.pending_gate, np.repeat(voiced, self.vad_length)))
+        m = len(data) // self.frame_length
+        self.pending = data[m * self.frame_length:]
+        self.pending_gate = gate[m * self.frame_length:]
+        if m == 0:
+            return
+        
+        # Only the newest frames can stay in the window
+        frames = data[:m * self.frame_length].reshape(m, self.frame_length)[-self.num_frames:]
+        gate = gate[:m * self.frame_length].reshape(m, self.frame_length)[-self.num_frames:]
+        self._add_frames(frames, gate)
+    
+    def _add_vad_frames(self, active, voiced):
+        """Push VAD decisions into the VAD ring"""
+        flags = np.column_stack((active, voiced))[-self.num_vad_frames:]
+        rows = (self.vad_index + np.arange(len(flags))) % self.num_vad_frames
+        self.vad_flags[rows] = flags
+        self.vad_index = (self.vad_index + len(flags)) % self.num_vad_frames
+        self.vad_count = min(self.vad_count + len(flags), self.num_vad_frames)
+    
+    def _add_frames(self, frames, gate):
+        """
+        Analyze a batch of frames and push them into the ring
+        
+        Args:
+            frames: (m, frame_length) emphasized samples
+            gate: (m, frame_length) per-sample voicing; other samples are
+                  zeroed for the spectrum and autocorrelation, and frames
+                  without voiced samples skip the FFT
+        """
+        m = len(frames)
+        
+        # Zero crossings, including the step from the previous frame
+        signs = np.sign(frames)
+        previous = np.empty(m)
+        previous[1:] = signs[:-1, -1]
+        previous[0] = signs[0, 0] if self.last_sign is None else self.last_sign
+        self.last_sign = signs[-1, -1]
+        crossings = np.sum(np.abs(np.diff(signs, axis=1)), axis=1) + np.abs(signs[:, 0] - previous)
+        
+        # Frames without voiced samples keep a zero spectrum (and zero rows below)
+        gated = np.where(gate, frames, 0.0)
+        voiced = gate.any(axis=1)
+        spectrum = np.zeros((m, self.fft_size // 2 + 1), dtype=complex)
+        spectrum[voiced] = np.fft.rfft(gated[voiced], self.fft_size, axis=1)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        
+        # Lag products x[n] x[n - k] with n in this frame and n - k in the
+        # previous one: entry L - k of the frames' cross-correlation (zero
+        # unless both frames have voiced samples)
+        preceding = np.empty_like(spectrum)
+        preceding[1:] = spectrum[:-1]
+        preceding_voiced = np.empty(m, dtype=bool)
+        preceding_voiced[1:] = voiced[:-1]
+        if self.last_spectrum is None:
+            preceding_voiced[0] = False
+        else:
+            preceding[0] = self.last_spectrum
+            preceding_voiced[0] = True
+        self.last_spectrum = spectrum[-1] if voiced[-1] else None
+        
+        pairs = voiced & preceding_voiced
+        lagged = np.fft.irfft(np.conj(spectrum[pairs]) * preceding[pairs], self.fft_size, axis=1)
+        cross = np.zeros((m, self.max_lag + 1))
+        L = self.frame_length
+        cross[pairs, 1:] = lagged[:, L - self.max_lag:L][:, ::-1]
+        
+        # MFCC frames centred on a voiced sample, as in the per-window extraction
+        centred = gate[:, self.frame_length // 2]
+        log_mel = np.zeros((m, self.mfcc_frontend.n_mels))
+        log_mel[centred] = self.mfcc_frontend.log_mel(self.mfcc_frontend.frame_power(frames[centred]).T).T
+        
+        features = {
+            'sumsq': np.sum(frames ** 2, axis=1),
+            'crossings': crossings,
+            'mfcc_frames': centred,
+            'power': power,
+            'cross': cross,
+            'log_mel': log_mel
+        }
+        
+        rows = (self.index + np.arange(m)) % self.num_frames
+        self.samples[rows] = gated
+        for name, ring in self.rings.items():
+            evicted = ring[rows]
+            if self.count + m > self.num_frames:
+                self.sums[name] -= evicted[max(self.num_frames - self.count, 0):].sum(axis=0)
+            ring[rows] = features[name]
+            self.sums[name] += features[name].sum(axis=0)
+        
+        wrapped = self.index + m >= self.num_frames
+        self.index = (self.index + m) % self.num_frames
+        self.count = min(self.count + m, self.num_frames)
+        self.frames_processed += m
+        
+        # Re-sum once per ring cycle so running sums never drift
+        if wrapped:
+            for name, ring in self.rings.items():
+                self.sums[name][...] = ring[:self.count].sum(axis=0)
+    
+    def is_ready(self):
+        """True once a full window of frames has been seen"""
+        return self.count == self.num_frames
+    
+    def voice_activity(self):
+        """
+        Voice activity over the VAD frames of the last window_samples
+        
+        Returns:
+            tuple: (fraction of active VAD frames, number of samples in voiced VAD frames)
+        """
+        if self.vad_count == 0:
+            return 0.0, 0
+        flags = self.vad_flags[:self.vad_count]
+        return float(np.mean(flags[:, 0])), int(np.count_nonzero(flags[:, 1])) * self.vad_length
+    
+    def get_features(self):
+        """
+        Window-level features from the frames in the ring
+        
+        Returns:
+            dict: 'energy', 'zcr' and 'energy_variation' over all frames;
+                  'autocorr' (lags 0..max_lag), 'centroid', 'bandwidth',
+                  'rolloff' and 'hf_ratio' of the window with the samples of
+                  unvoiced VAD frames zeroed in place, and 'mfccs' over the
+                  frames centred on voiced samples (as in the per-window
+                  extraction); None before the first complete frame
+        """
+        n_frames = self.count
+        if n_frames == 0:
+            return None
+        
+        L = self.frame_length
+        total = n_frames * L
+        
+        # Within-frame lag products, plus those straddling frame boundaries
+        # (except the oldest frame's, whose partner frame has left the window)
+        oldest = (self.index - n_frames) % self.num_frames
+        autocorr = np.fft.irfft(self.sums['power'], self.fft_size)[:self.max_lag + 1]
+        autocorr += self.sums['cross'] - self.rings['cross'][oldest]
+        
+        # Frame magnitudes do not add up to the window's, so the shape takes one rFFT
+        order = (self.index - n_frames + np.arange(n_frames)) % self.num_frames
+        spectrum = np.fft.rfft(self.samples[order].ravel())
+        features = self.frontend.spectral_shape(np.abs(spectrum[:total // 2]), total)
+        
+        n_voiced = max(self.sums['mfcc_frames'], 1)
+        features.update({
+            'energy': np.sqrt(self.sums['sumsq'] / total),
+            'zcr': self.sums['crossings'] / (2 * total),
+            'autocorr': autocorr,
+            'mfccs': self.mfcc_frontend.dct_matrix @ (self.sums['log_mel'] / n_voiced),
+            'energy_variation': self._energy_variation()
+        })
+        return features
+    
+    def _energy_variation(self):
+        """Relative spread of sub-window RMS values (shimmer) over the window"""
+        # Frames in chronological order
+        order = (self.index - self.count + np.arange(self.count)) % self.num_frames
+        groups = [group for group in np.array_split(self.rings['sumsq'][order], self.energy_groups)
+                  if len(group) > 0]
+        rms = np.sqrt([np.mean(group) / self.frame_length for group in groups])
+        return np.std(rms) / (np.mean(rms) + 1e-6)
@@ -46,7 +46,8 @@ class StressAnalyzer:
         print(f"   - History size: {history_size}")
         print(f"   - Context awareness: {'Enabled' if enable_context else 'Disabled'}")
         
-    def analyze_stress(self, face_emotion, face_confidence, speech_emotion, speech_confidence):
+    def analyze_stress(self, face_emotion, face_confidence, speech_emotion, speech_confidence,
+                       timestamp=None):
         """
         Comprehensive stress analysis with context awareness
         
@@ -55,10 +56,14 @@ class StressAnalyzer:
             face_confidence: confidence of face emotion (0-1)
             speech_emotion: detected speech emotion  
             speech_confidence: confidence of speech emotion (0-1)
+            timestamp: Time of the observation (epoch seconds); defaults to now.
+                Offline analysis passes media time so context is based on the recording
             
         Returns:
             tuple: (stress_level, stress_score, analysis_details)
         """
+        now = time.time() if timestamp is None else timestamp
+        
         # Calculate individual stress scores
         face_stress_score = self._get_emotion_stress_score(face_emotion, face_confidence)
         speech_stress_score = self._get_emotion_stress_score(speech_emotion, speech_confidence)
@@ -83,7 +88,7 @@ class StressAnalyzer:
         
         # Context-aware adjustment
         if self.enable_context:
-            smoothed_score = self._apply_context_awareness(smoothed_score)
+            smoothed_score = self._apply_context_awareness(smoothed_score, now)
         
         # Determine stress level
         stress_level = self._get_stress_level(smoothed_score)
@@ -93,7 +98,7 @@ class StressAnalyzer:
         self.stress_pattern_buffer.append(smoothed_score)
         
         # Track stress events
-        self._track_stress_events(smoothed_score, stress_level)
+        self._track_stress_events(smoothed_score, stress_level, now)
         
         # Create comprehensive analysis details
         analysis_details = {
@@ -112,7 +117,7 @@ class StressAnalyzer:
                 'speech': self.speech_weight
             },
             'confidence_metrics': self._get_confidence_metrics(),
-            'context_info': self._get_context_info() if self.enable_context else {}
+            'context_info': self._get_context_info(now) if self.enable_context else {}
         }
         
         return stress_level, smoothed_score, analysis_details
@@ -263,21 +268,24 @@ class StressAnalyzer:
         
         return np.clip(smoothed, 0.0, 1.0)
     
-    def _apply_context_awareness(self, stress_score):
+    def _apply_context_awareness(self, stress_score, now=None):
         """
         Apply context-aware adjustments based on temporal patterns
         
         Args:
             stress_score: Current stress score
+            now: Observation time (epoch seconds), defaults to the current time
             
         Returns:
             float: Context-adjusted stress score
         """
+        now = time.time() if now is None else now
+        
         # Session duration context
-        session_duration = (time.time() - self.session_start_time) / 60  # minutes
+        session_duration = (now - self.session_start_time) / 60  # minutes
         
         # Time-of-day context (circadian rhythm)
-        current_hour = datetime.now().hour
+        current_hour = datetime.fromtimestamp(now).hour
         
         # Morning fatigue (6-9 AM) - slight stress increase
         if 6 <= current_hour <= 9 and session_duration < 30:
@@ -335,9 +343,9 @@ class StressAnalyzer:
         else:
             return 'stable'
     
-    def _track_stress_events(self, stress_score, stress_level):
+    def _track_stress_events(self, stress_score, stress_level, now=None):
         """Track significant stress events and recovery periods"""
-        current_time = time.time()
+        current_time = time.time() if now is None else now
         
         # Track high stress events
         if stress_score > 0.75:
@@ -415,10 +423,11 @@ class StressAnalyzer:
             'fusion_quality': 'high' if overall > 0.6 else 'medium' if overall > 0.4 else 'low'
         }
     
-    def _get_context_info(self):
+    def _get_context_info(self, now=None):
         """Get contextual information about current session"""
-        session_duration = (time.time() - self.session_start_time) / 60
-        current_hour = datetime.now().hour
+        now = time.time() if now is None else now
+        session_duration = (now - self.session_start_time) / 60
+        current_hour = datetime.fromtimestamp(now).hour
         
         # Determine time period
         if 6 <= current_hour < 12:
@@ -496,8 +505,13 @@ class StressAnalyzer:
             'context': self._get_context_info() if self.enable_context else {}
         }
     
-    def reset_history(self):
-        """Reset all histories"""
+    def reset_history(self, session_start_time=None):
+        """
+        Reset all histories
+        
+        Args:
+            session_start_time: Start of the new session (epoch seconds), defaults to now
+        """
         self.face_emotion_history.clear()
         self.speech_emotion_history.clear()
         self.stress_history.clear()
@@ -506,5 +520,5 @@ class StressAnalyzer:
         self.stress_pattern_buffer.clear()
         self.stress_events.clear()
         self.recovery_periods.clear()
-        self.session_start_time = time.time()
+        self.session_start_time = time.time() if session_start_time is None else session_start_time
         print("✅ Stress analyzer history reset")
@@ -0,0 +1,96 @@
+"""
+Audio Ring Buffer Test
+Checks AudioRingBuffer against the original Python-list capture buffer
+(extend, trim to the newest samples, copy the latest window)
+"""
+
+import threading
+import time
+import numpy as np
+from audio_buffer import AudioRingBuffer
+
+CAPACITY = 5000
+
+def legacy_write(buffer, samples, max_buffer=CAPACITY):
+    """Original audio_callback(): extend a list and keep the newest max_buffer samples"""
+    buffer.extend(samples)
+    if len(buffer) > max_buffer:
+        buffer = buffer[-max_buffer:]
+    return buffer
+
+def test_latest_matches_list():
+    """latest(n) equals the newest n list entries for any block sizes, including wrap-around"""
+    print("\n🔁 latest() vs list buffer")
+    rng = np.random.default_rng(0)
+    ring = AudioRingBuffer(CAPACITY)
+    legacy = []
+    
+    for _ in range(400):
+        block = rng.standard_normal(rng.integers(1, 2 * CAPACITY // 3)).astype(np.float32)
+        ring.write(block)
+        legacy = legacy_write(legacy, block.tolist())
+        
+        assert len(ring) == len(legacy)
+        for n in (1, 2048, len(legacy)):
+            if n <= len(legacy):
+                assert np.array_equal(ring.latest(n), np.array(legacy[-n:], dtype=np.float32))
+    assert ring.latest(CAPACITY + 1) is None
+    print(f"   ✅ 400 writes, {ring.total_written} samples, all windows match")
+
+def test_since_reassembles_stream():
+    """Consecutive since() reads return every sample exactly once"""
+    print("\n🧵 since() reassembles the stream")
+    rng = np.random.default_rng(1)
+    ring = AudioRingBuffer(CAPACITY)
+    stream = rng.standard_normal(50000).astype(np.float32)
+    
+    position, pieces, start = 0, [], 0
+    while start < len(stream):
+        size = int(rng.integers(1, 3000))
+        ring.write(stream[start:start + size])
+        start += size
+        new_samples, position = ring.since(position)
+        pieces.append(np.array(new_samples))
+    
+    assert position == len(stream)
+    assert np.array_equal(np.concatenate(pieces), stream)
+    print(f"   ✅ {len(pieces)} reads, {position} samples")
+
+def test_views_are_read_only():
+    """Readers get views that cannot modify the buffer"""
+    print("\n🔒 Read-only views")
+    ring = AudioRingBuffer(CAPACITY)
+    ring.write(np.ones(100, dtype=np.float32))
+    view = ring.latest(50)
+    try:
+        view[0] = 0
+    except ValueError:
+        print("   ✅ write to view rejected")
+    else:
+        raise AssertionError("view is writable")
+
+def test_wait_for_and_clear():
+    """wait_for() wakes when a writer reaches the position and times out otherwise"""
+    print("\n⏰ wait_for() and clear()")
+    ring = AudioRingBuffer(CAPACITY)
+    writer = threading.Timer(0.05, ring.write, args=(np.zeros(3000, dtype=np.float32),))
+    writer.start()
+    started = time.perf_counter()
+    assert ring.wait_for(3000, timeout=2.0)
+    waited = time.perf_counter() - started
+    assert not ring.wait_for(6000, timeout=0.05)
+    writer.join()
+    
+    ring.clear()
+    assert len(ring) == 0 and ring.latest(1) is None and ring.last_write_time is None
+    print(f"   ✅ woke after {waited * 1000:.0f} ms, timeout and clear work")
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print(" AUDIO RING BUFFER TEST")
+    print("=" * 70)
+    test_latest_matches_list()
+    test_since_reassembles_stream()
+    test_views_are_read_only()
+    test_wait_for_and_clear()
+    print("\n" + "=" * 70)
@@ -0,0 +1,79 @@
+"""
+Face Track Registry Test
+Checks box IoU and that FaceTrackRegistry keeps stable track IDs for moving
+faces, in any detection order, and ages out lost faces
+"""
+
+from face_registry import FaceTrackRegistry, box_iou
+
+def test_box_iou():
+    """IoU of identical, disjoint and half-overlapping boxes"""
+    print("\n📐 box_iou()")
+    assert box_iou((0, 0, 10, 10), (0, 0, 10, 10)) == 1.0
+    assert box_iou((0, 0, 10, 10), (20, 0, 10, 10)) == 0.0
+    assert box_iou((0, 0, 10, 10), (10, 0, 10, 10)) == 0.0
+    assert abs(box_iou((0, 0, 10, 10), (5, 0, 10, 10)) - 50 / 150) < 1e-12
+    print("   ✅ identical, disjoint, touching and overlapping boxes")
+
+def test_ids_stable_across_frames():
+    """Two faces drifting across the frame keep their IDs, whatever the detection order"""
+    print("\n🆔 Stable track IDs")
+    registry = FaceTrackRegistry(iou_threshold=0.3)
+    first = registry.update([(50, 60, 80, 80), (300, 70, 90, 90)])
+    left_id, right_id = first[0].track_id, first[1].track_id
+    assert left_id != right_id
+    
+    for step in range(1, 30):
+        left = (50 + 4 * step, 60 + step, 80, 80)
+        right = (300 - 3 * step, 70, 90, 90)
+        boxes = [left, right] if step % 2 else [right, left]
+        tracks = registry.update(boxes)
+        ids = dict(zip(boxes, (track.track_id for track in tracks)))
+        assert ids[left] == left_id and ids[right] == right_id, step
+    assert len(registry.tracks) == 2 and registry.tracks[left_id].hits == 30
+    print(f"   ✅ tracks #{left_id} and #{right_id} kept for 30 frames")
+
+def test_new_and_lost_faces():
+    """A new face gets a new ID; a face missing for too long is dropped"""
+    print("\n👋 New and lost faces")
+    registry = FaceTrackRegistry(iou_threshold=0.3, max_missed_frames=2)
+    face = (100, 100, 60, 60)
+    track_id = registry.update([face])[0].track_id
+    
+    # Briefly missed: the track survives and is picked up again
+    registry.update([])
+    registry.update([])
+    assert registry.update([face])[0].track_id == track_id
+    
+    # A second face far away starts its own track
+    other = registry.update([face, (400, 100, 60, 60)])[1]
+    assert other.track_id != track_id
+    
+    # Missed for longer than max_missed_frames: gone, and a return gets a fresh ID
+    for _ in range(3):
+        registry.update([])
+    assert not registry.tracks
+    assert registry.update([face])[0].track_id not in (track_id, other.track_id)
+    
+    registry.reset()
+    assert not registry.tracks
+    print("   ✅ short gaps bridged, long gaps start new tracks")
+
+def test_greedy_best_overlap_first():
+    """When two boxes overlap one track, the better match keeps the ID"""
+    print("\n🤝 Greedy IoU matching")
+    registry = FaceTrackRegistry(iou_threshold=0.3)
+    track_id = registry.update([(100, 100, 100, 100)])[0].track_id
+    tracks = registry.update([(130, 100, 100, 100), (105, 100, 100, 100)])
+    assert tracks[1].track_id == track_id and tracks[0].track_id != track_id
+    print("   ✅ closest box continues the track")
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print(" FACE TRACK REGISTRY TEST")
+    print("=" * 70)
+    test_box_iou()
+    test_ids_stable_across_frames()
+    test_new_and_lost_faces()
+    test_greedy_best_overlap_first()
+    print("\n" + "=" * 70)
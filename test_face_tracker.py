@@ -0,0 +1,56 @@
+"""
+Face Tracker Test
+Checks that the optical-flow FaceTracker follows a moving textured face box
+and drops the track when the face disappears
+"""
+
+import cv2
+import numpy as np
+from face_tracker import FaceTracker
+
+FRAME_SHAPE = (240, 320)
+
+def make_frame(x, y, size=80):
+    """Gray frame with a blurred random texture patch (the 'face') at (x, y)"""
+    frame = np.full(FRAME_SHAPE, 90, dtype=np.uint8)
+    patch = np.random.default_rng(0).integers(0, 256, (size, size), dtype=np.uint8)
+    frame[y:y + size, x:x + size] = cv2.GaussianBlur(patch, (5, 5), 1.0)
+    return cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+
+def test_follows_moving_face():
+    """The tracked box follows the patch to within a couple of pixels"""
+    print("\n🎯 Optical-flow tracking of a moving patch")
+    tracker = FaceTracker(tracker_type='optical_flow')
+    assert tracker.init(make_frame(60, 50), (60, 50, 80, 80))
+    
+    worst = 0
+    for step in range(1, 16):
+        x, y = 60 + 3 * step, 50 + 2 * step
+        box, confidence = tracker.update(make_frame(x, y))
+        assert box is not None and confidence > 0.5, step
+        worst = max(worst, abs(box[0] - x), abs(box[1] - y), abs(box[2] - 80), abs(box[3] - 80))
+    assert worst <= 2, worst
+    print(f"   ✅ 15 frames, max box error {worst} px")
+
+def test_lost_and_invalid_tracks():
+    """A vanished face resets the tracker; empty or textureless boxes do not start one"""
+    print("\n🚫 Lost and invalid tracks")
+    tracker = FaceTracker(tracker_type='optical_flow')
+    assert tracker.init(make_frame(60, 50), (60, 50, 80, 80))
+    
+    blank = np.full(FRAME_SHAPE + (3,), 90, dtype=np.uint8)
+    assert tracker.update(blank) == (None, 0.0)
+    assert not tracker.is_active
+    assert tracker.update(make_frame(60, 50)) == (None, 0.0)
+    
+    assert not tracker.init(make_frame(60, 50), (60, 50, 0, 80))
+    assert not tracker.init(blank, (60, 50, 80, 80))
+    print("   ✅ track dropped, empty and flat boxes rejected")
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print(" FACE TRACKER TEST")
+    print("=" * 70)
+    test_follows_moving_face()
+    test_lost_and_invalid_tracks()
+    print("\n" + "=" * 70)
@@ -0,0 +1,79 @@
+"""
+Feature History Test
+Checks FeatureHistory against the original deque of feature dictionaries
+averaged with per-feature list comprehensions
+"""
+
+from collections import deque
+import numpy as np
+from feature_history import FeatureHistory
+
+def make_features(rng):
+    """One chunk's feature dictionary with realistic ranges"""
+    return {
+        'energy': rng.uniform(0, 0.1), 'zcr': rng.uniform(0, 0.3), 'pitch': rng.uniform(80, 250),
+        'mfccs': rng.normal(0, 10, 13),
+        'formants': {'F1': rng.uniform(0, 900), 'F2': rng.uniform(0, 2500), 'F3': rng.uniform(0, 3500)},
+        'spectral_centroid': rng.uniform(500, 2000), 'spectral_bandwidth': rng.uniform(400, 1200),
+        'spectral_rolloff': rng.uniform(0, 8000), 'hf_ratio': rng.uniform(0, 1),
+        'pitch_variation': rng.uniform(0, 0.3), 'energy_variation': rng.uniform(0, 0.3),
+        'speaking_rate': rng.uniform(1, 5)
+    }
+
+def legacy_average(history, n=5):
+    """Original averaging over the last n feature dictionaries"""
+    recent = list(history)[-n:]
+    average = {name: np.mean([f[name] for f in recent])
+               for name in FeatureHistory.LEADING + FeatureHistory.TRAILING}
+    for i in range(13):
+        average[f'mfcc_{i}'] = np.mean([f['mfccs'][i] for f in recent])
+    for name in FeatureHistory.FORMANTS:
+        average[name] = np.mean([f['formants'][name] for f in recent])
+    return average
+
+def test_mean_matches_dict_averaging():
+    """mean(5) equals the dictionary averages (float32 storage tolerance) through wrap-around"""
+    print("\n📊 mean() vs dictionary averaging")
+    rng = np.random.default_rng(0)
+    history = FeatureHistory(capacity=15, n_mfcc=13)
+    legacy = deque(maxlen=15)
+    
+    for _ in range(40):
+        features = make_features(rng)
+        history.append(features)
+        legacy.append(features)
+        
+        average = legacy_average(legacy)
+        means = history.mean(5)
+        for name, column in history.columns.items():
+            assert np.isclose(means[column], average[name], rtol=1e-6, atol=1e-6), name
+        
+        pitches = [f['pitch'] for f in legacy]
+        assert np.allclose(history.column('pitch'), pitches, rtol=1e-6)
+    assert len(history) == 15
+    print(f"   ✅ 40 appends, {len(history.names)} columns match")
+
+def test_recent_order_and_clear():
+    """recent() is chronological across the ring boundary; clear() empties it"""
+    print("\n🔁 recent() order and clear()")
+    rng = np.random.default_rng(1)
+    history = FeatureHistory(capacity=4, n_mfcc=13)
+    appended = [make_features(rng) for _ in range(6)]
+    for features in appended:
+        history.append(features)
+    
+    energies = history.recent()[:, history.columns['energy']]
+    assert np.allclose(energies, [f['energy'] for f in appended[-4:]])
+    assert np.allclose(history.recent(2)[:, history.columns['energy']], energies[-2:])
+    
+    history.clear()
+    assert len(history) == 0 and len(history.recent()) == 0
+    print("   ✅ newest 4 rows in order, clear() works")
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print(" FEATURE HISTORY TEST")
+    print("=" * 70)
+    test_mean_matches_dict_averaging()
+    test_recent_order_and_clear()
+    print("\n" + "=" * 70)
@@ -0,0 +1,57 @@
+"""
+Formant Estimator Test
+Checks FormantEstimator against the original Levinson-Durbin + np.roots search
+"""
+
+import numpy as np
+from benchmark_formants import LPC_ORDER, SAMPLE_RATE, legacy_formants
+from benchmark_pitch import make_voiced_chunk
+from formant_estimator import FormantEstimator
+from pitch_engine import PitchEngine
+
+def make_autocorrs(count=40):
+    """Autocorrelations of voiced chunks across the pitch range"""
+    engine = PitchEngine(SAMPLE_RATE)
+    return [engine.autocorrelation(make_voiced_chunk(f0, SAMPLE_RATE, seed=i), LPC_ORDER)
+            for i, f0 in enumerate(np.linspace(85.0, 320.0, count))]
+
+def test_estimate_matches_legacy():
+    """Single and batched estimates equal the legacy formants"""
+    print("\n🎯 estimate() / estimate_batch() vs legacy")
+    estimator = FormantEstimator(SAMPLE_RATE, order=LPC_ORDER)
+    autocorrs = make_autocorrs()
+    batched = estimator.estimate_batch(autocorrs)
+    
+    worst = 0.0
+    for autocorr, batch_result in zip(autocorrs, batched):
+        legacy = legacy_formants(autocorr)
+        single = estimator.estimate(autocorr)
+        for name in ['F1', 'F2', 'F3']:
+            worst = max(worst, abs(single[name] - legacy[name]), abs(batch_result[name] - legacy[name]))
+    assert worst < 1e-6, worst
+    print(f"   ✅ {len(autocorrs)} chunks, max |difference| {worst:.1e} Hz")
+
+def test_degenerate_input():
+    """Silence and non-finite input give the default formants"""
+    print("\n🔇 Degenerate autocorrelations")
+    estimator = FormantEstimator(SAMPLE_RATE, order=LPC_ORDER)
+    default = dict(zip(['F1', 'F2', 'F3'], FormantEstimator.DEFAULT_FORMANTS))
+    bad = np.full(LPC_ORDER + 1, np.nan)
+    assert estimator.estimate(np.zeros(LPC_ORDER + 1)) == default
+    assert estimator.estimate(bad) == default
+    assert estimator.estimate(np.ones(3)) == default
+    
+    # Degenerate chunks in a batch do not disturb the others
+    autocorrs = make_autocorrs(3)
+    results = estimator.estimate_batch([autocorrs[0], bad, autocorrs[1]])
+    assert results[1] == default
+    assert results[0] == estimator.estimate(autocorrs[0])
+    print("   ✅ defaults for silence, NaN and too-short input")
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print(" FORMANT ESTIMATOR TEST")
+    print("=" * 70)
+    test_estimate_matches_legacy()
+    test_degenerate_input()
+    print("\n" + "=" * 70)
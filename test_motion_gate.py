@@ -0,0 +1,76 @@
+"""
+Motion Gate Test
+Checks MotionGate hits on static frames, misses on motion, and forced
+inference once a reused result is too old (frames or seconds)
+"""
+
+import numpy as np
+from motion_gate import MotionGate
+
+FACE = (40, 30, 64, 64)
+
+def make_frame(seed=0, shift=0):
+    """Textured BGR frame; shift moves the texture sideways"""
+    texture = np.random.default_rng(seed).integers(0, 256, (160, 220), dtype=np.uint8)
+    gray = np.roll(texture, shift, axis=1)
+    return np.repeat(gray[:, :, None], 3, axis=2)
+
+def test_static_frames_hit():
+    """An unchanged face region reuses the result; a moved one runs inference"""
+    print("\n🟢 Static vs moving face region")
+    gate = MotionGate(threshold=3.0, max_stale_frames=100, max_stale_seconds=100.0)
+    frame = make_frame()
+    
+    assert not gate.is_static(gate.signature(frame, FACE)), "no reference yet"
+    gate.set_reference(gate.signature(frame, FACE))
+    
+    # Sensor noise of a gray level or two stays under the threshold
+    noisy = np.clip(frame.astype(np.int16) + np.random.default_rng(1).integers(-2, 3, frame.shape), 0, 255)
+    assert gate.is_static(gate.signature(noisy.astype(np.uint8), FACE))
+    assert not gate.is_static(gate.signature(make_frame(shift=8), FACE))
+    
+    # Changes outside the face region are ignored
+    outside = frame.copy()
+    outside[:, 150:] = 255
+    assert gate.is_static(gate.signature(outside, FACE))
+    
+    stats = gate.get_statistics()
+    assert stats['gate_hits'] == 2 and stats['gate_misses'] == 2
+    print(f"   ✅ {stats['gate_hits']} hits, {stats['gate_misses']} misses, "
+          f"last difference {stats['gate_last_difference']:.1f}")
+
+def test_staleness_forces_inference():
+    """A result is reused at most max_stale_frames times and for max_stale_seconds"""
+    print("\n⏳ Staleness limits")
+    frame = make_frame()
+    
+    gate = MotionGate(max_stale_frames=3, max_stale_seconds=100.0)
+    signature = gate.signature(frame, FACE)
+    gate.set_reference(signature)
+    hits = [gate.is_static(signature) for _ in range(5)]
+    assert hits == [True, True, True, False, False]
+    
+    # A new reference starts the count again
+    gate.set_reference(signature)
+    assert gate.is_static(signature)
+    
+    # Too old in wall-clock time
+    gate = MotionGate(max_stale_frames=100, max_stale_seconds=2.0)
+    gate.set_reference(signature)
+    assert gate.is_static(signature)
+    gate.reference_time -= 3.0
+    assert not gate.is_static(signature)
+    
+    # reset() forgets the reference
+    gate.set_reference(signature)
+    gate.reset()
+    assert not gate.is_static(signature)
+    print("   ✅ frame limit, time limit and reset() force inference")
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print(" MOTION GATE TEST")
+    print("=" * 70)
+    test_static_frames_hit()
+    test_staleness_forces_inference()
+    print("\n" + "=" * 70)
@@ -0,0 +1,51 @@
+"""
+Pitch Engine Test
+Checks PitchEngine against the original np.correlate(mode='full') pitch search
+"""
+
+import numpy as np
+from benchmark_pitch import legacy_pitch, make_voiced_chunk
+from pitch_engine import PitchEngine
+
+SAMPLE_RATE = 16000
+
+def test_autocorrelation_matches_correlate():
+    """FFT autocorrelation equals np.correlate for long and short signals"""
+    print("\n📈 autocorrelation() vs np.correlate")
+    engine = PitchEngine(SAMPLE_RATE)
+    rng = np.random.default_rng(0)
+    for n in (24000, 4001, 321, 100):
+        x = rng.standard_normal(n)
+        reference = np.correlate(x, x, mode='full')[n - 1:n - 1 + 320]
+        result = engine.autocorrelation(x, 319)
+        assert len(result) == len(reference), n
+        assert np.allclose(result, reference, atol=1e-9 * reference[0]), n
+    print("   ✅ lengths 24000, 4001, 321, 100")
+
+def test_estimate_matches_legacy():
+    """Autocorrelation pitch equals the legacy estimate"""
+    print("\n🎵 estimate() vs legacy pitch search")
+    engine = PitchEngine(SAMPLE_RATE)
+    for i, f0 in enumerate(np.linspace(85.0, 320.0, 12)):
+        chunk = make_voiced_chunk(f0, SAMPLE_RATE, seed=i)
+        assert engine.estimate(chunk) == legacy_pitch(chunk, SAMPLE_RATE), f0
+    print("   ✅ 12 chunks, 85-320 Hz")
+
+def test_yin_tracks_f0():
+    """YIN finds the fundamental of harmonic chunks"""
+    print("\n🎯 YIN")
+    engine = PitchEngine(SAMPLE_RATE, method='yin')
+    for i, f0 in enumerate((90.0, 150.0, 250.0)):
+        pitch = engine.estimate(make_voiced_chunk(f0, SAMPLE_RATE, seed=i))
+        assert abs(pitch - f0) < 0.01 * f0, (f0, pitch)
+        print(f"   ✅ {f0:.0f} Hz -> {pitch:.1f} Hz")
+    assert engine.estimate(np.zeros(100)) == 120
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print(" PITCH ENGINE TEST")
+    print("=" * 70)
+    test_autocorrelation_matches_correlate()
+    test_estimate_matches_legacy()
+    test_yin_tracks_f0()
+    print("\n" + "=" * 70)
@@ -0,0 +1,68 @@
+"""
+Prosody Test
+Checks energy_variation() and OnsetWindow against the original shimmer loop
+and the list-filtering speaking rate estimate
+"""
+
+import numpy as np
+from prosody import OnsetWindow, energy_variation
+
+def legacy_energy_variation(audio_data):
+    """Original shimmer loop from _compute_prosody()"""
+    frame_size = len(audio_data) // 10
+    frame_energies = []
+    for i in range(0, len(audio_data) - frame_size, frame_size):
+        frame = audio_data[i:i+frame_size]
+        frame_energies.append(np.sqrt(np.mean(frame ** 2)))
+    return np.std(frame_energies) / (np.mean(frame_energies) + 1e-6) if len(frame_energies) > 0 else 0
+
+def legacy_speaking_rate(speech_onsets, current_time):
+    """Original _estimate_speaking_rate() over an unbounded onset list"""
+    if len(speech_onsets) < 2:
+        return 3.0
+    recent_onsets = [t for t in speech_onsets if current_time - t < 5.0]
+    if len(recent_onsets) < 2:
+        return 3.0
+    duration = recent_onsets[-1] - recent_onsets[0]
+    rate = len(recent_onsets) / duration if duration > 0 else 3.0
+    return np.clip(rate, 0.5, 10.0)
+
+def test_energy_variation_matches_loop():
+    """Strided shimmer equals the loop for any chunk length"""
+    print("\n📉 energy_variation() vs loop")
+    rng = np.random.default_rng(0)
+    for n in (24000, 23999, 4805, 100, 19, 10):
+        audio = rng.standard_normal(n) * np.linspace(0.1, 1.0, n)
+        assert abs(energy_variation(audio) - legacy_energy_variation(audio)) < 1e-12, n
+    print("   ✅ lengths 24000 down to 10")
+
+def test_speaking_rate_matches_list():
+    """OnsetWindow gives the list-filtering rate while keeping only recent onsets"""
+    print("\n🗣️  OnsetWindow vs onset list")
+    window = OnsetWindow(window=5.0)
+    onsets = []
+    most = 0
+    
+    # Bursts of onsets every 0.3 s, alternating 12 s of speech and 12 s of silence
+    for i in range(2000):
+        current_time = i * 0.3
+        if (i // 40) % 2 == 0:
+            window.append(current_time)
+            onsets.append(current_time)
+        assert abs(window.speaking_rate(current_time) - legacy_speaking_rate(onsets, current_time)) < 1e-12, i
+        most = max(most, len(window))
+    
+    assert most <= 5.0 / 0.3 + 1
+    
+    # A time going backwards starts a new timeline
+    window.append(1.0)
+    assert len(window) == 1
+    print(f"   ✅ 2000 steps, {len(onsets)} onsets seen, at most {most} kept")
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print(" PROSODY TEST")
+    print("=" * 70)
+    test_energy_variation_matches_loop()
+    test_speaking_rate_matches_list()
+    print("\n" + "=" * 70)
@@ -0,0 +1,78 @@
+"""
+Shared Frame Ring Test
+Checks SharedFrameRing slot writes, zero-copy reads, sequence checks on slot
+reuse and attaching from a describe() dictionary
+"""
+
+import numpy as np
+from shared_frames import SharedFrameRing
+
+SHAPE = (48, 64, 3)
+
+def make_frame(value):
+    """Solid frame filled with one gray level"""
+    return np.full(SHAPE, value, dtype=np.uint8)
+
+def test_write_read_round_trip():
+    """read() returns a zero-copy view of exactly the written frame"""
+    print("\n🖼️  write() / read() round trip")
+    ring = SharedFrameRing(SHAPE, num_slots=4)
+    try:
+        frames = [np.random.default_rng(i).integers(0, 256, SHAPE, dtype=np.uint8) for i in range(4)]
+        sequences = [ring.write(slot, frame) for slot, frame in enumerate(frames)]
+        assert sequences == sorted(set(sequences)) and 0 not in sequences
+        
+        for slot, (frame, sequence) in enumerate(zip(frames, sequences)):
+            view = ring.read(slot, sequence)
+            assert np.array_equal(view, frame)
+            assert np.shares_memory(view, ring.frames), "read() copied the frame"
+        print(f"   ✅ 4 slots, sequences {sequences}")
+    finally:
+        ring.close()
+
+def test_read_after_slot_reuse():
+    """A sequence number stops resolving once its slot is overwritten"""
+    print("\n♻️  read() after slot reuse")
+    ring = SharedFrameRing(SHAPE, num_slots=2)
+    try:
+        old = ring.write(0, make_frame(10))
+        assert ring.read(0, old) is not None
+        
+        new = ring.write(0, make_frame(20))
+        assert ring.read(0, old) is None, "stale sequence still readable"
+        assert ring.read(0, new)[0, 0, 0] == 20
+        
+        # A slot being written has sequence 0 and matches no write
+        other = ring.write(1, make_frame(30))
+        ring.sequences[1] = 0
+        assert ring.read(1, other) is None
+        print(f"   ✅ sequence {old} rejected after reuse, {new} readable")
+    finally:
+        ring.close()
+
+def test_attach_sees_writes():
+    """A ring attached by name maps the same slots and sequence numbers"""
+    print("\n🔗 attach() from describe()")
+    ring = SharedFrameRing(SHAPE, num_slots=3)
+    attached = SharedFrameRing.attach(ring.describe())
+    try:
+        assert not attached.is_owner and attached.name == ring.name
+        sequence = ring.write(2, make_frame(77))
+        view = attached.read(2, sequence)
+        assert view is not None and np.all(view == 77)
+        
+        ring.write(2, make_frame(5))
+        assert attached.read(2, sequence) is None
+        print(f"   ✅ attached ring {attached.name} follows the owner's writes")
+    finally:
+        attached.close()
+        ring.close()
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print(" SHARED FRAME RING TEST")
+    print("=" * 70)
+    test_write_read_round_trip()
+    test_read_after_slot_reuse()
+    test_attach_sees_writes()
+    print("\n" + "=" * 70)
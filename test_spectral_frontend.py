@@ -0,0 +1,136 @@
+"""
+Spectral Front-End Test
+Checks SpectralFrontend against the original per-chunk computations:
+scipy spectrogram + looped mel filterbank + DCT for MFCCs, np.fft spectral
+shape, and np.correlate autocorrelation
+"""
+
+import numpy as np
+from scipy import signal
+from scipy.fftpack import dct
+from benchmark_pitch import make_voiced_chunk
+from spectral_frontend import SpectralFrontend
+from speech_detector_enhanced import SpeechEmotionDetector
+
+SAMPLE_RATE = 16000
+
+def legacy_mfccs(audio_data, sample_rate=SAMPLE_RATE, n_fft=512, n_mels=40, n_mfcc=13):
+    """Original _compute_mfccs() with its looped _mel_filterbank()"""
+    f, t, Sxx = signal.spectrogram(audio_data, sample_rate, nperseg=n_fft)
+    
+    high_freq_mel = 2595 * np.log10(1 + (sample_rate / 2) / 700)
+    hz_points = 700 * (10**(np.linspace(0, high_freq_mel, n_mels + 2) / 2595) - 1)
+    bin_points = np.floor((n_fft + 1) * hz_points / sample_rate).astype(int)
+    filterbank = np.zeros((n_mels, n_fft // 2 + 1))
+    for i in range(1, n_mels + 1):
+        left, center, right = bin_points[i - 1], bin_points[i], bin_points[i + 1]
+        for j in range(left, center):
+            filterbank[i - 1, j] = (j - left) / (center - left)
+        for j in range(center, right):
+            filterbank[i - 1, j] = (right - j) / (right - center)
+    
+    mel_spec = np.dot(filterbank, Sxx)
+    mel_spec = np.where(mel_spec == 0, np.finfo(float).eps, mel_spec)
+    return np.mean(dct(np.log(mel_spec), axis=0, type=2, norm='ortho')[:n_mfcc], axis=1)
+
+def legacy_spectral_features(audio_data, sample_rate=SAMPLE_RATE):
+    """Original _compute_spectral_features()"""
+    fft = np.abs(np.fft.fft(audio_data))
+    freqs = np.fft.fftfreq(len(fft), 1 / sample_rate)
+    positive_freqs = freqs[:len(freqs) // 2]
+    positive_fft = fft[:len(fft) // 2]
+    
+    centroid = np.sum(positive_freqs * positive_fft) / np.sum(positive_fft)
+    bandwidth = np.sqrt(np.sum(((positive_freqs - centroid) ** 2) * positive_fft) / np.sum(positive_fft))
+    cumsum = np.cumsum(positive_fft)
+    rolloff = positive_freqs[np.where(cumsum >= 0.85 * cumsum[-1])[0][0]]
+    mid = len(positive_fft) // 2
+    hf_ratio = np.sum(positive_fft[mid:]) / (np.sum(positive_fft[:mid]) + 1e-6)
+    return {'centroid': centroid, 'bandwidth': bandwidth, 'rolloff': rolloff, 'hf_ratio': hf_ratio}
+
+def test_mfccs_match_legacy():
+    """MFCCs equal the scipy spectrogram version (float32 STFT tolerance)"""
+    print("\n🎼 MFCCs vs scipy spectrogram + DCT")
+    frontend = SpectralFrontend(SAMPLE_RATE, max_lag=319)
+    for i, f0 in enumerate((95.0, 180.0, 290.0)):
+        chunk = make_voiced_chunk(f0, SAMPLE_RATE, seed=i)
+        error = np.max(np.abs(frontend.mfcc_frontend.compute(chunk) - legacy_mfccs(chunk)))
+        assert error < 1e-3, (f0, error)
+        
+        # A mask that keeps every sample changes nothing
+        mask = np.ones(len(chunk), dtype=bool)
+        assert np.allclose(frontend.mfcc_frontend.compute(chunk, sample_mask=mask),
+                           frontend.mfcc_frontend.compute(chunk))
+        print(f"   ✅ {f0:.0f} Hz: max |difference| {error:.1e}")
+
+def test_analyze_matches_legacy():
+    """Spectral shape equals the np.fft version and autocorrelation equals np.correlate"""
+    print("\n📊 analyze() vs legacy spectral features and np.correlate")
+    frontend = SpectralFrontend(SAMPLE_RATE, max_lag=319)
+    for n in (24000, 23999, 500):
+        chunk = make_voiced_chunk(150.0, SAMPLE_RATE, duration=n / SAMPLE_RATE).astype(np.float64)
+        features = frontend.analyze(chunk, mfccs=False)
+        for name, value in legacy_spectral_features(chunk).items():
+            assert np.isclose(features[name], value, rtol=1e-9), (n, name)
+        reference = np.correlate(chunk, chunk, mode='full')[len(chunk) - 1:len(chunk) + 319]
+        assert np.allclose(features['autocorr'], reference, atol=1e-9 * reference[0]), n
+    print("   ✅ lengths 24000, 23999, 500")
+
+def test_analyze_frames_runs():
+    """Frame-wise autocorrelation equals np.correlate of each run of consecutive frames"""
+    print("\n🧩 analyze_frames() over gapped frames")
+    frontend = SpectralFrontend(SAMPLE_RATE, max_lag=319)
+    x = np.random.default_rng(0).standard_normal(24000)
+    L = 320
+    
+    starts = np.arange(len(x) // L) * L
+    reference = np.correlate(x[:len(starts) * L], x[:len(starts) * L], mode='full')
+    reference = reference[len(starts) * L - 1:len(starts) * L + 319]
+    assert np.allclose(frontend.analyze_frames(x, starts, L)['autocorr'], reference)
+    
+    # Two runs and a frame off the grid: no lag products across the gaps
+    starts = np.array([0, 320, 640, 3200, 3520, 10000])
+    runs = [x[0:960], x[3200:3840], x[10000:10320]]
+    reference = sum(np.correlate(run, run, mode='full')[len(run) - 1:len(run) + 319] for run in runs)
+    features = frontend.analyze_frames(x, starts, L)
+    assert np.allclose(features['autocorr'], reference)
+    assert len(features['mfccs']) == 13
+    print("   ✅ contiguous window and gapped runs")
+
+def test_enhanced_spectral_shape_matches_legacy():
+    """A fully voiced window keeps the whole-window spectral shape; dropped frames are zeroed"""
+    print("\n🎚️  _extract_enhanced_features() spectral shape vs legacy")
+    detector = SpeechEmotionDetector(SAMPLE_RATE, verbose=False)
+    t = np.arange(detector.chunk_samples) / SAMPLE_RATE
+    rng = np.random.default_rng(0)
+    chunk = 0.1 * sum(np.sin(2 * np.pi * 150.0 * h * t) / h for h in range(1, 6))
+    chunk = (chunk + 0.005 * rng.standard_normal(len(t))).astype(np.float32)
+    emphasized = np.append(chunk[0], chunk[1:] - 0.97 * chunk[:-1])
+    L = detector.frame_vad.frame_length
+    names = {'centroid': 'spectral_centroid', 'bandwidth': 'spectral_bandwidth',
+             'rolloff': 'spectral_rolloff', 'hf_ratio': 'hf_ratio'}
+    
+    assert detector.frame_vad.analyze(chunk, detector.energy_threshold)['voiced'].all()
+    features = detector._extract_enhanced_features(chunk)
+    for name, value in legacy_spectral_features(emphasized).items():
+        assert np.isclose(features[names[name]], value, rtol=1e-6), (name, features[names[name]], value)
+    
+    # Dropping frames only removes their samples
+    voiced_starts = np.arange(10, 60) * L
+    gated = np.zeros_like(emphasized)
+    for start in voiced_starts:
+        gated[start:start + L] = emphasized[start:start + L]
+    features = detector._extract_enhanced_features(chunk, voiced_starts=voiced_starts)
+    for name, value in legacy_spectral_features(gated).items():
+        assert np.isclose(features[names[name]], value, rtol=1e-6), (name, features[names[name]], value)
+    print(f"   ✅ fully voiced window and {len(voiced_starts)} of {len(chunk) // L} frames match")
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print(" SPECTRAL FRONT-END TEST")
+    print("=" * 70)
+    test_mfccs_match_legacy()
+    test_analyze_matches_legacy()
+    test_analyze_frames_runs()
+    test_enhanced_spectral_shape_matches_legacy()
+    print("\n" + "=" * 70)
@@ -0,0 +1,187 @@
+"""
+Streaming Feature Extractor Test
+Checks the rolling window state of StreamingFeatureExtractor across ring
+wrap-around and reset (e.g. stop_recording / start_recording), and its
+autocorrelation, pitch and formants against the whole-window computation
+"""
+
+import numpy as np
+from scipy import signal
+from spectral_frontend import SpectralFrontend
+from streaming_features import StreamingFeatureExtractor
+from voice_activity import FrameVAD
+from speech_detector_enhanced import SpeechEmotionDetector
+
+SAMPLE_RATE = 16000
+WINDOW = 24000
+
+def make_tone(duration, f0=150.0, seed=0):
+    """Harmonic tone with a little noise"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(duration * SAMPLE_RATE)) / SAMPLE_RATE
+    tone = sum(np.sin(2 * np.pi * f0 * h * t) / h for h in range(1, 6))
+    return 0.1 * tone + 0.005 * rng.standard_normal(len(t))
+
+def make_vowel(f0, duration=3.0, formants=(700, 1200, 2600), seed=0):
+    """Pulse train at f0 through three formant resonators, plus a little noise"""
+    rng = np.random.default_rng(seed)
+    n = int(duration * SAMPLE_RATE)
+    x = np.zeros(n)
+    x[::int(round(SAMPLE_RATE / f0))] = 1.0
+    for frequency, bandwidth in zip(formants, (80, 90, 120)):
+        r = np.exp(-np.pi * bandwidth / SAMPLE_RATE)
+        x = signal.lfilter([1], [1, -2 * r * np.cos(2 * np.pi * frequency / SAMPLE_RATE), r * r], x)
+    x = 0.3 * x / np.max(np.abs(x))
+    return x + 0.001 * rng.standard_normal(n)
+
+def feed(extractor, audio, hop=4800, energy_threshold=None):
+    """Push audio in hop-sized pieces, like the live capture loop"""
+    for start in range(0, len(audio), hop):
+        extractor.update(audio[start:start + hop], energy_threshold)
+
+def test_reset_after_wrap():
+    """update -> ring wrap -> reset -> update must not fail and must start clean"""
+    print("\n🔁 Reset after ring wrap-around")
+    extractor = StreamingFeatureExtractor(SAMPLE_RATE, WINDOW)
+    audio = make_tone(3.0)
+    
+    feed(extractor, audio)
+    assert extractor.frames_processed > extractor.num_frames, "ring did not wrap"
+    before = extractor.get_features()
+    
+    extractor.reset()
+    for name, total in extractor.sums.items():
+        assert total.shape == extractor.rings[name].shape[1:], f"{name} sum lost its shape"
+        assert not np.any(total), f"{name} sum not cleared"
+    assert extractor.get_features() is None
+    
+    feed(extractor, audio)
+    after = extractor.get_features()
+    for name in ['energy', 'zcr', 'autocorr', 'mfccs']:
+        assert np.allclose(before[name], after[name]), f"{name} differs after reset"
+    print(f"   ✅ {extractor.frames_processed} frames after reset, features match the first pass")
+
+def test_running_sums_match_ring():
+    """Running sums equal a fresh sum over the ring after many hops"""
+    print("\n➕ Running sums vs ring contents")
+    extractor = StreamingFeatureExtractor(SAMPLE_RATE, WINDOW)
+    feed(extractor, make_tone(10.0, f0=220.0, seed=1), hop=1000)
+    
+    for name, ring in extractor.rings.items():
+        assert np.allclose(extractor.sums[name], ring[:extractor.count].sum(axis=0)), name
+    print(f"   ✅ all {len(extractor.rings)} sums match after {extractor.frames_processed} frames")
+
+def test_autocorrelation_matches_window():
+    """Autocorrelation equals np.correlate over the frames in the window"""
+    print("\n📈 Streaming autocorrelation vs np.correlate")
+    extractor = StreamingFeatureExtractor(SAMPLE_RATE, WINDOW, max_lag=319)
+    audio = make_tone(4.3, f0=120.0, seed=2)
+    feed(extractor, audio)
+    
+    # Newest complete frames of the continuously pre-emphasized signal
+    emphasized = np.append(audio[0], audio[1:] - 0.97 * audio[:-1])
+    end = len(audio) // extractor.frame_length * extractor.frame_length
+    window = emphasized[end - extractor.num_frames * extractor.frame_length:end]
+    reference = np.correlate(window, window, 'full')[len(window) - 1:len(window) + 319]
+    
+    error = np.max(np.abs(extractor.get_features()['autocorr'] - reference)) / reference[0]
+    assert error < 1e-12, error
+    print(f"   ✅ max relative error {error:.1e}")
+
+def gated_emphasis(audio, energy_threshold):
+    """Pre-emphasized stream with the samples of unvoiced 20 ms VAD frames zeroed"""
+    emphasized = np.append(audio[0], audio[1:] - 0.97 * audio[:-1])
+    if energy_threshold is None:
+        return emphasized, None
+    vad = FrameVAD(SAMPLE_RATE, 0.02).analyze(audio, energy_threshold)
+    gate = np.repeat(vad['voiced'], 320)
+    return np.where(gate, emphasized[:len(gate)], 0.0), vad
+
+def test_unvoiced_frames_are_skipped():
+    """With a VAD threshold, sums see voiced 20 ms frames only, with no splices across gaps"""
+    print("\n🔇 Voiced-frame gating")
+    extractor = StreamingFeatureExtractor(SAMPLE_RATE, WINDOW)
+    L = extractor.frame_length
+    audio = make_tone(3.0, f0=140.0, seed=3)
+    rng = np.random.default_rng(4)
+    for start, end in [(30000, 33000), (40000, 41500)]:
+        audio[start:end] = 0.001 * rng.standard_normal(end - start)
+    feed(extractor, audio, energy_threshold=0.02)
+    
+    # Reference: the newest complete frames with unvoiced samples zeroed, so
+    # lag products never join samples across a gap
+    gated, vad = gated_emphasis(audio, 0.02)
+    end = len(audio) // L * L
+    window = gated[end - extractor.num_frames * L:end]
+    reference = np.correlate(window, window, 'full')[len(window) - 1:len(window) + extractor.max_lag]
+    
+    # Voice activity over the last 75 VAD frames, like the per-window VAD
+    speech_ratio, voiced_samples = extractor.voice_activity()
+    assert voiced_samples == np.count_nonzero(vad['voiced'][-extractor.num_vad_frames:]) * 320
+    assert speech_ratio == np.mean(vad['active'][-extractor.num_vad_frames:])
+    assert voiced_samples < WINDOW, "gaps were not detected"
+    error = np.max(np.abs(extractor.get_features()['autocorr'] - reference)) / reference[0]
+    assert error < 1e-12, error
+    print(f"   ✅ {voiced_samples // 320} of {extractor.num_vad_frames} VAD frames voiced, "
+          f"max relative error {error:.1e}")
+
+def test_spectral_shape_matches_window():
+    """Spectral shape equals the whole-window spectrum of the streamed samples (1e-9 relative)
+    
+    The stream covers the newest num_frames * frame_length samples, with
+    unvoiced VAD frames zeroed in place as in the per-window extraction.
+    """
+    print("\n🎚️  Streaming spectral shape vs whole-window spectrum")
+    frontend = SpectralFrontend(SAMPLE_RATE, max_lag=319)
+    audio = make_tone(3.0, f0=140.0, seed=5)
+    rng = np.random.default_rng(6)
+    audio[30000:33000] = 0.001 * rng.standard_normal(3000)
+    
+    for energy_threshold in (None, 0.02):
+        extractor = StreamingFeatureExtractor(SAMPLE_RATE, WINDOW)
+        L = extractor.frame_length
+        feed(extractor, audio, energy_threshold=energy_threshold)
+        
+        gated, _ = gated_emphasis(audio, energy_threshold)
+        end = len(audio) // L * L
+        reference = frontend.analyze(gated[end - extractor.num_frames * L:end], mfccs=False)
+        features = extractor.get_features()
+        for name in ['centroid', 'bandwidth', 'rolloff', 'hf_ratio']:
+            assert np.isclose(features[name], reference[name], rtol=1e-9), (energy_threshold, name)
+        print(f"   ✅ threshold {energy_threshold}: centroid {features['centroid']:.0f} Hz, "
+              f"hf_ratio {features['hf_ratio']:.2f}")
+
+def test_pitch_and_formants_match_chunk_path():
+    """Live (streamed) pitch and formants agree with the per-window extraction
+    
+    The stream covers num_frames * frame_length = 23552 of the 24000 window
+    samples, so values agree closely rather than exactly.
+    """
+    print("\n🎯 Streamed vs per-window pitch and formants")
+    detector = SpeechEmotionDetector(SAMPLE_RATE, verbose=False)
+    for f0 in (90.0, 250.0):
+        audio = make_vowel(f0)
+        detector.streaming_features.reset()
+        feed(detector.streaming_features, audio)
+        streamed = detector._extract_streaming_features()
+        window = detector._extract_enhanced_features(audio[-WINDOW:].astype(np.float32))
+        
+        assert abs(streamed['pitch'] - window['pitch']) < 1.0, (f0, streamed['pitch'], window['pitch'])
+        for name in ['F1', 'F2', 'F3']:
+            assert np.isclose(streamed['formants'][name], window['formants'][name], rtol=0.02), \
+                (f0, name, streamed['formants'], window['formants'])
+        print(f"   ✅ {f0:.0f} Hz: pitch {streamed['pitch']:.1f} / {window['pitch']:.1f} Hz, "
+              f"F1-F3 {[round(streamed['formants'][k]) for k in ['F1', 'F2', 'F3']]} / "
+              f"{[round(window['formants'][k]) for k in ['F1', 'F2', 'F3']]}")
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print(" STREAMING FEATURE EXTRACTOR TEST")
+    print("=" * 70)
+    test_reset_after_wrap()
+    test_running_sums_match_ring()
+    test_autocorrelation_matches_window()
+    test_unvoiced_frames_are_skipped()
+    test_spectral_shape_matches_window()
+    test_pitch_and_formants_match_chunk_path()
+    print("\n" + "=" * 70)
@@ -0,0 +1,75 @@
+"""
+Frame VAD Test
+Checks FrameVAD against a per-frame Python loop using the chunk-level
+energy and zero-crossing formulas, and its window helpers against brute force
+"""
+
+import numpy as np
+from voice_activity import FrameVAD
+
+SAMPLE_RATE = 16000
+
+def legacy_frames(audio_data, frame_length, energy_threshold, max_voiced_zcr=0.3):
+    """Per-frame loop with the original chunk-level RMS and ZCR formulas"""
+    rms, zcr = [], []
+    for start in range(0, len(audio_data) - frame_length + 1, frame_length):
+        frame = audio_data[start:start + frame_length]
+        rms.append(np.sqrt(np.mean(frame ** 2)))
+        zcr.append(np.sum(np.abs(np.diff(np.sign(frame)))) / (2 * len(frame)))
+    rms, zcr = np.array(rms), np.array(zcr)
+    active = rms > energy_threshold
+    return rms, zcr, active, active & (zcr < max_voiced_zcr)
+
+def make_speech_like(rng, seconds=3.0):
+    """Tone bursts, noise bursts and near-silence"""
+    n = int(seconds * SAMPLE_RATE)
+    t = np.arange(n) / SAMPLE_RATE
+    audio = 0.002 * rng.standard_normal(n)
+    audio[3000:11000] += 0.1 * np.sin(2 * np.pi * 160 * t[3000:11000])
+    audio[20000:26000] += 0.1 * rng.standard_normal(6000)
+    audio[30000:40000] += 0.05 * np.sin(2 * np.pi * 220 * t[30000:40000])
+    return audio
+
+def test_analyze_matches_loop():
+    """Frame RMS, ZCR, activity and voicing equal the per-frame loop"""
+    print("\n🎙️  analyze() vs per-frame loop")
+    vad = FrameVAD(SAMPLE_RATE, frame_duration=0.02)
+    rng = np.random.default_rng(0)
+    for n_samples in (48000, 47999, 100):
+        audio = make_speech_like(rng)[:n_samples]
+        result = vad.analyze(audio, 0.02)
+        rms, zcr, active, voiced = legacy_frames(audio, vad.frame_length, 0.02)
+        assert np.allclose(result['rms'], rms) and np.allclose(result['zcr'], zcr)
+        assert np.array_equal(result['active'], active) and np.array_equal(result['voiced'], voiced)
+        assert result['speech_ratio'] == (float(np.mean(active)) if len(active) else 0.0)
+    
+    # Loud noise is active but not voiced
+    result = vad.analyze(make_speech_like(rng), 0.02)
+    noise = slice(20000 // vad.frame_length + 1, 26000 // vad.frame_length)
+    assert result['active'][noise].all() and not result['voiced'][noise].any()
+    print(f"   ✅ {int(result['voiced'].sum())} voiced / {len(result['voiced'])} frames, noise rejected")
+
+def test_window_helpers_match_brute_force():
+    """window_counts() and window_starts() equal a scan over the frames"""
+    print("\n🪟 window_counts() / window_starts() vs brute force")
+    vad = FrameVAD(SAMPLE_RATE, frame_duration=0.02)
+    L = vad.frame_length
+    mask = np.random.default_rng(1).random(300) < 0.4
+    starts = np.array([0, 100, 4800, 9600, 50000, 90000])
+    window_length = 24000
+    
+    counts, totals = vad.window_counts(mask, starts, window_length)
+    for start, count, total in zip(starts, counts, totals):
+        inside = [i for i in range(len(mask)) if i * L >= start and (i + 1) * L <= start + window_length]
+        assert total == len(inside) and count == sum(mask[i] for i in inside), start
+        assert np.array_equal(vad.window_starts(mask, start, window_length),
+                              [i * L - start for i in inside if mask[i]]), start
+    print(f"   ✅ {len(starts)} windows")
+
+if __name__ == "__main__":
+    print("=" * 70)
+    print(" FRAME VAD TEST")
+    print("=" * 70)
+    test_analyze_matches_loop()
+    test_window_helpers_match_brute_force()
+    print("\n" + "=" * 70)
@@ -0,0 +1,220 @@
+"""
+Offline Video Ingestion
+Analyzes recorded shift videos faster than real time
+Decodes in a background thread, subsamples frames, classifies them in batches and
+stores stress readings stamped with media time instead of wall-clock time
+
+Usage:
+    python video_ingest.py shift1.mp4 shift2.mp4 --sample-fps 2 --batch-size 8
+"""
+
+import os
+import time
+import queue
+import argparse
+import threading
+from datetime import datetime
+import cv2
+from emotion_detector import FaceEmotionDetector
+from stress_analyzer import StressAnalyzer
+from database import StressDatabase
+
+class VideoFileReader:
+    def __init__(self, path, sample_fps=2.0, queue_size=64):
+        """
+        Initialize a threaded video file reader
+        
+        Args:
+            path: Video file path
+            sample_fps: Frames per second of video to keep (None or 0 keeps every frame)
+            queue_size: Decoded frames buffered ahead of the consumer
+        """
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise IOError(f"Could not open video file: {path}")
+        
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.duration = self.frame_count / self.fps if self.frame_count > 0 else 0.0
+        
+        # Keep one frame out of every `step`
+        self.step = max(int(round(self.fps / sample_fps)), 1) if sample_fps else 1
+        
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.thread = None
+        self.is_running = False
+        
+        # Statistics
+        self.decoded_frames = 0
+        self.skipped_frames = 0
+    
+    def start(self):
+        """Start decoding in the background"""
+        self.is_running = True
+        self.thread = threading.Thread(target=self._decode_loop, daemon=True)
+        self.thread.start()
+        return self
+    
+    def stop(self):
+        """Stop decoding and release the file"""
+        self.is_running = False
+        # Unblock the decoder if it is waiting on a full queue
+        while self.thread is not None and self.thread.is_alive():
+            try:
+                self.frames.get_nowait()
+            except queue.Empty:
+                pass
+            self.thread.join(timeout=0.1)
+        self.cap.release()
+    
+    def _decode_loop(self):
+        """Decode kept frames; skipped frames are only grabbed, never converted"""
+        index = 0
+        while self.is_running:
+            if not self.cap.grab():
+                break
+            
+            if index % self.step == 0:
+                ret, frame = self.cap.retrieve()
+                if not ret:
+                    break
+                media_time = index / self.fps
+                self.decoded_frames += 1
+                self.frames.put((media_time, frame))
+            else:
+                self.skipped_frames += 1
+            index += 1
+        
+        # End of stream marker
+        self.frames.put(None)
+    
+    def __iter__(self):
+        """Yield (media_time_seconds, frame) until the file ends"""
+        while True:
+            item = self.frames.get()
+            if item is None:
+                return
+            yield item
+
+def ingest_video(path, detector, analyzer, database, sample_fps=2.0, batch_size=8, start_time=None,
+                 reading_interval=5.0):
+    """
+    Analyze one video file and store its stress readings
+    
+    Args:
+        path: Video file path
+        detector: FaceEmotionDetector used for batched classification
+        analyzer: StressAnalyzer fed with media timestamps
+        database: StressDatabase receiving the readings (None to skip storing)
+        sample_fps: Frames per second of video to analyze
+        batch_size: Frames per batched forward pass
+        start_time: Recording start (epoch seconds); defaults to file mtime minus duration
+        reading_interval: Seconds of video between stored readings, like the live
+                          loop's save interval (0 = store every analyzed frame)
+    
+    Returns:
+        dict: Summary with frame counts, media duration and processing speed
+    """
+    reader = VideoFileReader(path, sample_fps=sample_fps)
+    if start_time is None:
+        start_time = os.path.getmtime(path) - reader.duration
+    
+    analyzer.reset_history(session_start_time=start_time)
+    
+    print(f"🎬 {os.path.basename(path)}: {reader.duration:.1f}s @ {reader.fps:.1f} FPS, "
+          f"analyzing 1 of every {reader.step} frames")
+    
+    face_emotion, face_confidence = 'neutral', 0.0
+    analyzed, faces_found = 0, 0
+    readings = []
+    next_reading_time = 0.0
+    started = time.time()
+    
+    def flush(batch):
+        nonlocal face_emotion, face_confidence, analyzed, faces_found, next_reading_time
+        times = [media_time for media_time, _ in batch]
+        results = detector.detect_emotions_batch([frame for _, frame in batch])
+        for media_time, (emotion, confidence, _) in zip(times, results):
+            # Carry the last face emotion and confidence forward through frames
+            # without a face, like the live loop's update_face_state()
+            if emotion:
+                face_emotion, face_confidence = emotion, confidence
+                faces_found += 1
+            
+            timestamp = start_time + media_time
+            stress_level, stress_score, _ = analyzer.analyze_stress(
+                face_emotion, face_confidence, 'neutral', 0.0, timestamp=timestamp
+            )
+            
+            # Every frame feeds the analyzer, but only one reading per interval of media time is stored
+            if media_time >= next_reading_time:
+                readings.append((timestamp, face_emotion, face_confidence, 'neutral', 0.0,
+                                 stress_level, float(stress_score)))
+                next_reading_time = media_time + reading_interval
+        analyzed += len(batch)
+    
+    reader.start()
+    try:
+        batch = []
+        for item in reader:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+    finally:
+        reader.stop()
+    
+    if database is not None:
+        database.save_stress_readings(readings)
+    
+    elapsed = time.time() - started
+    summary = {
+        'file': path,
+        'media_duration_s': reader.duration,
+        'analyzed_frames': analyzed,
+        'frames_with_face': faces_found,
+        'readings_saved': len(readings) if database is not None else 0,
+        'processing_time_s': elapsed,
+        'speedup': reader.duration / elapsed if elapsed > 0 else 0.0
+    }
+    
+    print(f"✅ {analyzed} frames ({faces_found} with a face) in {elapsed:.1f}s "
+          f"({summary['speedup']:.1f}x real time)")
+    return summary
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Analyze recorded videos for worker stress")
+    parser.add_argument('videos', nargs='+', help="Video files to analyze")
+    parser.add_argument('--sample-fps', type=float, default=2.0,
+                        help="Frames per second of video to analyze (0 = every frame)")
+    parser.add_argument('--batch-size', type=int, default=8, help="Frames per batched inference call")
+    parser.add_argument('--reading-interval', type=float, default=5.0,
+                        help="Seconds of video between stored readings (0 = every analyzed frame)")
+    parser.add_argument('--db', default='stress_history.db', help="SQLite database for the readings")
+    parser.add_argument('--no-db', action='store_true', help="Do not store readings")
+    parser.add_argument('--start', help="Recording start time 'YYYY-MM-DD HH:MM:SS' (first file only)")
+    args = parser.parse_args()
+    
+    detector = FaceEmotionDetector(enable_tracking=False, enable_motion_gate=False)
+    analyzer = StressAnalyzer()
+    database = None if args.no_db else StressDatabase(args.db)
+    
+    start_time = None
+    if args.start:
+        start_time = datetime.strptime(args.start, '%Y-%m-%d %H:%M:%S').timestamp()
+    
+    for index, path in enumerate(args.videos):
+        try:
+            ingest_video(path, detector, analyzer, database,
+                         sample_fps=args.sample_fps, batch_size=args.batch_size,
+                         start_time=start_time if index == 0 else None,
+                         reading_interval=args.reading_interval)
+        except IOError as e:
+            print(f"❌ {e}")
+
+if __name__ == "__main__":
+    main()
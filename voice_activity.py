@@ -0,0 +1,101 @@
+"""
+Frame-Level Voice Activity Detection
+Short-frame RMS energy and zero-crossing rate for a whole chunk in one
+vectorized pass over a strided (zero-copy) frame view
+Frames are active when loud enough and voiced when also tonal (low ZCR)
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+class FrameVAD:
+    def __init__(self, sample_rate=16000, frame_duration=0.02, max_voiced_zcr=0.3):
+        """
+        Initialize the frame VAD
+        
+        Args:
+            sample_rate: Audio sampling rate
+            frame_duration: Frame length in seconds (10-20 ms)
+            max_voiced_zcr: Highest zero-crossing rate of a voiced frame
+                            (noise and fricatives cross zero far more often)
+        """
+        self.sample_rate = sample_rate
+        self.frame_length = max(int(sample_rate * frame_duration), 1)
+        self.max_voiced_zcr = max_voiced_zcr
+    
+    def frames(self, audio_data):
+        """
+        Non-overlapping frames as a strided view (a trailing partial frame is dropped)
+        
+        Args:
+            audio_data: 1-D signal
+        
+        Returns:
+            numpy.ndarray: (n_frames, frame_length) view
+        """
+        x = np.asarray(audio_data)
+        if len(x) < self.frame_length:
+            return x[:0].reshape(0, self.frame_length)
+        return sliding_window_view(x, self.frame_length)[::self.frame_length]
+    
+    def analyze(self, audio_data, energy_threshold):
+        """
+        Frame energy, zero-crossing rate and activity of a chunk
+        
+        Args:
+            audio_data: 1-D signal
+            energy_threshold: Frame RMS above which a frame is active
+        
+        Returns:
+            dict: 'rms', 'zcr', 'active' and 'voiced' per frame, and
+                  'speech_ratio' (fraction of active frames)
+        """
+        frames = self.frames(audio_data).astype(np.float64)
+        rms = np.sqrt(np.mean(frames ** 2, axis=1)) if len(frames) else np.zeros(0)
+        zcr = np.sum(np.abs(np.diff(np.sign(frames), axis=1)), axis=1) / (2 * self.frame_length)
+        
+        active = rms > energy_threshold
+        voiced = active & (zcr < self.max_voiced_zcr)
+        return {
+            'rms': rms,
+            'zcr': zcr,
+            'active': active,
+            'voiced': voiced,
+            'speech_ratio': float(np.mean(active)) if len(active) else 0.0
+        }
+    
+    def window_starts(self, mask, start, window_length):
+        """
+        Flagged frames of one window, as offsets into the window
+        
+        Args:
+            mask: Per-frame flags from analyze() on the whole recording
+            start: Window start index in samples
+            window_length: Window length in samples
+        
+        Returns:
+            numpy.ndarray: Start offsets of the flagged frames that lie
+                           completely inside the window
+        """
+        first = min(-(-start // self.frame_length), len(mask))
+        last = max(min((start + window_length) // self.frame_length, len(mask)), first)
+        return (first + np.flatnonzero(mask[first:last])) * self.frame_length - start
+    
+    def window_counts(self, mask, starts, window_length):
+        """
+        Count flagged frames inside many windows of one recording
+        
+        Args:
+            mask: Per-frame flags from analyze() on the whole recording
+            starts: Window start indices in samples
+            window_length: Window length in samples
+        
+        Returns:
+            tuple: (flagged frame count, total frame count) per window, counting
+                   the frames that lie completely inside the window
+        """
+        cumulative = np.concatenate(([0], np.cumsum(mask)))
+        first = np.minimum(-(-np.asarray(starts) // self.frame_length), len(mask))
+        last = np.minimum((np.asarray(starts) + window_length) // self.frame_length, len(mask))
+        last = np.maximum(last, first)
+        return cumulative[last] - cumulative[first], last - first